@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for parsing the output of the arp command.
+
+Compares the shared single-pass parser `BaseLANDeviceScanner._parse_arp_output` with the previous
+implementation, which matched a regular expression per line, split the line and validated the mac
+address again with `LANDevice.format_mac`. A synthetic neighbor table like the one of a flat /16
+network is used (by default 50000 entries, some mac addresses have multiple ip addresses).
+
+Usage:
+    python benchmarks/bench_arp_parser.py [number of entries]
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_manager.device import LANDevice  # noqa: E402
+from device_manager.scanner._base import BaseLANDeviceScanner  # noqa: E402
+
+ARP_REGEX = re.compile(r"^[ \t]*((?:\d{1,3}\.){3}\d{1,3})[ \t]+(\w*[ \t]+)?"
+                       r"([0-9A-Fa-f]{2}[.:\-]){5}([0-9A-Fa-f]{2})")
+
+
+def legacy_parse(arp_out):
+    """The parser as it was used before (in `LinuxLANDeviceScanner._get_arp_cache`)."""
+    devices = {}
+    for line in arp_out.splitlines():
+        if ARP_REGEX.match(line):
+            components = line.split()
+            ip_address = components[0]
+            for i in [2, 1]:
+                try:
+                    mac_address = LANDevice.format_mac(components[i])
+                    break
+                except (IndexError, TypeError):
+                    pass
+            else:
+                continue
+            if mac_address in devices:
+                if ip_address not in devices[mac_address].all_addresses:
+                    devices[mac_address].address_aliases = [
+                        *devices[mac_address].address_aliases,
+                        ip_address]
+            else:
+                dev = LANDevice()
+                dev.address = ip_address
+                dev.mac_address = mac_address
+                devices[mac_address] = dev
+    return devices
+
+
+def shared_parse(arp_out):
+    """The current single-pass parser."""
+    return BaseLANDeviceScanner._parse_arp_output(arp_out, hardware_type=True)
+
+
+def make_arp_output(count):
+    """Generates the output of "arp -n" for a /16 network."""
+    lines = ["Address                  HWtype  HWaddress           Flags Mask            Iface"]
+    for i in range(count):
+        ip_address = "10.{}.{}.{}".format(i // 65536 % 256, i // 256 % 256, i % 256)
+        # Every tenth device has a second ip address (e.g. a second interface)
+        mac = i - 1 if i % 10 == 1 else i
+        mac_address = ":".join("{:02x}".format(b) for b in (2, 0, mac >> 24 & 0xff,
+                                                            mac >> 16 & 0xff, mac >> 8 & 0xff,
+                                                            mac & 0xff))
+        lines.append("{:<24} ether   {}   C                     eth0".format(ip_address,
+                                                                          mac_address))
+    return "\n".join(lines) + "\n"
+
+
+def measure(function, arp_out, repeat=5):
+    """Returns the best parse time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(arp_out)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    arp_out = make_arp_output(count)
+    print("Parsing {} arp entries ({:.0f} kB)".format(count, len(arp_out) / 1024))
+    assert [dev.to_dict() for dev in legacy_parse(arp_out).values()] == \
+        [dev.to_dict() for dev in shared_parse(arp_out).values()]
+
+    results = {}
+    for name, function in [("legacy", legacy_parse), ("shared", shared_parse)]:
+        results[name] = measure(function, arp_out)
+        print("{:>10}: {:8.2f} ms".format(name, results[name] * 1000))
+    print("   speedup: {:8.2f}x".format(results["legacy"] / results["shared"]))
+
+
+if __name__ == "__main__":
+    main()
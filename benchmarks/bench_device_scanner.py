@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for scanning all device types with the general `DeviceScanner`.
+
+The specific usb and lan scanners are replaced by artificially slow fake scans (like a slow udev
+enumeration and a slow arp command). The serial scan (as it was done before) is compared with the
+concurrent scan of the `DeviceScanner`, which should take as long as the slowest scanner instead of
+the sum of both.
+
+Usage:
+    python benchmarks/bench_device_scanner.py [usb scan time in ms] [lan scan time in ms]
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_manager.device import DeviceType, USBDevice, LANDevice  # noqa: E402
+from device_manager.scanner import DeviceScanner  # noqa: E402
+
+
+def slow_scan(duration, device):
+    """Returns a fake scan function that takes `duration` seconds."""
+    def scan(rescan):
+        time.sleep(duration)
+        return (device,)
+    return scan
+
+
+def serial_scan(scanner):
+    """The scan as it was done before: the specific scanners are run one after another."""
+    devices = []
+    for specific_scanner in scanner._scanners.values():  # pylint: disable=protected-access
+        devices.extend(specific_scanner._scan(True))  # pylint: disable=protected-access
+    return devices
+
+
+def measure(function, repeat=5):
+    """Returns the best time of `function` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    usb_time = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.08
+    lan_time = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.12
+    scanner = DeviceScanner()
+    scanner[DeviceType.USB]._scan = slow_scan(usb_time, USBDevice())
+    scanner[DeviceType.LAN]._scan = slow_scan(lan_time, LANDevice())
+    print("Scanning with usb scan time {:.0f} ms and lan scan time {:.0f} ms".format(
+        usb_time * 1000, lan_time * 1000))
+
+    serial = measure(lambda: serial_scan(scanner))
+    concurrent = measure(lambda: scanner.list_devices(rescan=True))
+    assert len(serial_scan(scanner)) == len(scanner.list_devices(rescan=True)) == 2
+
+    print("    serial: {:8.2f} ms".format(serial * 1000))
+    print("concurrent: {:8.2f} ms".format(concurrent * 1000))
+    print("   speedup: {:8.2f}x".format(serial / concurrent))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for finding devices in the results of a scan with `find_devices`.
+
+The scanner contains thousands of lan neighbors and usb devices. Looking up devices by their
+address, mac address or serial number (like the `DeviceManager` does for each request) with the
+linear filter (as it was done before) is compared with the lookup via the indexes of the scan
+results.
+
+Usage:
+    python benchmarks/bench_find_devices.py [number of lan devices] [number of usb devices]
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_manager.device import USBDevice, LANDevice  # noqa: E402
+from device_manager.scanner._base import BaseDeviceScanner  # noqa: E402
+
+
+class StaticDeviceScanner(BaseDeviceScanner):
+    """A device scanner that returns the results of a previous scan."""
+
+    def __init__(self, devices):
+        super().__init__()
+        self._devices = list(devices)
+
+    def _scan(self, rescan):
+        return tuple(self._devices)
+
+
+def make_devices(lan_count, usb_count):
+    """Creates the results of a scan."""
+    devices = []
+    for i in range(lan_count):
+        device = LANDevice()
+        device.address = "10.{}.{}.{}".format(i >> 16 & 0xFF, i >> 8 & 0xFF, i & 0xFF)
+        device.mac_address = "02:00:00:{:02X}:{:02X}:{:02X}".format(i >> 16 & 0xFF, i >> 8 & 0xFF,
+                                                                   i & 0xFF)
+        devices.append(device)
+    for i in range(usb_count):
+        device = USBDevice()
+        device.address = "/sys/devices/pci0000:00/0000:00:14.0/usb1/1-{}".format(i)
+        device.address_aliases = ["/dev/bus/usb/001/{:03d}".format(i)]
+        device.vendor_id = 0x1D6B
+        device.product_id = i
+        device.serial = "SERIAL{}".format(i)
+        devices.append(device)
+    return devices
+
+
+def linear_find(scanner, **filters):
+    """The lookup as it was done before: each device is checked against the filters."""
+    return tuple(device for device in scanner.list_devices()
+                 if scanner._match_filters(device, **filters))  # pylint: disable=protected-access
+
+
+def measure(function, repeat=5):
+    """Returns the best time of `function` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    lan_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    usb_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    devices = make_devices(lan_count, usb_count)
+    scanner = StaticDeviceScanner(devices)
+    # One lookup by address, mac address and serial number for each of 100 devices
+    lookups = []
+    for device in devices[::max(1, len(devices) // 100)]:
+        if isinstance(device, LANDevice):
+            lookups.append({"address": device.address})
+            lookups.append({"mac_address": device.mac_address.lower()})
+        else:
+            lookups.append({"serial": device.serial})
+    print("Finding {} devices in {} lan and {} usb devices".format(len(lookups), lan_count,
+                                                                   usb_count))
+
+    for filters in lookups:
+        assert linear_find(scanner, **filters) == scanner.find_devices(**filters)
+    linear = measure(lambda: [linear_find(scanner, **filters) for filters in lookups])
+    indexed = measure(lambda: [scanner.find_devices(**filters) for filters in lookups])
+
+    print(" linear: {:8.2f} ms".format(linear * 1000))
+    print("indexed: {:8.2f} ms".format(indexed * 1000))
+    print("speedup: {:8.2f}x".format(linear / indexed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for importing the package `device_manager`.
+
+The dependencies of the device scanners (like pyudev) and slow standard library modules (like
+asyncio) are imported on first use. Importing the package is compared with importing it and using
+the device scanners, which imports everything as it was done before. Each import is measured in a
+new interpreter.
+
+Usage:
+    python benchmarks/bench_import.py [budget]
+
+Args:
+    budget: Optional time budget in ms for `import device_manager`. If it is given, the benchmark
+            fails, if the import takes longer. There is no budget by default, because the time
+            depends on the machine.
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the time in seconds of the import statements in `{}`
+IMPORT_CODE = "import time; start = time.perf_counter(); {}; print(time.perf_counter() - start)"
+
+
+def measure(statements, repeat=5):
+    """Returns the best time of `statements` in a new interpreter in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", IMPORT_CODE.format(statements)],
+                                cwd=ROOT_DIRECTORY, stdout=subprocess.PIPE,
+                                universal_newlines=True, timeout=60, check=True)
+        best = min(best, float(result.stdout.split()[-1]))
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    budget = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else None
+    print("Importing device_manager")
+
+    eager = measure("import device_manager, asyncio, concurrent.futures; "
+                    "device_manager.USBDeviceScanner, device_manager.LANDeviceScanner")
+    lazy = measure("import device_manager")
+
+    print("  eager: {:8.2f} ms".format(eager * 1000))
+    print("   lazy: {:8.2f} ms".format(lazy * 1000))
+    print("speedup: {:8.2f}x".format(eager / lazy))
+    if budget is not None and lazy > budget:
+        sys.exit("Importing device_manager exceeded the time budget")
+
+
+if __name__ == "__main__":
+    main()
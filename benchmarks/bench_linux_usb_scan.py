@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for scanning usb devices with the `LinuxUSBDeviceScanner`.
+
+A large udev device tree is mocked (many block, net, input and pci devices but only a few usb
+devices). The scan that enumerates all devices of the system (as it was done before) is compared
+with the scan that only enumerates the usb subsystem. Like udev, the mocked context only creates
+device objects for the devices that match the filter.
+
+Usage:
+    python benchmarks/bench_linux_usb_scan.py [number of system devices] [number of usb devices]
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyudev  # noqa: E402
+
+from device_manager.scanner._linux import LinuxUSBDeviceScanner  # noqa: E402
+
+
+class FakeDevice(pyudev.Device):
+    """A udev device without a real udev context."""
+
+    def __init__(self, device_path, properties):  # pylint: disable=super-init-not-called
+        self._device_path = device_path
+        self._properties = properties
+
+    def __del__(self):
+        # There is no libudev device that has to be released
+        pass
+
+    @property
+    def device_path(self):
+        return self._device_path
+
+    @property
+    def properties(self):
+        return self._properties
+
+
+class FakeContext:
+    """Mocked udev context with a large device tree."""
+
+    def __init__(self, system_count, usb_count):
+        subsystems = ["block", "net", "input", "pci", "tty", "sound"]
+        self._raw = []
+        for i in range(system_count):
+            subsystem = subsystems[i % len(subsystems)]
+            self._raw.append(("/devices/virtual/{}/dev{}".format(subsystem, i),
+                              {"SUBSYSTEM": subsystem,
+                               "DEVNAME": "/dev/{}{}".format(subsystem, i)}))
+        for i in range(usb_count):
+            self._raw.append(("/devices/pci0000:00/0000:00:14.0/usb1/1-{}".format(i),
+                              {"SUBSYSTEM": "usb", "DEVTYPE": "usb_device",
+                               "DEVNAME": "/dev/bus/usb/001/{:03d}".format(i),
+                               "ID_VENDOR_ID": "1d6b", "ID_MODEL_ID": "{:04x}".format(i),
+                               "ID_REVISION": "0100", "ID_SERIAL_SHORT": "SERIAL{}".format(i)}))
+
+    def list_devices(self, **filters):
+        for device_path, properties in self._raw:
+            if "subsystem" in filters and properties["SUBSYSTEM"] != filters["subsystem"]:
+                continue
+            if "DEVTYPE" in filters and properties.get("DEVTYPE") != filters["DEVTYPE"]:
+                continue
+            # Like pyudev, a device object is created for each enumerated device
+            yield FakeDevice(device_path, dict(properties))
+
+
+def unfiltered_scan(scanner):
+    """The scan as it was done before: all devices of the system are enumerated."""
+    devices = []
+    for raw_dev in scanner._context.list_devices():  # pylint: disable=protected-access
+        try:
+            devices.append(scanner._device_from_raw(raw_dev))  # pylint: disable=protected-access
+        except (TypeError, ValueError):
+            pass
+    return devices
+
+
+def measure(function, repeat=5):
+    """Returns the best time of `function` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    system_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    usb_count = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    scanner = LinuxUSBDeviceScanner()
+    scanner._context = FakeContext(system_count, usb_count)  # pylint: disable=protected-access
+    print("Scanning {} system devices with {} usb devices".format(system_count, usb_count))
+
+    unfiltered = measure(lambda: unfiltered_scan(scanner))
+    filtered = measure(lambda: scanner.list_devices(rescan=True))
+    assert len(unfiltered_scan(scanner)) == len(scanner.list_devices(rescan=True)) == usb_count
+
+    print("unfiltered: {:8.2f} ms".format(unfiltered * 1000))
+    print("  filtered: {:8.2f} ms".format(filtered * 1000))
+    print("   speedup: {:8.2f}x".format(unfiltered / filtered))
+
+
+if __name__ == "__main__":
+    main()
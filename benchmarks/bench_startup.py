@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for creating a `DeviceManager`.
+
+Creating the device manager as it was done before (which scans for all devices) is compared with
+creating it with `lazy_init=True`, which defers creating the device scanners and scanning until the
+devices are requested.
+
+Usage:
+    python benchmarks/bench_startup.py [budget]
+
+Args:
+    budget: Optional time budget in ms for creating a `DeviceManager` with `lazy_init=True`. If it
+            is given, the benchmark fails, if the lazy creation takes longer. There is no budget by
+            default, because the time depends on the machine.
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_manager import DeviceManager  # noqa: E402
+
+
+def measure(function, repeat=5):
+    """Returns the best time of `function` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    budget = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else None
+    print("Creating a DeviceManager")
+
+    eager = measure(DeviceManager)
+    lazy = measure(lambda: DeviceManager(lazy_init=True))
+
+    print("    eager: {:8.2f} ms".format(eager * 1000))
+    print("lazy_init: {:8.2f} ms".format(lazy * 1000))
+    print("  speedup: {:8.2f}x".format(eager / lazy))
+    if budget is not None and lazy > budget:
+        sys.exit("Creating a DeviceManager with lazy_init=True exceeded the time budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark for parsing the usb id database.
+
+Compares the streaming parser `USBVendorDatabase._parse_usb_ids` with the previous implementation,
+which decoded the whole database into a single string, split it into lines and matched regular
+expressions twice per line. Parse time and peak memory (measured with tracemalloc) are reported.
+
+Usage:
+    python benchmarks/bench_usb_ids_parser.py [path/to/usb.ids]
+
+If no path is given, a synthetic database with about the size of the real one (~3000 vendors and
+~20000 products) is generated.
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_manager.utils.usb_vendor_database import USBVendorDatabase  # noqa: E402
+
+
+def legacy_parse(stream):
+    """The parser as it was used before (in `_download_vendors`)."""
+    response_str = stream.read().decode(encoding="latin1")
+    lines = response_str.splitlines()
+    read = False
+
+    vendors = dict()
+
+    for line in lines:
+        line = line.rstrip()
+        if line == "# Vendors, devices and interfaces. Please keep sorted.":
+            read = True
+            continue
+        elif line == "# List of known device classes, subclasses and protocols":
+            read = False
+            break
+
+        if read:
+            if re.match("^[0-9a-f]{4}", line):
+                # Vendor line
+                last_vendor = int(line[:4], base=16)
+                if last_vendor not in vendors:
+                    vendors[last_vendor] = dict()
+                vendors[last_vendor][None] = re.sub("\"", "\\\"", re.sub(r"\?+", "?", repr(
+                    line[4:].strip())[1:-1].replace("\\", "\\\\")))
+            elif re.match("^\t[0-9a-f]{4}", line):
+                # Product line
+                line = line.strip()
+                product = int(line[:4], base=16)
+                vendors[last_vendor][product] = re.sub("\"", "\\\"", re.sub(r"\?+", "?", repr(
+                    line[4:].strip())[1:-1].replace("\\", "\\\\")))
+
+    return vendors
+
+
+def streaming_parse(stream):
+    """The current streaming parser."""
+    return USBVendorDatabase._parse_usb_ids(stream)  # pylint: disable=protected-access
+
+
+def make_database(vendor_count=3000, products_per_vendor=7):
+    """Generates a synthetic usb id database."""
+    lines = ["# Synthetic usb id database", "",
+             "# Vendors, devices and interfaces. Please keep sorted.", ""]
+    for vendor in range(vendor_count):
+        lines.append("{:04x}  Vendor {} \"Electronics\" Co., Ltd.".format(vendor * 16, vendor))
+        for product in range(products_per_vendor):
+            lines.append("\t{:04x}  Product {} of vendor {} [Rev. A]".format(product * 7, product,
+                                                                             vendor))
+            if product % 3 == 0:
+                lines.append("\t\t00  Interface 0")
+    lines.extend(["", "# List of known device classes, subclasses and protocols", ""])
+    for device_class in range(256):
+        lines.append("C {:02x}  Class {}".format(device_class, device_class))
+        for subclass in range(4):
+            lines.append("\t{:02x}  Subclass {}".format(subclass, subclass))
+            for protocol in range(2):
+                lines.append("\t\t{:02x}  Protocol {}".format(protocol, protocol))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def measure(function, data, repeat=5):
+    """Returns the best parse time in seconds and the peak memory in bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(io.BytesIO(data))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = function(io.BytesIO(data))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    """Runs the benchmark."""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as file:
+            data = file.read()
+        source = sys.argv[1]
+    else:
+        data = make_database()
+        source = "synthetic database"
+    print("Parsing {} ({:.0f} kB)".format(source, len(data) / 1024))
+
+    results = {}
+    for name, function in [("legacy", legacy_parse), ("streaming", streaming_parse)]:
+        results[name] = measure(function, data)
+        print("{:>10}: {:8.2f} ms, peak memory {:8.0f} kB".format(
+            name, results[name][0] * 1000, results[name][1] / 1024))
+    print("   speedup: {:8.2f}x".format(results["legacy"][0] / results["streaming"][0]))
+
+
+if __name__ == "__main__":
+    main()
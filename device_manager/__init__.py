@@ -13,9 +13,28 @@ and a dictionary to store devices by a user-defined name. The whole class is ser
 formatted file from which it can be loaded, too.
 """
 
+import sys
+
 # Import relevant classes from this module
 from .device import *  # base device, specific devices and device type enum
 from .manager import *  # device manager that can persistently store devices
-from .scanner import *  # base device scanner and specific device scanners
+from .scanner import DeviceScanner, ScanDiff  # general device scanner
+from . import device as _device, manager as _manager, scanner as _scanner
+
+# The specific device scanners are only imported by `from device_manager import *`, but not by
+# `import device_manager`
+__all__ = [*_device.__all__, *_manager.__all__, *_scanner.__all__]
+
+
+def __getattr__(name):
+    """Imports the specific device scanners (and their dependencies like pyudev) on first access."""
+    if name in ("USBDeviceScanner", "LANDeviceScanner"):
+        return getattr(_scanner, name)
+    raise AttributeError("module \"{}\" has no attribute \"{}\"".format(__name__, name))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module-level __getattr__ is not supported before python 3.7, so the scanners are imported now
+    from .scanner import *  # base device scanner and specific device scanners
 
 __version__ = "0.2.4"
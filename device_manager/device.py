@@ -226,8 +226,6 @@ class USBDevice(Device):
         self._product_id = None
         self._revision_id = None
         self._serial = None
-        self._vendor_name = None
-        self._product_name = None
 
     @property
     def device_type(self) -> DeviceType:
@@ -255,13 +253,14 @@ class USBDevice(Device):
         if not isinstance(vendor_id, (int, type(None))):
             raise TypeError("vendor_id")
         self._vendor_id = vendor_id
-        self._vendor_name, self._product_name = USBVendorDatabase.get_vendor_product_name(
-                                                    self.vendor_id, self.product_id)
 
     @property
-    def vendor_name(self) -> str:
-        """Name of the device's manufacturer."""
-        return self._vendor_name
+    def vendor_name(self) -> typing.Optional[str]:
+        """Name of the device's manufacturer.
+
+        The name is looked up in the usb id database when it is requested.
+        """
+        return USBVendorDatabase.get_vendor_product_name(self.vendor_id, self.product_id)[0]
 
     @property
     def product_id(self) -> typing.Optional[int]:
@@ -273,13 +272,14 @@ class USBDevice(Device):
         if not isinstance(product_id, (int, type(None))):
             raise TypeError("product_id")
         self._product_id = product_id
-        self._vendor_name, self._product_name = USBVendorDatabase.get_vendor_product_name(
-                                                    self.vendor_id, self.product_id)
 
     @property
-    def product_name(self) -> str:
-        """The model name of the device."""
-        return self._product_name
+    def product_name(self) -> typing.Optional[str]:
+        """The model name of the device.
+
+        The name is looked up in the usb id database when it is requested.
+        """
+        return USBVendorDatabase.get_vendor_product_name(self.vendor_id, self.product_id)[1]
 
     @property
     def revision_id(self) -> typing.Optional[int]:
@@ -37,24 +37,34 @@ Examples:
     >>>     dm.save(f)  # Save the device manager to "filename.json"
     >>> with load_device_manager("filename.json") as dev_man:
     >>>     device = dev_man["my-device", "usb"]  # returns `usb_device`
+
+    Inside of an asyncio event loop, the async functions can be used instead. Concurrent lookups
+    share the same scan.
+
+    >>> await dm.aset("my-device", "192.168.1.23")
+    >>> device = await dm.aget(("my-device", "lan"))
 """
 
 import contextlib
 import copy
 import json
+import threading
+import time
 import typing
 import warnings
 
 from .device import Device, DeviceType, DeviceTypeDict, DeviceTypeType
 from .scanner import DeviceScanner
+from .utils.usb_vendor_database import USBVendorDatabase
 
-__all__ = ["DeviceManager", "load_device_manager"]
+__all__ = ["DeviceManager", "ResolveReport", "load_device_manager"]
 
 ####################################################################################################
 
 
 @contextlib.contextmanager
-def load_device_manager(filename: str, autosave: bool = False) \
+def load_device_manager(filename: str, autosave: bool = False,
+                        resolve: typing.Optional[bool] = None, **kwargs) \
         -> typing.ContextManager["DeviceManager"]:
     """Loads a device manager from a json formatted file.
 
@@ -63,15 +73,20 @@ def load_device_manager(filename: str, autosave: bool = False) \
         autosave: True to save the device manager at the end of the with-statement, but only if no
                   error occurred. If you want your device manager to be saved, use a try-except
                   block inside the with-block.
+        resolve: True, to search for the addresses of the loaded devices immediately. False, to
+                 search for them, when they are requested (see `DeviceManager.load`). None, to use
+                 the default of the device manager.
+        **kwargs: Arguments that are passed to the `DeviceManager` (like `lazy`, `lazy_init` or the
+                  options of the `DeviceScanner`).
 
     Returns:
         A context manager which can be used in a with-statement. That context manager returns a
         DeviceManager if it is used in a with-statement.
     """
-    manager = DeviceManager()
+    manager = DeviceManager(**kwargs)
     # Load the device manager from `filename`
     with open(filename, "r") as file:
-        manager.load(file)
+        manager.load(file, resolve=resolve)
     # Return the device manager that was loaded from `filename`
     yield manager
     if autosave:
@@ -273,6 +288,16 @@ class DeviceDict:
         return name, device_type  # key as tuple
 
 
+class ResolveReport(typing.NamedTuple):
+    """The results of resolving several stored devices at once (see `DeviceManager.get_many`)."""
+    devices: typing.Dict[typing.Union[str, typing.Tuple[str, DeviceTypeType]],
+                         typing.Union[typing.Dict[DeviceType, Device], Device]]
+    """The requested devices by their keys (like `DeviceManager.get`)."""
+    not_found: typing.Tuple[typing.Tuple[str, DeviceType], ...] = ()
+    """The entries (name and device type) whose devices were not found. Their addresses are
+    reset."""
+
+
 class DeviceManager(DeviceDict):
     """The `DeviceManager` stores devices by user-defined names. Also multiple devices can be stored
     for the same name as long as the device types are different.
@@ -282,16 +307,59 @@ class DeviceManager(DeviceDict):
     - self[name, type] or self[name][type] can also be used to request a specific type of device.
 
     Args:
-        file: A handle to a json formatted file, to load the device manager data from.
+        prefetch_usb_ids: True, to load the usb id database (vendor and product names) in a
+                          background thread, so it does not block the first scan. Names that are
+                          requested before the database is loaded, are not available until it is
+                          loaded (see `USBVendorDatabase.prefetch`).
+        revalidate: True, to return stored devices with known addresses immediately and to search
+                    for updated addresses in the background (see `get`). False, to search for
+                    updated addresses before returning them.
+        lazy: True, to store devices (also loaded ones) without searching for their addresses. The
+              addresses are searched, when the devices are requested for the first time. False, to
+              search for the addresses when storing the devices.
+        lazy_init: True, to create the device scanners when they are used for the first time and
+                   to scan on demand. False, to scan for all devices when creating the device
+                   manager.
+        resolve_window: Time in seconds for which the results of a scan are used to resolve devices
+                        that are requested for the first time in lazy mode. So, the first requests
+                        of several devices within this time share one scan.
+        **kwargs: Arguments that are passed to the `DeviceScanner`. With the option `max_age`, the
+                  results of a scan are reused for this time in seconds, when searching for stored
+                  devices. By default, each search for a stored device performs a new scan.
     """
-    def __init__(self, **kwargs):
+    def __init__(self, prefetch_usb_ids: bool = False, revalidate: bool = False,
+                 lazy: bool = False, lazy_init: bool = False, resolve_window: float = 0.5,
+                 **kwargs):
         super().__init__()
-        self._scanner = DeviceScanner(**kwargs)
-        self._scanner.list_devices()
+        if prefetch_usb_ids:
+            USBVendorDatabase.prefetch()
+        self._revalidate = revalidate
+        self._lazy = lazy
+        self._resolve_window = resolve_window
+        # Time of the latest scan per device type (`time.monotonic()`) to resolve devices lazily
+        self._resolve_times = {}
+        # Time of the latest search per stored device by its id: (device, `time.monotonic()`)
+        self._search_times = {}
+        # Devices waiting for and running in the background revalidation by their ids
+        self._revalidate_lock = threading.Lock()
+        self._revalidate_pending = {}
+        self._revalidate_running = {}
+        self._revalidate_thread = None
+        self._revalidate_done = threading.Event()
+        self._revalidate_done.set()
+        self._scanner = None
+        self._scanner_kwargs = kwargs
+        self._scanner_lock = threading.Lock()
+        if not lazy_init:
+            self.scanner.list_devices()
 
     @property
     def scanner(self) -> DeviceScanner:
         """A `DeviceScanner` object that is used to search for devices"""
+        if self._scanner is None:
+            with self._scanner_lock:
+                if self._scanner is None:
+                    self._scanner = DeviceScanner(**self._scanner_kwargs)
         return self._scanner
 
     def find_by_address(self, address: str, device_type: typing.Optional[DeviceTypeType] = None) \
@@ -306,22 +374,50 @@ class DeviceManager(DeviceDict):
             Device: The device at the given address or None if no device was found.
         """
         # Check the device cache if the address is already known
-        devices = self._scanner[device_type].find_devices(address=address)
+        devices = self.scanner[device_type].find_devices(address=address)
         if len(devices) <= 0:
             # If no device was found, use the argument rescan to rescan for the address
-            devices = self._scanner[device_type].find_devices(address=address, rescan=True)
+            devices = self.scanner[device_type].find_devices(address=address, rescan=True)
         if len(devices) <= 0:
             # If still no device was found and the specified device type was LAN (or None, to search
             # all types), nmap is used to scan for the address. This might get more accurate results
             # pylint: disable=no-member
             if device_type in [DeviceType.LAN, None] and \
-                    self._scanner[DeviceType.LAN].nmap is not None:  # pragma: no cover
-                try:
-                    self._scanner[DeviceType.LAN].nmap.scan(address)
-                except Exception:
-                    pass
+                    self.scanner[DeviceType.LAN].nmap is not None:  # pragma: no cover
+                self._nmap_scan(address)
                 # Read out the device cache again, to also get the nmap results
-                devices = self._scanner[DeviceType.LAN].find_devices(address=address)
+                devices = self.scanner[DeviceType.LAN].find_devices(address=address)
+        return self._address_result(address, devices)
+
+    async def afind_by_address(self, address: str,
+                               device_type: typing.Optional[DeviceTypeType] = None) \
+            -> typing.Optional[Device]:
+        """Finds a device by its address without blocking the event loop (see `find_by_address`).
+
+        Args:
+            address: The device's address or port.
+            device_type: The device type or None, to search for all device types.
+
+        Returns:
+            Device: The device at the given address or None if no device was found.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        devices = await self.scanner[device_type].afind_devices(address=address)
+        if len(devices) <= 0:
+            devices = await self.scanner[device_type].afind_devices(address=address, rescan=True)
+        if len(devices) <= 0:
+            # pylint: disable=no-member
+            if device_type in [DeviceType.LAN, None] and \
+                    self.scanner[DeviceType.LAN].nmap is not None:  # pragma: no cover
+                # nmap does not provide an asyncio interface, so it is run in the default executor
+                await asyncio.get_event_loop().run_in_executor(None, self._nmap_scan, address)
+                devices = await self.scanner[DeviceType.LAN].afind_devices(address=address)
+        return self._address_result(address, devices)
+
+    @staticmethod
+    def _address_result(address: str, devices: typing.Sequence[Device]) -> typing.Optional[Device]:
+        """Returns the device that was found for an address or None, if no device was found."""
         if len(devices) > 0:
             if len(devices) > 1:  # pragma: no cover
                 # This should not happen, but who knows
@@ -355,20 +451,55 @@ class DeviceManager(DeviceDict):
             # device.
             return search_device
         scanner = self.scanner[search_device.device_type]
-        # Rescan for the device
-        devices = scanner.find_devices(rescan=True, **search_device.unique_identifier)
+        # Rescan for the device. If the scanner has a maximum age, recent scan results are used.
+        devices = scanner.find_devices(rescan=scanner.max_age is None,
+                                       **search_device.unique_identifier)
         if len(devices) <= 0:
             # If still no device was found and the type of the specified device type was LAN, nmap
             # is used to scan for the address. This might get more accurate results
             if search_device.device_type == DeviceType.LAN \
                     and scanner.nmap.valid:  # pragma: no cover
-                addresses = [*search_device.all_addresses, *search_device._old_addresses]
-                try:
-                    scanner.nmap.scan(addresses)
-                except Exception:
-                    pass
+                self._nmap_scan([*search_device.all_addresses, *search_device._old_addresses])
                 # Read out the device cache again, to also get the nmap results. No rescan required.
                 devices = scanner.find_devices(**search_device.unique_identifier)
+        return self._device_result(search_device, devices)
+
+    async def afind_by_device(self, search_device: Device, scan: bool = False) \
+            -> typing.Optional[Device]:
+        """Finds a device that matches the unique identifiers of a given device without blocking
+        the event loop (see `find_by_device`).
+
+        Args:
+            search_device: device whose identifiers are used to search for an up-to-date device.
+            scan: True, to scan for devices. False, to scan only, if there are currently no
+                  addresses for the device.
+
+        Returns:
+            A device that matches the identifiers of `search_device` or None.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if not isinstance(search_device, Device):
+            raise TypeError("Invalid device type: {}".format(type(search_device)))
+        if len(search_device.all_addresses) > 0 and not scan:
+            return search_device
+        scanner = self.scanner[search_device.device_type]
+        devices = await scanner.afind_devices(rescan=scanner.max_age is None,
+                                              **search_device.unique_identifier)
+        if len(devices) <= 0:
+            if search_device.device_type == DeviceType.LAN \
+                    and scanner.nmap.valid:  # pragma: no cover
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self._nmap_scan,
+                    [*search_device.all_addresses, *search_device._old_addresses])
+                devices = await scanner.afind_devices(**search_device.unique_identifier)
+        return self._device_result(search_device, devices)
+
+    @staticmethod
+    def _device_result(search_device: Device, devices: typing.Sequence[Device]) \
+            -> typing.Optional[Device]:
+        """Returns a copy of `search_device` updated by the device that was found for it or None, if
+        no device was found."""
         if len(devices) > 0:
             if len(devices) > 1:  # pragma: no cover
                 # This should not happen, but who knows
@@ -381,6 +512,31 @@ class DeviceManager(DeviceDict):
         else:
             return None
 
+    def _nmap_scan(self, addresses: typing.Union[str, typing.List[str]]) -> None:
+        """Scans the addresses with nmap, so the results are available in the lan scanner's cache.
+        Errors are ignored."""
+        try:
+            self.scanner[DeviceType.LAN].nmap.scan(addresses)  # pylint: disable=no-member
+        except Exception:  # pragma: no cover
+            pass
+
+    def _update_device(self, device: Device, found: typing.Optional[Device]) -> None:
+        """Updates the addresses of a stored device by the device that was found for it.
+
+        Args:
+            device: The stored device.
+            found: The device found by `find_by_device` or None, if it was not found.
+        """
+        if found is not device:
+            # `find_by_device` returns the stored device itself, if it did not search for it
+            self._search_times[id(device)] = (device, time.monotonic())
+        if found is not None:
+            device.from_device(found)
+        elif len(device.all_addresses) > 0:
+            # If there are any addresses stored in `device` reset them because they are not
+            # up-to-date anymore.
+            device.reset_addresses()
+
     def set(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]],
             value: typing.Union[Device, str], scan: bool = False) -> None:
         """Sets self[key] to value. The value is a `Device`-object or a string.
@@ -394,7 +550,8 @@ class DeviceManager(DeviceDict):
                    a string is used, it is interpreted as the device's address. The device at this
                    address is determined automatically.
             scan: True, to rescan for the device. If no addresses are known for the device to set, a
-                  scan is performed nevertheless. False, if you only want to scan in that case.
+                  scan is performed nevertheless. False, if you only want to scan in that case. In
+                  lazy mode, the device is only searched, if `scan` is True.
         """
         name, device_type = self._getitem_key(key)
         if isinstance(value, str):
@@ -410,18 +567,88 @@ class DeviceManager(DeviceDict):
                 raise ValueError("The second component of the specified key ({}) does not match the"
                                  "value's type ({})".format(device_type, value.device_type))
             device = value
-            found = self.find_by_device(device, scan=scan)
-            if found is not None:
-                device.from_device(found)
-            elif len(device.all_addresses) > 0:
-                # If there are any addresses stored in `device` reset them because they are not
-                # up-to-date anymore.
-                device.reset_addresses()
+            if not self._lazy or scan:
+                self._update_device(device, self.find_by_device(device, scan=scan))
+        else:
+            raise TypeError("value")
+        self._store(name, device)
+
+    async def aset(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]],
+                   value: typing.Union[Device, str], scan: bool = False) -> None:
+        """Sets self[key] to value without blocking the event loop (see `set`).
+
+        Args:
+            key: The key (device name) used to store the value (device).
+            value: Value to store at self[key]. The value can be a `Device`-object or a string. If
+                   a string is used, it is interpreted as the device's address.
+            scan: True, to rescan for the device. False, if you only want to scan, if no addresses
+                  are known for the device to set.
+        """
+        name, device_type = self._getitem_key(key)
+        if isinstance(value, str):
+            device = await self.afind_by_address(value, device_type)
+            if device is None:
+                raise ValueError("No {}device was found for address \"{}\".".format(
+                    (device_type.value + "-") if device_type is not None else "", value))
+        elif isinstance(value, Device):
+            if device_type is not None and device_type != value.device_type:
+                raise ValueError("The second component of the specified key ({}) does not match the"
+                                 "value's type ({})".format(device_type, value.device_type))
+            device = value
+            if not self._lazy or scan:
+                self._update_device(device, await self.afind_by_device(device, scan=scan))
         else:
             raise TypeError("value")
+        self._store(name, device)
+
+    def _store(self, name: str, device: Device) -> None:
+        """Stores a device without searching for it. The latest search of a replaced device is
+        forgotten.
+
+        Args:
+            name: The device name.
+            device: The device to store.
+        """
+        try:
+            previous = super().get((name, device.device_type))
+        except KeyError:
+            previous = None
+        if previous is not None and previous is not device:
+            self._forget_search_times([previous])
         super().set(name, device)
 
-    def get(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]], scan: bool = False) \
+    def remove(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]]) -> None:
+        """Deletes the value(s) behind self[key].
+
+        Args:
+            key: The key whose value is requested. It can be a single string which specifies the
+                 device's name. Or the key is a tuple. If this is the case, the first component
+                 specifies the device's name, as well. The second component specifies a `DeviceType`
+                 that is used as key for the `DeviceTypeDict`: So, self[name, type] is equal to
+                 self[name][type].
+        """
+        removed = super().get(key)
+        super().remove(key)
+        self._forget_search_times([removed] if isinstance(removed, Device) else removed.values())
+
+    def clear(self) -> None:
+        """Removes all items from self"""
+        super().clear()
+        self._search_times.clear()
+
+    def _forget_search_times(self, devices: typing.Iterable[Device]) -> None:
+        """Removes the times of the latest searches of devices, that are not stored anymore.
+
+        Args:
+            devices: The removed devices.
+        """
+        for device in devices:
+            entry = self._search_times.get(id(device))
+            if entry is not None and entry[0] is device:
+                del self._search_times[id(device)]
+
+    def get(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]], scan: bool = False,
+            revalidate: typing.Optional[bool] = None) \
             -> typing.Union[typing.Dict[DeviceType, Device], Device]:
         """Gets the value(s) behind self[key] (or self[key, type], if key is a tuple). If a device
         is found for the key, this function searches for updated addresses of this device, as soon
@@ -436,6 +663,12 @@ class DeviceManager(DeviceDict):
             scan: True, to rescan for the device. If no addresses are known for the requested
                   device, a scan is performed nevertheless. False, if you only want to scan in that
                   case.
+            revalidate: True, to return devices with known addresses immediately and to search for
+                        their updated addresses in a background thread (stale-while-revalidate),
+                        if `scan` is True or if the latest search for the device is older than the
+                        option `max_age` of the scanner. When the search is finished, the returned
+                        device is updated. Devices without known addresses are searched for
+                        immediately. None, to use the option `revalidate` of the device manager.
 
         Returns:
             If key is a single string, the return value is a `DeviceTypeDict`-object containing all
@@ -444,27 +677,230 @@ class DeviceManager(DeviceDict):
             value is the same as self[name][type].
         """
         device = super().get(key)
+        searched, unresolved = self._plan_get(device, scan, revalidate)
+        for dev in searched:
+            self._update_device(dev, self.find_by_device(dev, scan=scan))
+        if len(unresolved) > 0:
+            self._resolve_lazily(unresolved)
+        return device
+
+    def _plan_get(self, device: typing.Union[typing.Dict[DeviceType, Device], Device], scan: bool,
+                  revalidate: typing.Optional[bool]) \
+            -> typing.Tuple[typing.List[Device], typing.List[Device]]:
+        """Decides how the requested devices of `get` and `aget` are searched. Devices, that are
+        revalidated, are passed to the background thread.
+
+        Args:
+            device: The stored value(s) behind the requested key.
+            scan: True, to rescan for the devices.
+            revalidate: True, to revalidate devices with known addresses in the background. None, to
+                        use the option `revalidate` of the device manager.
+
+        Returns:
+            tuple of list of Device: The devices to search for now.
+                             list of Device: The devices to resolve lazily (see `_resolve_lazily`).
+        """
+        if revalidate is None:
+            revalidate = self._revalidate
         if isinstance(device, Device):
-            found = self.find_by_device(device, scan=scan)
-            if found is not None:
-                device.from_device(found)
-            elif len(device.all_addresses) > 0:
-                # If there are any addresses stored in `device` reset them because they are not
-                # up-to-date anymore.
-                device.reset_addresses()
+            devices = [device]
         elif isinstance(device, dict):
             # Search for updated addresses of the stored device, but only if there are no addresses
             # known, yet
-            for dev in device.values():
-                found = self.find_by_device(dev, scan=scan)
-                if found is not None:
-                    dev.from_device(found)
-                elif len(dev.all_addresses) > 0:
-                    # If there are any addresses stored in `device` reset them because they are not
-                    # up-to-date anymore.
-                    dev.reset_addresses()
+            devices = list(device.values())
         else:  # pragma: no cover
             raise TypeError("Expected Device or dict, got {} instead".format(type(device)))
+        searched = []
+        unresolved = []
+        for dev in devices:
+            if revalidate and len(dev.all_addresses) > 0:
+                # The last known addresses are probably still valid
+                if scan or self._is_outdated(dev):
+                    self._start_revalidation(dev)
+            elif self._lazy and not scan and len(dev.all_addresses) == 0:
+                unresolved.append(dev)
+            else:
+                searched.append(dev)
+        return searched, unresolved
+
+    def _is_outdated(self, device: Device) -> bool:
+        """Returns True, if the latest search for a stored device is older than the option `max_age`
+        of the scanner. Without `max_age`, known addresses never become outdated."""
+        if self._scanner is not None:
+            max_age = self._scanner[device.device_type].max_age
+        else:
+            max_age = self._scanner_kwargs.get("max_age")
+        if max_age is None:
+            return False
+        entry = self._search_times.get(id(device))
+        return entry is None or entry[0] is not device or time.monotonic() - entry[1] > max_age
+
+    def _resolve_lazily(self, devices: typing.Sequence[Device]) -> None:
+        """Searches for the addresses of devices, that are requested for the first time in lazy
+        mode.
+
+        A scan per device type is only performed, if the previous one is older than the resolve
+        window. Otherwise, the devices are searched in the results of the previous scan. So, the
+        first requests of several devices within a short time share one scan.
+
+        Args:
+            devices: The stored devices without known addresses.
+        """
+        for device_type in self._lazy_scan_types(devices):
+            scanner = self.scanner[device_type]
+            scanner.list_devices(rescan=scanner.max_age is None)
+            self._resolve_times[device_type] = time.monotonic()
+        self._match_devices(devices)
+
+    async def _aresolve_lazily(self, devices: typing.Sequence[Device]) -> None:
+        """Searches for the addresses of devices, that are requested for the first time in lazy
+        mode, without blocking the event loop (see `_resolve_lazily`).
+
+        Args:
+            devices: The stored devices without known addresses.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        device_types = self._lazy_scan_types(devices)
+        scanners = [self.scanner[device_type] for device_type in device_types]
+        await asyncio.gather(*(scanner.alist_devices(rescan=scanner.max_age is None)
+                               for scanner in scanners))
+        for device_type in device_types:
+            self._resolve_times[device_type] = time.monotonic()
+        self._match_devices(devices)
+
+    def _lazy_scan_types(self, devices: typing.Sequence[Device]) -> typing.List[DeviceType]:
+        """Returns the device types of `devices`, whose latest scan is older than the resolve
+        window."""
+        now = time.monotonic()
+        return [device_type for device_type in {device.device_type for device in devices}
+                if device_type not in self._resolve_times
+                or now - self._resolve_times[device_type] > self._resolve_window]
+
+    def get_many(self, keys: typing.Iterable[typing.Union[str, typing.Tuple[str, DeviceTypeType]]],
+                 scan: bool = False) -> ResolveReport:
+        """Gets the values behind several keys at once (see `get`).
+
+        Instead of searching for each device separately, all devices are searched with one scan
+        per required device type.
+
+        Args:
+            keys: The keys whose values are requested. Each key is a device's name or a tuple
+                  (name, type).
+            scan: True, to rescan for the devices. False, to only search for devices without known
+                  addresses.
+
+        Returns:
+            ResolveReport: The requested values by their keys and the entries, whose devices were
+                           not found.
+
+        Raises:
+            KeyError: If a key does not exist.
+        """
+        result = {}
+        entries = []
+        for key in keys:
+            value = super().get(key)
+            result[key] = value
+            name, _ = self._getitem_key(key)
+            devices = [value] if isinstance(value, Device) else list(value.values())
+            entries.extend((name, device) for device in devices
+                           if scan or len(device.all_addresses) == 0)
+        # Each device is only searched once, even if it was requested by several keys
+        unique_devices = list({id(device): device for _, device in entries}.values())
+        not_found = {id(device) for device in self._resolve_devices(unique_devices)}
+        return ResolveReport(result, tuple(dict.fromkeys(
+            (name, device.device_type) for name, device in entries if id(device) in not_found)))
+
+    def resolve_all(self, scan: bool = True) -> ResolveReport:
+        """Searches for the addresses of all stored devices with one scan per device type.
+
+        Args:
+            scan: True, to rescan for all devices. False, to only search for devices without known
+                  addresses.
+
+        Returns:
+            ResolveReport: All stored values by their names and the entries, whose devices were not
+                           found.
+        """
+        return self.get_many(self.keys(), scan=scan)
+
+    def wait_for_revalidation(self, timeout: typing.Optional[float] = None) -> bool:
+        """Waits until the background revalidation of the devices (see `get`) is finished.
+
+        Args:
+            timeout: Time in seconds to wait. None, to wait until the revalidation is finished.
+
+        Returns:
+            bool: True, if the revalidation is finished. False, if the timeout expired.
+        """
+        return self._revalidate_done.wait(timeout)
+
+    def _start_revalidation(self, device: Device) -> None:
+        """Searches for updated addresses of a device in a background thread.
+
+        Devices, that are requested while the background thread is running, are searched for in the
+        next iteration of the thread. So they share the next scan. Devices, that are already pending
+        or being searched for, are not searched again.
+
+        Args:
+            device: The stored device.
+        """
+        with self._revalidate_lock:
+            if id(device) in self._revalidate_pending or id(device) in self._revalidate_running:
+                return
+            self._revalidate_pending[id(device)] = device
+            if self._revalidate_thread is None:
+                self._revalidate_done.clear()
+                self._revalidate_thread = threading.Thread(target=self._revalidate_devices,
+                                                           name="DeviceManager", daemon=True)
+                self._revalidate_thread.start()
+
+    def _revalidate_devices(self) -> None:
+        """Searches for updated addresses of the pending devices, until there are no more pending
+        devices. Each iteration scans once per device type."""
+        while True:
+            with self._revalidate_lock:
+                self._revalidate_running = self._revalidate_pending
+                self._revalidate_pending = {}
+                devices = list(self._revalidate_running.values())
+                if len(devices) == 0:
+                    self._revalidate_thread = None
+                    self._revalidate_done.set()
+                    return
+            try:
+                self._resolve_devices(devices)
+            except Exception as exc:  # pragma: no cover
+                warnings.warn("Could not revalidate the devices: {}".format(exc))
+
+    async def aget(self, key: typing.Union[str, typing.Tuple[str, DeviceTypeType]],
+                   scan: bool = False, revalidate: typing.Optional[bool] = None) \
+            -> typing.Union[typing.Dict[DeviceType, Device], Device]:
+        """Gets the value(s) behind self[key] without blocking the event loop (see `get`). The
+        devices of all types are searched concurrently. The options `lazy` and `revalidate` of the
+        device manager apply in the same way as for `get`.
+
+        Args:
+            key: The key whose value is requested: A device's name or a tuple (name, type).
+            scan: True, to rescan for the device. False, if you only want to scan, if no addresses
+                  are known for the requested device.
+            revalidate: True, to return devices with known addresses immediately and to search for
+                        their updated addresses in a background thread. None, to use the option
+                        `revalidate` of the device manager.
+
+        Returns:
+            A `DeviceTypeDict`-object containing all available device types for this device, if key
+            is a single string. The device of the requested type, if key is a tuple.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        device = super().get(key)
+        searched, unresolved = self._plan_get(device, scan, revalidate)
+        found = await asyncio.gather(*(self.afind_by_device(dev, scan=scan) for dev in searched))
+        for dev, found_dev in zip(searched, found):
+            self._update_device(dev, found_dev)
+        if len(unresolved) > 0:
+            await self._aresolve_lazily(unresolved)
         return device
 
     def reset_addresses(self) -> None:
@@ -475,7 +911,8 @@ class DeviceManager(DeviceDict):
             for device in devices.values():
                 device.reset_addresses()
 
-    def load(self, file: typing.IO, clear: bool = True) -> None:
+    def load(self, file: typing.IO, clear: bool = True, resolve: typing.Optional[bool] = None) \
+            -> None:
         """Loads the device managers data from a json formatted file.
 
         Args:
@@ -483,12 +920,131 @@ class DeviceManager(DeviceDict):
             clear: True, if all previous data of this device manager should be cleared before
                    loading the file. False, to keep the previous data. In this case, devices with
                    equal keys may be replaced by the file's data.
+            resolve: True, to search for the addresses of all loaded devices. Only one scan per
+                     device type is performed for all devices. False, to defer the search until the
+                     devices are requested. None, to defer it only in lazy mode.
         """
         if clear:
             # Clear device before loading, if the caller wants so
             self.clear()
+        devices = self._read_devices(file)
+        if resolve is None:
+            resolve = not self._lazy
+        if resolve:
+            self._resolve_devices([device for _, device in devices])
+        for name, device in devices:
+            # The devices are already resolved, so they are stored without searching again
+            self._store(name, device)
+
+    async def aload(self, file: typing.IO, clear: bool = True,
+                    resolve: typing.Optional[bool] = None) -> None:
+        """Loads the device managers data from a json formatted file without blocking the event loop
+        (see `load`).
+
+        Args:
+            file: A handle to a json formatted file, to load the device manager data from.
+            clear: True, if all previous data of this device manager should be cleared before
+                   loading the file. False, to keep the previous data.
+            resolve: True, to search for the addresses of all loaded devices. False, to defer the
+                     search until the devices are requested. None, to defer it only in lazy mode.
+        """
+        if clear:
+            self.clear()
+        devices = self._read_devices(file)
+        if resolve is None:
+            resolve = not self._lazy
+        if resolve:
+            await self._aresolve_devices([device for _, device in devices])
+        for name, device in devices:
+            self._store(name, device)
+
+    def _resolve_devices(self, devices: typing.Sequence[Device], scan: bool = True) \
+            -> typing.List[Device]:
+        """Searches for the updated addresses of several devices with one scan per device type.
+
+        Args:
+            devices: The stored devices.
+            scan: True, to scan for the devices. False, to use the results of the previous scans
+                  (if there are no results, a scan is performed nevertheless).
+
+        Returns:
+            list of Device: The devices that were not found.
+        """
+        for device_type in {device.device_type for device in devices}:
+            scanner = self.scanner[device_type]
+            scanner.list_devices(rescan=scan and scanner.max_age is None)
+        return self._match_devices(devices)
+
+    async def _aresolve_devices(self, devices: typing.Sequence[Device], scan: bool = True) \
+            -> typing.List[Device]:
+        """Searches for the updated addresses of several devices with one scan per device type
+        without blocking the event loop (see `_resolve_devices`).
+
+        Returns:
+            list of Device: The devices that were not found.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        scanners = [self.scanner[device_type]
+                    for device_type in {device.device_type for device in devices}]
+        await asyncio.gather(*(scanner.alist_devices(rescan=scan and scanner.max_age is None)
+                               for scanner in scanners))
+        return self._match_devices(devices)
+
+    def _match_devices(self, devices: typing.Sequence[Device]) -> typing.List[Device]:
+        """Updates the addresses of several devices by the results of the previous scans.
+
+        Lan devices that were not found, are searched with a single nmap scan (if available).
+
+        Args:
+            devices: The stored devices.
+
+        Returns:
+            list of Device: The devices that were not found.
+        """
+        not_found = []
+        if len(devices) == 0:
+            # Nothing to search for, so the scanners are not needed (see option `lazy_init`)
+            return not_found
+        for device in devices:
+            found = self._device_result(device, self.scanner[device.device_type].find_devices(
+                **device.unique_identifier))
+            if found is None:
+                not_found.append(device)
+            else:
+                self._update_device(device, found)
+
+        missing_lan_devices = [device for device in not_found
+                               if device.device_type == DeviceType.LAN]
+        lan_scanner = self.scanner[DeviceType.LAN] if len(missing_lan_devices) > 0 else None
+        if lan_scanner is not None and lan_scanner.nmap.valid:  # pragma: no cover
+            self._nmap_scan([address for device in missing_lan_devices
+                             for address in [*device.all_addresses, *device._old_addresses]])
+            for device in missing_lan_devices:
+                found = self._device_result(device, lan_scanner.find_devices(
+                    **device.unique_identifier))
+                if found is not None:
+                    not_found.remove(device)
+                    self._update_device(device, found)
+
+        for device in not_found:
+            self._update_device(device, None)
+        return not_found
+
+    @staticmethod
+    def _read_devices(file: typing.IO) -> typing.List[typing.Tuple[str, Device]]:
+        """Reads the devices from a json formatted file.
+
+        Args:
+            file: A handle to a json formatted file, to load the device manager data from.
+
+        Returns:
+            list of tuple of str: The name of the device.
+                             Device: The device.
+        """
         # Convert json file to dictionary
         dct = json.load(file)
+        devices = []
         # Add values of the dictionary to self
         for name, raw_devices in dct.items():
             for device_type_name, raw_device in raw_devices.items():
@@ -496,7 +1052,8 @@ class DeviceManager(DeviceDict):
                 device = DeviceType(device_type_name).type()
                 # Fill device's attributes from raw dictionary
                 device.from_dict(raw_device, old=True)
-                self[name] = device
+                devices.append((name, device))
+        return devices
 
     def save(self, file: typing.IO, pretty: bool = False) -> None:
         """Serializes the device manager to json and saves it to a file.
@@ -5,9 +5,10 @@
 There are special device scanners (like `USBDeviceScanner` and `LANDeviceScanner`). These are used
 to scan a specific protocol for connected devices. They are implemented for windows and linux to
 make them work on the most common platforms. The windows and linux specific classes are imported
-automatically depending on your system. Additionally, there is the general `DeviceScanner` that uses
-the specific device scanners inside. So this class can be used to scan for different device types if
-the type is unknown or if the user specifies a specific type, the scan is focused on this type.
+automatically depending on your system, when they are used for the first time. Additionally, there
+is the general `DeviceScanner` that uses the specific device scanners inside. So this class can be
+used to scan for different device types if the type is unknown or if the user specifies a specific
+type, the scan is focused on this type.
 
 Examples:
     Creating a general device scanner:
@@ -33,27 +34,81 @@ Examples:
     For more information take a look at the `NMAPWrapper`.
 
     >>> s["lan"].nmap.scan(...)
+
+    Inside of an asyncio event loop, the scanners can be used without blocking the loop. Concurrent
+    calls share the same scan.
+
+    >>> devices = await s.alist_devices()
+    >>> usb_device = await s.afind_devices(serial="1234567890AB")
 """
 
 import sys
+import time
 import typing
+import warnings
+import weakref
 
-from ._base import BaseDeviceScanner
+from ._base import BaseDeviceScanner, ScanDiff
 from ..device import DeviceType, Device, DeviceTypeDict, DeviceTypeType
 
-# Import specific device scanners depending on current platform
-if sys.platform == "win32":
-    # Device scanners when working on windows
-    from ._win32 import Win32USBDeviceScanner as USBDeviceScanner
-    from ._win32 import Win32LANDeviceScanner as LANDeviceScanner
-elif sys.platform == "linux":
-    # Device scanners when working on other platforms (especially linux) that are usually unix based
-    from ._linux import LinuxUSBDeviceScanner as USBDeviceScanner
-    from ._linux import LinuxLANDeviceScanner as LANDeviceScanner
-else:
+if sys.platform not in ("win32", "linux"):
     raise OSError("The platform \"{}\" is not supported".format(sys.platform))
 
-__all__ = ["DeviceScanner", "USBDeviceScanner", "LANDeviceScanner"]
+__all__ = ["DeviceScanner", "USBDeviceScanner", "LANDeviceScanner", "ScanDiff"]
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # At runtime, the specific device scanners are provided by `__getattr__` on first access. They
+    # are only declared here for static analysis.
+    if sys.platform == "win32":
+        from ._win32 import Win32USBDeviceScanner as USBDeviceScanner
+        from ._win32 import Win32LANDeviceScanner as LANDeviceScanner
+    else:
+        from ._linux import LinuxUSBDeviceScanner as USBDeviceScanner
+        from ._linux import LinuxLANDeviceScanner as LANDeviceScanner
+
+
+def _platform_scanners() -> typing.Dict[str, typing.Any]:
+    """Imports the specific device scanners depending on current platform. The platform-specific
+    modules import heavy dependencies (like pyudev or win32com), so they are only imported when the
+    scanners are used for the first time.
+
+    Returns:
+        dict: A dictionary, mapping the public names of the specific device scanners to their
+              classes. The key "_USB_BACKENDS" maps to the available implementations of usb device
+              scanners (option "usb_backend" of `DeviceScanner`).
+    """
+    if sys.platform == "win32":
+        # Device scanners when working on windows
+        from ._win32 import Win32USBDeviceScanner, Win32LANDeviceScanner
+        return {"USBDeviceScanner": Win32USBDeviceScanner,
+                "LANDeviceScanner": Win32LANDeviceScanner,
+                "_USB_BACKENDS": {"wmi": Win32USBDeviceScanner}}
+    # Device scanners when working on other platforms (especially linux) that are usually unix based
+    from ._linux import LinuxUSBDeviceScanner, LinuxLANDeviceScanner, LinuxSysfsUSBDeviceScanner
+    return {"USBDeviceScanner": LinuxUSBDeviceScanner,
+            "LANDeviceScanner": LinuxLANDeviceScanner,
+            "LinuxSysfsUSBDeviceScanner": LinuxSysfsUSBDeviceScanner,
+            "_USB_BACKENDS": {"udev": LinuxUSBDeviceScanner,
+                              "sysfs": LinuxSysfsUSBDeviceScanner}}
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Imports the specific device scanners on first access (PEP 562)."""
+    if name not in ("USBDeviceScanner", "LANDeviceScanner", "LinuxSysfsUSBDeviceScanner",
+                    "_USB_BACKENDS"):
+        # Submodules (like `_netlink`) are also looked up here, before they are imported
+        raise AttributeError("module \"{}\" has no attribute \"{}\"".format(__name__, name))
+    scanners = _platform_scanners()
+    if name not in scanners:
+        raise AttributeError("module \"{}\" has no attribute \"{}\"".format(__name__, name))
+    # Store the scanners in the module, so they are only looked up once
+    globals().update(scanners)
+    return scanners[name]
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module-level __getattr__ is not supported before python 3.7, so the scanners are imported now
+    globals().update(_platform_scanners())
 
 ####################################################################################################
 
@@ -64,13 +119,49 @@ class DeviceScanner(BaseDeviceScanner):
     Calling the `BaseDeviceScanner`-functions on this object causes the scanner to search in all
     protocols. If only a specific device type required, use the `__getitem__`-operator to specify
     the device type.
+
+    Args:
+        **kwargs: The options are passed to the specific device scanners. Additionally, there are
+                  the following options:
+          - usb_backend: The implementation used to scan for usb devices. On linux, this is either
+                         "udev" (default) or "sysfs" (reads the devices directly from sysfs, which
+                         is faster, but does not find usb interfaces). On windows, only "wmi" is
+                         available.
+          - scan_timeout: Time in seconds to wait for each specific device scanner, when scanning
+                          all device types. If a scanner does not finish in time, the results of its
+                          previous scan are used. No timeout by default.
     """
 
     def __init__(self, **kwargs):
-        super().__init__()
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+        super().__init__(**kwargs)
+        scanners = _platform_scanners()
+        usb_backends = scanners["_USB_BACKENDS"]
+        usb_backend = kwargs.get("usb_backend", None)
+        if usb_backend is None:
+            usb_scanner_type = scanners["USBDeviceScanner"]
+        elif usb_backend in usb_backends:
+            usb_scanner_type = usb_backends[usb_backend]
+        else:
+            raise ValueError("Unknown usb backend \"{}\", expected one of: {}.".format(
+                usb_backend, ", ".join(usb_backends)))
+
         self._scanners = DeviceTypeDict()
-        self._scanners[DeviceType.USB] = USBDeviceScanner(**kwargs)
-        self._scanners[DeviceType.LAN] = LANDeviceScanner(**kwargs)
+        self._scanners[DeviceType.USB] = usb_scanner_type(**kwargs)
+        self._scanners[DeviceType.LAN] = scanners["LANDeviceScanner"](**kwargs)
+        self._scan_timeout = kwargs.get("scan_timeout", None)
+        # The specific device scanners run concurrently in these threads. Each scanner occupies at
+        # most one of them, because a scanner is not scanned again while its scan is running.
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self._scanners), thread_name_prefix="DeviceScanner")
+        self._scan_futures = {}  # Running scan of the executor per device type
+        self._finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    def close(self) -> None:
+        """Shuts down the threads that run the specific device scanners. Running scans are not
+        waited for. The scanner must not be used to scan all device types afterwards."""
+        self._finalizer()
 
     def _scan(self, rescan: bool) -> typing.Sequence[Device]:
         """Scans all connected devices of all supported types (usb and ethernet).
@@ -79,11 +170,56 @@ class DeviceScanner(BaseDeviceScanner):
             rescan: True, if the ports should be scanned again. False, if you only want to scan,
                     if there are no results from a previous scan.
         """
-        self._devices.clear()
-        # Scanning for all supported device types.
-        for scanner in self._scanners.values():
-            devices = scanner._scan(rescan)  # pylint: disable=protected-access
-            self._devices.extend(devices)
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+        # Scanning for all supported device types concurrently, so the scan takes as long as the
+        # slowest scanner instead of the sum of all scanners
+        # pylint: disable=protected-access
+        futures = []
+        for device_type, scanner in self._scanners.items():
+            future = self._scan_futures.get(device_type)
+            if future is not None and not future.done():
+                # Join the scan that is still running (e.g. after a timeout), instead of occupying
+                # another thread with the same scanner
+                pass
+            elif not rescan and len(scanner._devices) > 0 and scanner._scan_future is None:
+                # The previous results are returned without scanning, so there is no need for a
+                # thread
+                future = concurrent.futures.Future()
+                future.set_result(scanner._shared_scan(False))
+            else:
+                future = self._scan_futures[device_type] = self._executor.submit(
+                    scanner._shared_scan, rescan)
+            futures.append((scanner, future))
+        deadline = None if self._scan_timeout is None else time.monotonic() + self._scan_timeout
+        devices = []
+        for scanner, future in futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                devices.extend(future.result(timeout))
+            except concurrent.futures.TimeoutError:
+                # Do not wait for the scanner, use the results of its previous scan instead
+                warnings.warn("{} did not finish its scan within {} seconds, the previous results "
+                              "are used instead".format(type(scanner).__name__, self._scan_timeout))
+                devices.extend(tuple(scanner._devices))
+        self._devices = devices
+        return tuple(self._devices)
+
+    async def _ascan(self, rescan: bool) -> typing.Sequence[Device]:
+        """Scans all connected devices of all supported types concurrently without blocking the
+        event loop.
+
+        Args:
+            rescan: True, if the ports should be scanned again. False, if you only want to scan,
+                    if there are no results from a previous scan.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        # Each specific device scanner shares its running scan with concurrent callers
+        results = await asyncio.gather(*(scanner._ascan(rescan)  # pylint: disable=protected-access
+                                         for scanner in self._scanners.values()))
+        self._devices = [device for devices in results for device in devices]
+        self._scan_time = time.monotonic()
         return tuple(self._devices)
 
     def __getitem__(self, device_type: typing.Optional[DeviceTypeType]) -> BaseDeviceScanner:
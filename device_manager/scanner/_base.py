@@ -3,56 +3,374 @@
 """Base classes for device scanners."""
 
 import abc
+import operator
+import re
+import subprocess
+import threading
+import time
 import typing
+import warnings
+# asyncio and concurrent.futures are slow to import, so the functions using them import them
 
 from .nmap import NMAPWrapper
 from ..device import Device, LANDevice
+from ..utils.command import CancelHandle, CommandCancelledError, run_command, arun_command
 
-__all__ = ["BaseDeviceScanner", "BaseLANDeviceScanner"]
+__all__ = ["BaseDeviceScanner", "BaseLANDeviceScanner", "ScanDiff"]
 
 ####################################################################################################
 
+# Regular expressions for the entries of the arp command's output:
+# "<ip address>  <mac address>  ...". The linux output may contain the hardware type between ip and
+# mac address. Both are applied to the whole output at once (multiline mode), the mac address must
+# be followed by a whitespace.
+_ARP_ENTRY_PATTERN = r"^[ \t]*((?:\d{{1,3}}\.){{3}}\d{{1,3}})[ \t]+{}" \
+                     r"((?:[0-9A-Fa-f]{{2}}[.:\-]){{5}}[0-9A-Fa-f]{{2}})(?=[ \t\r]|$)"
+_ARP_ENTRY_REGEX = re.compile(_ARP_ENTRY_PATTERN.format(""), re.MULTILINE)
+_ARP_ENTRY_HW_TYPE_REGEX = re.compile(_ARP_ENTRY_PATTERN.format(r"(?:\w*[ \t]+)?"), re.MULTILINE)
+
+
+class ScanDiff(typing.NamedTuple):
+    """The result of an incremental scan: All devices and the changes since the previous scan.
+
+    Devices, that did not change, are the same objects as in the previous scan.
+    """
+    devices: typing.Tuple[Device, ...]
+    added: typing.Tuple[Device, ...] = ()
+    removed: typing.Tuple[Device, ...] = ()
+    changed: typing.Tuple[Device, ...] = ()
+
+    @classmethod
+    def compare(cls, previous: typing.Mapping[str, Device],
+                current: typing.Mapping[str, Device]) -> "ScanDiff":
+        """Compares two scans by their device keys (e.g. device paths).
+
+        A device counts as changed, if its key exists in both scans, but it is not the same object.
+
+        Args:
+            previous: The devices of the previous scan by their keys.
+            current: The devices of the current scan by their keys.
+
+        Returns:
+            ScanDiff: The devices of the current scan and the differences to the previous one.
+        """
+        return cls(devices=tuple(current.values()),
+                   added=tuple(dev for key, dev in current.items() if key not in previous),
+                   removed=tuple(dev for key, dev in previous.items() if key not in current),
+                   changed=tuple(dev for key, dev in current.items()
+                                 if key in previous and previous[key] is not dev))
+
+
+class _DeviceIndex:
+    """Hash indexes on the results of a scan, so devices can be found without checking each device.
+
+    Devices are indexed by each of their addresses (including the aliases), their serial number,
+    their mac address and their combination of vendor and product id.
+
+    Args:
+        devices: The results of a scan.
+    """
+
+    # Filters that are served from an index, in the order of their selectivity
+    _INDEXED_FILTERS = (("address",), ("serial",), ("mac_address",), ("vendor_id", "product_id"))
+
+    def __init__(self, devices: typing.Sequence[Device]):
+        self.devices = tuple(devices)
+        self._indexes = {keys: {} for keys in self._INDEXED_FILTERS}
+        for device in self.devices:
+            for address in dict.fromkeys(device.all_addresses):
+                self._indexes[("address",)].setdefault((address,), []).append(device)
+            for keys in self._INDEXED_FILTERS[1:]:
+                try:
+                    value = tuple(getattr(device, key) for key in keys)
+                except AttributeError:
+                    # The device does not have this attribute, so it never matches the filter
+                    continue
+                self._indexes[keys].setdefault(value, []).append(device)
+
+    def matches(self, devices: typing.Sequence[Device]) -> bool:
+        """Checks, if the index was built from exactly these devices.
+
+        Args:
+            devices: The results of a scan.
+
+        Returns:
+            bool: True, if the index contains the same device objects.
+        """
+        return len(self.devices) == len(devices) and all(map(operator.is_, self.devices, devices))
+
+    def find(self, match_filters: typing.Callable[..., bool], **filters) \
+            -> typing.Sequence[Device]:
+        """Finds the devices that match the filters.
+
+        If an indexed filter is used, the candidates are taken from its index. Otherwise, all
+        devices are checked. The devices may be changed in place after the index was built (e.g. by
+        `Device.from_device` or `Device.reset_addresses`), so the candidates are checked against all
+        filters. If none of them matches, all devices are checked.
+
+        Args:
+            match_filters: The function that checks a single device against filters.
+            **filters: User-defined filters.
+
+        Returns:
+            tuple: All devices that match the filters.
+        """
+        candidates = self.devices
+        for keys in self._INDEXED_FILTERS:
+            if not all(key in filters for key in keys):
+                continue
+            value = tuple(filters[key] for key in keys)
+            if keys == ("mac_address",):
+                # Format the filter only once instead of once per device
+                value = (LANDevice.format_mac(value[0]),)
+                filters = dict(filters, mac_address=value[0])
+            try:
+                candidates = self._indexes[keys].get(value, ())
+            except TypeError:
+                # The value is not hashable, so all devices are checked
+                pass
+            break
+        found = tuple(device for device in candidates if match_filters(device, **filters))
+        if len(found) == 0 and candidates is not self.devices:
+            # The index may be outdated, if the devices were changed in place
+            found = tuple(device for device in self.devices if match_filters(device, **filters))
+        return found
+
 
 class BaseDeviceScanner(abc.ABC):
     """Base class for device scanners. Device scanners are used to scan specific protocols (like usb
     or ip). You can get a list of all connected devices or search with a user-defined filter.
+
+    The results of the latest scan are cached together with the time of the scan. If a maximum age
+    is configured, the cached results are only used as long as they are not older than that.
+
+    Args:
+        **kwargs:
+          - max_age: Time in seconds for which the results of a scan are used without scanning
+                     again, if no rescan is requested. None (default), to use the results until a
+                     rescan is requested explicitly.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         super().__init__()
         self._devices = []
+        self._max_age = kwargs.get("max_age", None)
+        # Indexes on the latest scan results (see `_find_in_index`)
+        self._index = None
+        # Time of the latest scan (`time.monotonic()`) or None, if there was no scan, yet
+        self._scan_time = None
+        # Protects the scan state. The scan that is currently running (see `_shared_scan`) is
+        # stored as future, so concurrent callers can wait for its result.
+        self._scan_lock = threading.Lock()
+        self._scan_future = None
+        # Scan that is currently running in an event loop (see `_ascan`) as tuple (loop, task)
+        self._ascan_task = None
+
+    @property
+    def max_age(self) -> typing.Optional[float]:
+        """Time in seconds for which the results of a scan are used without scanning again. None, if
+        the results are used until a rescan is requested explicitly."""
+        return self._max_age
+
+    @max_age.setter
+    def max_age(self, value: typing.Optional[float]) -> None:
+        self._max_age = value
 
-    def list_devices(self, rescan: bool = False) -> typing.Sequence[Device]:
+    def list_devices(self, rescan: bool = False, max_age: typing.Optional[float] = None) \
+            -> typing.Sequence[Device]:
         """Lists all connected devices.
 
         Args:
             rescan: True, if the protocol should be scanned again. False, if you only want to
                     scan, if there are no results from a previous scan.
+            max_age: Time in seconds for which the results of the previous scan are used. If they
+                     are older, the protocol is scanned again. None, to use `max_age` of the
+                     scanner.
 
         Returns:
             tuple: A sequence of all connected devices.
         """
-        return tuple(self._scan(rescan))
+        return self._shared_scan(rescan or self._is_stale(max_age))
 
-    def find_devices(self, rescan: bool = False, **filters) -> typing.Sequence[Device]:
+    def find_devices(self, rescan: bool = False, max_age: typing.Optional[float] = None,
+                     **filters) -> typing.Sequence[Device]:
         """Lists all connected devices that match the filter.
 
         Args:
             rescan: True, if the protocol should be scanned again. False, if you only want to
                     scan, if there are no results from a previous scan.
+            max_age: Time in seconds for which the results of the previous scan are used. If they
+                     are older, the protocol is scanned again. None, to use `max_age` of the
+                     scanner.
             **filters: User-defined filters. Only devices that match these filters will be returned.
 
         Returns:
             tuple: A sequence of all connected devices that match the filter.
         """
-        devices = self._scan(rescan)
-        return tuple(device for device in devices if self._match_filters(device, **filters))
+        devices = self._shared_scan(rescan or self._is_stale(max_age))
+        return self._find_in_index(devices, **filters)
+
+    def _find_in_index(self, devices: typing.Sequence[Device], **filters) \
+            -> typing.Sequence[Device]:
+        """Finds the devices that match the filters by using the indexes on the scan results.
+
+        The indexes are built once per scan: They are rebuilt, if the devices differ from the ones
+        of the previous call.
+
+        Args:
+            devices: The results of the scan.
+            **filters: User-defined filters.
+
+        Returns:
+            tuple: All devices that match the filters.
+        """
+        index = self._index
+        if index is None or not index.matches(devices):
+            index = self._index = _DeviceIndex(devices)
+        return index.find(self._match_filters, **filters)
+
+    def _is_stale(self, max_age: typing.Optional[float] = None) -> bool:
+        """Checks, whether the results of the previous scan are too old to be used.
+
+        Args:
+            max_age: Time in seconds for which the results are used. None, to use `max_age` of the
+                     scanner.
+
+        Returns:
+            bool: True, if the results are older than the maximum age. False, if they can be used or
+                  if there is no maximum age.
+        """
+        if max_age is None:
+            max_age = self._max_age
+            if max_age is None:
+                return False
+        scan_time = self._scan_time
+        return scan_time is None or time.monotonic() - scan_time > max_age
+
+    def _shared_scan(self, rescan: bool) -> typing.Sequence[Device]:
+        """Scans the specific protocol for devices (see `_scan`), but only one scan runs at a time.
+
+        If a scan is already running in another thread, the caller waits for this scan and gets its
+        result instead of starting another scan (single-flight).
+
+        Args:
+            rescan: True, if the protocol should be scanned again. False, if you only want to
+                    scan, if there are no results from a previous scan.
+
+        Returns:
+            tuple: A sequence of all connected devices.
+        """
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+        with self._scan_lock:
+            future = self._scan_future
+            cached = future is None and len(self._devices) > 0 and not rescan
+            running = future is not None
+            if not cached and not running:
+                future = self._scan_future = concurrent.futures.Future()
+        if cached:
+            # The scanners return their previous results without scanning
+            return tuple(self._scan(False))
+        elif running:
+            # Join the running scan
+            return future.result()
+
+        try:
+            devices = tuple(self._scan(rescan))
+            self._scan_time = time.monotonic()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._scan_lock:
+                self._scan_future = None
+        future.set_result(devices)
+        return devices
+
+    async def alist_devices(self, rescan: bool = False, max_age: typing.Optional[float] = None) \
+            -> typing.Sequence[Device]:
+        """Lists all connected devices without blocking the event loop (see `list_devices`).
+
+        Concurrent calls share the same scan.
+
+        Args:
+            rescan: True, if the protocol should be scanned again. False, if you only want to
+                    scan, if there are no results from a previous scan.
+            max_age: Time in seconds for which the results of the previous scan are used. None, to
+                     use `max_age` of the scanner.
+
+        Returns:
+            tuple: A sequence of all connected devices.
+        """
+        return tuple(await self._ascan(rescan or self._is_stale(max_age)))
+
+    async def afind_devices(self, rescan: bool = False, max_age: typing.Optional[float] = None,
+                            **filters) -> typing.Sequence[Device]:
+        """Lists all connected devices that match the filter without blocking the event loop (see
+        `find_devices`).
+
+        Concurrent calls share the same scan.
+
+        Args:
+            rescan: True, if the protocol should be scanned again. False, if you only want to
+                    scan, if there are no results from a previous scan.
+            max_age: Time in seconds for which the results of the previous scan are used. None, to
+                     use `max_age` of the scanner.
+            **filters: User-defined filters. Only devices that match these filters will be returned.
+
+        Returns:
+            tuple: A sequence of all connected devices that match the filter.
+        """
+        devices = await self._ascan(rescan or self._is_stale(max_age))
+        return self._find_in_index(devices, **filters)
+
+    async def _ascan(self, rescan: bool) -> typing.Sequence[Device]:
+        """Scans the specific protocol for devices without blocking the event loop.
+
+        If a scan is already running in the event loop, the caller waits for its result instead of
+        starting another scan.
+
+        Args:
+            rescan: True, if the protocol should be scanned again. False, if you only want to
+                    scan, if there are no results from a previous scan.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if len(self._devices) > 0 and not rescan:
+            return tuple(self._devices)
+        loop = asyncio.get_event_loop()
+        if self._ascan_task is None or self._ascan_task[0] is not loop or \
+                self._ascan_task[1].done():
+            self._ascan_task = (loop, loop.create_task(self._arescan_and_store()))
+        # Shielded, so a cancelled caller does not cancel the scan of the other callers
+        return await asyncio.shield(self._ascan_task[1])
+
+    async def _arescan_and_store(self) -> typing.Sequence[Device]:
+        """Performs a new scan (see `_arescan`) and caches its results."""
+        devices = tuple(await self._arescan())
+        self._devices = list(devices)
+        self._scan_time = time.monotonic()
+        return devices
+
+    async def _arescan(self) -> typing.Sequence[Device]:
+        """Performs a new scan without blocking the event loop.
+
+        By default, the scan is run in the event loop's default executor, where it is shared with
+        concurrent scans of other threads (see `_shared_scan`). Subclasses can override this
+        function, e.g. to use asyncio subprocesses.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._shared_scan, True)
 
     @abc.abstractmethod
     def _scan(self, rescan: bool) -> typing.Sequence[Device]:
         """Scans the specific protocol for devices.
 
-        Subclasses must override this function and fill the `_devices` attribute.
+        Subclasses must override this function and fill the `_devices` attribute. The attribute
+        should be replaced by a new list at once, so concurrent readers never see a partial result.
+        Only one scan runs at a time (see `_shared_scan`).
 
         Args:
             rescan: True, if the protocol should be scanned again. False, if you only want to
@@ -94,13 +412,37 @@ class BaseLANDeviceScanner(BaseDeviceScanner, abc.ABC):
     """A device scanner that scans the local network for ethernet devices.
 
     Args:
-        **kwargs:
+        **kwargs: The options of the `BaseDeviceScanner` and additionally:
           - nmap_search_path: One or multiple paths where to search for the nmap executable.
+          - nmap_timeout: Time in seconds after which a nmap scan is aborted. No timeout by default.
+          - command_timeout: Time in seconds after which external commands (like arp) are killed.
+                             Then, the scan returns the results of the previous scan. 10 seconds by
+                             default. None, to wait without a timeout.
     """
 
     def __init__(self, **kwargs):
-        super().__init__()
-        self._nmap = NMAPWrapper(notify_parent_done=lambda b: self._scan(True), **kwargs)
+        super().__init__(**kwargs)
+        self._command_timeout = kwargs.get("command_timeout", 10.0)
+        self._cancel_handle = CancelHandle()
+        self._nmap = NMAPWrapper(notify_parent_done=self._nmap_done, **kwargs)
+
+    def _nmap_done(self, success: bool) -> None:  # pylint: disable=unused-argument
+        """Merges the results of a finished nmap scan into the scan results.
+
+        Args:
+            success: True, if the nmap scan succeeded.
+        """
+        # Shared with concurrent scans, so the scan results are not changed by two scans at once
+        self._shared_scan(True)
+
+    def cancel(self) -> int:
+        """Cancels the external commands (like arp), that are currently run by scans. These scans
+        return the results of the previous scan then.
+
+        Returns:
+            int: The number of cancelled commands.
+        """
+        return self._cancel_handle.cancel()
 
     @property
     def nmap(self) -> typing.Optional["NMAPWrapper"]:
@@ -119,7 +461,34 @@ class BaseLANDeviceScanner(BaseDeviceScanner, abc.ABC):
         if len(self._devices) > 0 and not rescan:
             return self._devices
 
-        devices = self._get_arp_cache()
+        try:
+            devices = self._get_arp_cache()
+        except (subprocess.TimeoutExpired, CommandCancelledError) as exc:
+            # Do not block the caller, use the results of the previous scan instead
+            warnings.warn("Could not read the arp cache, the previous results are used instead: "
+                          "{}".format(exc))
+            return tuple(self._devices)
+        return self._update_devices(devices)
+
+    async def _arescan(self) -> typing.Sequence[LANDevice]:
+        """Scans the arp cache for ip and mac addresses without blocking the event loop."""
+        try:
+            devices = await self._aget_arp_cache()
+        except (subprocess.TimeoutExpired, CommandCancelledError) as exc:
+            warnings.warn("Could not read the arp cache, the previous results are used instead: "
+                          "{}".format(exc))
+            return tuple(self._devices)
+        return self._update_devices(devices)
+
+    def _update_devices(self, devices: typing.Dict[str, LANDevice]) -> typing.Sequence[LANDevice]:
+        """Merges the results of nmap into the devices from the arp cache and stores them.
+
+        Args:
+            devices: The devices from the arp cache by their mac addresses.
+
+        Returns:
+            tuple: All found devices.
+        """
         if self.nmap.valid:  # pragma: no cover
             for dev in self.nmap.devices:
                 if dev.mac_address in devices:
@@ -127,12 +496,155 @@ class BaseLANDeviceScanner(BaseDeviceScanner, abc.ABC):
                                        if ip_address not in devices[dev.mac_address].all_addresses]
                     if len(address_aliases) > 0:
                         devices[dev.mac_address].address_aliases = \
-                            [*devices[dev.mac_address].address_aliases, address_aliases]
+                            [*devices[dev.mac_address].address_aliases, *address_aliases]
                 else:
                     devices[dev.mac_address] = dev
         self._devices = list(devices.values())
         return tuple(self._devices)
 
+    def _run_command(self, args: typing.List[str], package: typing.Optional[str] = None) \
+            -> typing.Optional[str]:
+        """Runs a command with the configured timeout and returns its output.
+
+        Args:
+            args: The command and its arguments.
+            package: The package, which contains the command (used for the error message).
+
+        Returns:
+            str: The output of the command or None, if the command failed.
+
+        Raises:
+            FileNotFoundError: If the command was not found.
+            subprocess.TimeoutExpired: If the command did not terminate before the timeout.
+            CommandCancelledError: If the command was cancelled (see `cancel`).
+        """
+        try:
+            result = run_command(args, timeout=self._command_timeout, cancel=self._cancel_handle)
+        except FileNotFoundError as exc:
+            raise self._command_not_found(args, package) from exc
+        return self._command_output(*result)
+
+    async def _arun_command(self, args: typing.List[str], package: typing.Optional[str] = None) \
+            -> typing.Optional[str]:
+        """Runs a command as asyncio subprocess with the configured timeout (see `_run_command`).
+
+        Args:
+            args: The command and its arguments.
+            package: The package, which contains the command (used for the error message).
+
+        Returns:
+            str: The output of the command or None, if the command failed.
+        """
+        try:
+            result = await arun_command(args, timeout=self._command_timeout,
+                                        cancel=self._cancel_handle)
+        except FileNotFoundError as exc:
+            raise self._command_not_found(args, package) from exc
+        return self._command_output(*result)
+
+    @staticmethod
+    def _command_not_found(args: typing.List[str], package: typing.Optional[str]) \
+            -> FileNotFoundError:
+        """Creates the error, that a command was not found."""
+        return FileNotFoundError("Command '{}' was not found. Please, make sure {} is "
+                                 "installed.".format(args[0], "it" if package is None else
+                                                     "\"{}\"".format(package)))
+
+    @staticmethod
+    def _command_output(returncode: int, raw_out: bytes, raw_err: bytes) -> typing.Optional[str]:
+        """Decodes the output of a command.
+
+        Returns:
+            str: The output of the command or None, if the command failed.
+        """
+        if returncode != 0:
+            # The command failed
+            return None
+
+        out = bytes.decode(raw_out, errors="ignore")
+        err = bytes.decode(raw_err, errors="ignore")
+
+        if len(err) > 0:
+            # The command failed
+            return None
+        return out
+
+    @staticmethod
+    def _parse_arp_output(output: str, hardware_type: bool = False) -> typing.Dict[str, LANDevice]:
+        """Extracts ip and mac addresses from the output of the arp command.
+
+        All entries are extracted from the whole output in a single pass. The mac addresses are
+        already validated by the regular expression, so they are only normalized (uppercase with
+        colons as separators). The ip addresses of the same mac address are merged into one device.
+
+        Args:
+            output: The output of the arp command.
+            hardware_type: True, if the lines may contain the hardware type (e.g. "ether") between
+                           ip and mac address.
+
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s.
+        """
+        regex = _ARP_ENTRY_HW_TYPE_REGEX if hardware_type else _ARP_ENTRY_REGEX
+        # Ip addresses by mac address
+        neighbors = {}
+        for ip_address, mac_address in regex.findall(output):
+            mac_address = mac_address.upper().replace("-", ":").replace(".", ":")
+            ip_addresses = neighbors.get(mac_address)
+            if ip_addresses is None:
+                neighbors[mac_address] = [ip_address]
+            elif ip_address not in ip_addresses:
+                ip_addresses.append(ip_address)
+
+        devices = {}
+        for mac_address, ip_addresses in neighbors.items():
+            dev = LANDevice()
+            dev.address = ip_addresses[0]
+            if len(ip_addresses) > 1:
+                dev.address_aliases = ip_addresses[1:]
+            # The mac address is already validated and formatted
+            dev._mac_address = mac_address  # pylint: disable=protected-access
+            devices[mac_address] = dev
+        return devices
+
+    @staticmethod
+    def _add_neighbor(devices: typing.Dict[str, LANDevice], ip_address: str,
+                      mac_address: str) -> None:
+        """Adds an entry of the arp cache to a dictionary of devices.
+
+        If the mac address is already known, the ip address is added to the device's address
+        aliases. Otherwise, a new `LANDevice` is created.
+
+        Args:
+            devices: Dictionary mapping formatted mac addresses to `LANDevice`s.
+            ip_address: The neighbor's ip address.
+            mac_address: The neighbor's formatted mac address.
+        """
+        if mac_address in devices:
+            # If mac address is already known, ip address is added to the address aliases
+            if ip_address not in devices[mac_address].all_addresses:
+                devices[mac_address].address_aliases = [*devices[mac_address].address_aliases,
+                                                        ip_address]
+        else:
+            dev = LANDevice()
+            dev.address = ip_address
+            dev.mac_address = mac_address
+            devices[mac_address] = dev
+
+    async def _aget_arp_cache(self) -> typing.Dict[str, LANDevice]:
+        """Reads the arp cache without blocking the event loop.
+
+        By default, `_get_arp_cache` is run in the event loop's default executor. Subclasses should
+        override this function to run external commands as asyncio subprocesses.
+
+        Returns:
+            dict: A dictionary, mapping strings to `LANDevice`s.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._get_arp_cache)
+
     @abc.abstractmethod
     def _get_arp_cache(self) -> typing.Dict[str, LANDevice]:
         """Runs the arp command and extracts ip and mac addresses from the command's output.
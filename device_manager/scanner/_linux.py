@@ -9,16 +9,17 @@ if sys.platform != "linux":
             str(os.environ["DEVMAN_NO_IMPORT_ERROR"]) not in ["True", "1"]:
         raise ImportError("Linux-specific device scanners are only importable on linux systems")
 
-import re
-import subprocess
+import copy
+import threading
 import typing
 
 import pyudev
 
-from ._base import BaseDeviceScanner, BaseLANDeviceScanner
+from . import _netlink
+from ._base import BaseDeviceScanner, BaseLANDeviceScanner, ScanDiff
 from ..device import USBDevice, LANDevice
 
-__all__ = ["LinuxUSBDeviceScanner", "LinuxLANDeviceScanner"]
+__all__ = ["LinuxUSBDeviceScanner", "LinuxSysfsUSBDeviceScanner", "LinuxLANDeviceScanner"]
 
 ####################################################################################################
 
@@ -26,11 +27,48 @@ __all__ = ["LinuxUSBDeviceScanner", "LinuxLANDeviceScanner"]
 class LinuxUSBDeviceScanner(BaseDeviceScanner):
     """A device scanner that scans for usb devices on linux systems. It scans all usb ports for
     devices.
+
+    Rescans are incremental: Devices are identified by their device path and a change token (the
+    device number, which the kernel assigns anew when a device is reconnected). Unchanged devices
+    are not converted again, instead the `USBDevice`-objects of the previous scan are reused. The
+    changes of the latest scan are available as `last_diff`.
+
+    Args:
+        **kwargs: The options of the `BaseDeviceScanner` and additionally:
+          - usb_monitor: True, to keep track of connected usb devices by udev events (see
+                         `start_monitor`). Then, scans do not need to enumerate all devices.
+          - usb_device_only: True, to only scan usb devices (udev device type "usb_device") but
+                             not their interfaces (device type "usb_interface"). False by default.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._context = pyudev.Context()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # The udev context is created on first use, so creating the scanner is cheap
+        self._udev_context = None
+        # Live table of the usb devices by their device path, while udev events are monitored
+        self._live_devices = None
+        self._live_lock = threading.Lock()
+        # Device paths that were updated by events, while the monitor enumerates the devices
+        self._live_updated = None
+        self._observer = None
+        # Devices and change tokens of the latest scan by their device path
+        self._snapshot = {}
+        self._tokens = {}
+        self._last_diff = ScanDiff(devices=())
+        self._usb_device_only = bool(kwargs.get("usb_device_only", False))
+        if kwargs.get("usb_monitor", False):
+            self.start_monitor()
+
+    @property
+    def _context(self) -> pyudev.Context:
+        """The udev context, which is created on first use."""
+        if self._udev_context is None:
+            self._udev_context = pyudev.Context()
+        return self._udev_context
+
+    @_context.setter
+    def _context(self, context: pyudev.Context) -> None:
+        self._udev_context = context
 
     @staticmethod
     def _device_from_raw(raw_device: pyudev.Device) -> USBDevice:
@@ -74,6 +112,268 @@ class LinuxUSBDeviceScanner(BaseDeviceScanner):
 
         return dev
 
+    def _list_raw_devices(self) -> typing.Iterable[pyudev.Device]:
+        """Enumerates the usb devices with udev.
+
+        Only devices of the usb subsystem are enumerated, so the other devices of the system are not
+        created at all.
+
+        Returns:
+            An iterable of raw devices provided from pyudev.
+        """
+        if self._usb_device_only:
+            return self._context.list_devices(subsystem="usb", DEVTYPE="usb_device")
+        return self._context.list_devices(subsystem="usb")
+
+    @property
+    def monitoring(self) -> bool:
+        """True, if the usb devices are tracked by udev events (see `start_monitor`)."""
+        return self._observer is not None
+
+    def start_monitor(self, monitor: typing.Optional[pyudev.Monitor] = None) -> None:
+        """Starts tracking the connected usb devices by udev events.
+
+        All usb devices are enumerated once. Afterwards, the devices are updated incrementally when
+        udev reports that usb devices were added, removed or changed. While the monitor is running,
+        scans (also rescans) are answered from this live table without enumerating the devices.
+
+        Args:
+            monitor: The udev monitor to receive the events from. If None, a monitor for the "usb"
+                     subsystem is created.
+        """
+        if self._observer is not None:
+            return
+        if monitor is None:
+            monitor = pyudev.Monitor.from_netlink(self._context)
+            monitor.filter_by(subsystem="usb",
+                              device_type="usb_device" if self._usb_device_only else None)
+
+        with self._live_lock:
+            self._live_devices = {}
+            self._live_updated = set()
+        # Start observing before enumerating the devices, so no event gets lost
+        self._observer = pyudev.MonitorObserver(monitor, callback=self._handle_event,
+                                                name="LinuxUSBDeviceScanner.monitor")
+        self._observer.start()
+
+        devices = {}
+        for raw_dev in self._list_raw_devices():
+            try:
+                dev = self._device_from_raw(raw_dev)
+                devices[dev.address] = dev
+            except (TypeError, ValueError):
+                pass
+        with self._live_lock:
+            for device_path, dev in devices.items():
+                # Events are more recent than the enumeration
+                if device_path not in self._live_updated:
+                    self._live_devices[device_path] = dev
+            self._live_updated = None
+            self._devices = list(self._live_devices.values())
+
+    def stop_monitor(self) -> None:
+        """Stops tracking the usb devices by udev events. Afterwards, scans enumerate all devices
+        again."""
+        if self._observer is None:
+            return
+        self._observer.send_stop()
+        self._observer = None
+        with self._live_lock:
+            self._live_devices = None
+
+    def _handle_event(self, raw_device: pyudev.Device) -> None:
+        """Updates the live table of usb devices, when udev reports a changed device.
+
+        Args:
+            raw_device: The device that was added, removed or changed. Its `action` attribute
+                        contains the kind of event.
+        """
+        device_path = getattr(raw_device, "device_path", None)
+        if device_path is None:
+            return
+        dev = None
+        if raw_device.action != "remove":
+            try:
+                dev = self._device_from_raw(raw_device)
+            except (TypeError, ValueError):
+                pass
+
+        with self._live_lock:
+            if self._live_devices is None:
+                return
+            if self._live_updated is not None:
+                self._live_updated.add(device_path)
+            if dev is None:
+                self._live_devices.pop(device_path, None)
+            else:
+                self._live_devices[device_path] = dev
+            self._devices = list(self._live_devices.values())
+
+    @staticmethod
+    def _change_token(raw_device: pyudev.Device) -> typing.Optional[tuple]:
+        """Returns a token that changes, when the device is reconnected or re-enumerated.
+
+        Args:
+            raw_device: A device provided from pyudev.
+
+        Returns:
+            tuple: The device number and the initialization time of the device or None, if udev
+                   does not provide these properties (e.g. for usb interfaces).
+        """
+        properties = raw_device.properties
+        token = (properties.get("DEVNUM"), properties.get("USEC_INITIALIZED"))
+        return None if token == (None, None) else token
+
+    @property
+    def last_diff(self) -> ScanDiff:
+        """The devices found by the latest scan and the changes compared to the scan before."""
+        return self._last_diff
+
+    def scan_changes(self) -> ScanDiff:
+        """Scans all usb ports again and returns the changes compared to the previous scan.
+
+        Returns:
+            ScanDiff: All devices and the added, removed and changed devices. Unchanged devices are
+                      the same objects as in the previous scan.
+        """
+        self._shared_scan(True)
+        return self._last_diff
+
+    def _rescan(self) -> typing.Dict[str, USBDevice]:
+        """Enumerates the usb devices and reuses the devices of the previous scan, if they did not
+        change.
+
+        Returns:
+            dict: The usb devices by their device path.
+        """
+        devices = {}
+        tokens = {}
+        for raw_dev in self._list_raw_devices():
+            try:
+                device_path = raw_dev.device_path
+                token = self._change_token(raw_dev) if isinstance(raw_dev, pyudev.Device) else None
+                previous = self._snapshot.get(device_path) if isinstance(device_path, str) else None
+                if previous is not None and token is not None and \
+                        token == self._tokens.get(device_path) and \
+                        previous.address == device_path:
+                    # Unchanged device, there is no need to convert it again. The device may be
+                    # modified by its users (e.g. `reset_addresses`), then it is converted again.
+                    dev = previous
+                else:
+                    dev = self._device_from_raw(raw_dev)
+                    if previous is not None and previous == dev:
+                        dev = previous
+            except (AttributeError, TypeError, ValueError):
+                continue
+            devices[dev.address] = dev
+            tokens[dev.address] = token
+        self._tokens = tokens
+        return devices
+
+    def _scan(self, rescan: bool) -> typing.Sequence[USBDevice]:
+        """Scans all usb ports for devices.
+
+        Args:
+            rescan: True, if the ports should be scanned again. False, if you only want to scan,
+                    if there are no results from a previous scan.
+        """
+        if self._observer is not None:
+            # The devices are kept up-to-date by udev events
+            with self._live_lock:
+                devices = dict(self._live_devices)
+        elif len(self._devices) > 0 and not rescan:
+            return self._devices
+        else:
+            devices = self._rescan()
+
+        self._last_diff = ScanDiff.compare(self._snapshot, devices)
+        self._snapshot = devices
+        self._devices = list(devices.values())
+        return tuple(self._devices)
+
+
+class LinuxSysfsUSBDeviceScanner(BaseDeviceScanner):
+    """A device scanner that scans for usb devices on linux systems by reading the device
+    attributes directly from sysfs (`/sys/bus/usb/devices`). It does not use udev, so it is faster
+    than the `LinuxUSBDeviceScanner`, but it only finds usb devices and not their interfaces.
+
+    The resulting `USBDevice`s are equal to the ones of the `LinuxUSBDeviceScanner`: The address is
+    the sysfs device path (without "/sys") and the address alias is the device node
+    (`/dev/bus/usb/<bus>/<device>`).
+
+    Args:
+        **kwargs: The options of the `BaseDeviceScanner` and additionally:
+          - sysfs_path: The mount point of sysfs. "/sys" by default.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._sysfs_path = os.path.realpath(kwargs.get("sysfs_path", "/sys"))
+
+    @staticmethod
+    def _read_attribute(device_path: str, name: str) -> typing.Optional[str]:
+        """Reads a single attribute of a device from sysfs.
+
+        Args:
+            device_path: The device's directory in sysfs.
+            name: The attribute's file name.
+
+        Returns:
+            str: The attribute's value without trailing whitespaces or None, if the device does not
+                 have this attribute.
+        """
+        try:
+            fd = os.open(os.path.join(device_path, name), os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            # The attributes are tiny, so a single read is sufficient
+            return os.read(fd, 4096).decode(errors="replace").rstrip()
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    def _device_from_sysfs(self, device_path: str) -> USBDevice:
+        """Reads a usb device from sysfs and converts it into a `USBDevice`-object.
+
+        Args:
+            device_path: The device's directory in sysfs (e.g. "/sys/bus/usb/devices/1-1").
+
+        Returns:
+            USBDevice: The usb device that was read from sysfs.
+        """
+        vendor_id = self._read_attribute(device_path, "idVendor")
+        if vendor_id is None:
+            # Interfaces and other entries do not have a vendor id
+            raise TypeError("\"{}\" is not a usb device.".format(device_path))
+
+        dev = USBDevice()
+        real_path = os.path.realpath(device_path)
+        if os.path.commonpath([real_path, self._sysfs_path]) == self._sysfs_path:
+            # Same as udev's device path, which is relative to the sysfs mount point
+            dev.address = "/" + os.path.relpath(real_path, self._sysfs_path)
+        else:
+            dev.address = real_path
+
+        bus_number = self._read_attribute(device_path, "busnum")
+        device_number = self._read_attribute(device_path, "devnum")
+        if bus_number is not None and device_number is not None:
+            dev.address_aliases = ["/dev/bus/usb/{:03d}/{:03d}".format(int(bus_number),
+                                                                       int(device_number))]
+        dev.vendor_id = int(vendor_id, base=16)
+        product_id = self._read_attribute(device_path, "idProduct")
+        if product_id is not None:
+            dev.product_id = int(product_id, base=16)
+        revision_id = self._read_attribute(device_path, "bcdDevice")
+        if revision_id is not None:
+            dev.revision_id = int(revision_id, base=16)
+        serial = self._read_attribute(device_path, "serial")
+        if serial is not None:
+            dev.serial = serial
+
+        return dev
+
     def _scan(self, rescan: bool) -> typing.Sequence[USBDevice]:
         """Scans all usb ports for devices.
 
@@ -84,14 +384,21 @@ class LinuxUSBDeviceScanner(BaseDeviceScanner):
         if len(self._devices) > 0 and not rescan:
             return self._devices
 
-        self._devices.clear()
-        raw_devices = self._context.list_devices()
-        for raw_dev in raw_devices:
+        devices = []
+        try:
+            entries = list(os.scandir(os.path.join(self._sysfs_path, "bus", "usb", "devices")))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if ":" in entry.name:
+                # "<bus>-<port>:<config>.<interface>" is an interface, not a device
+                continue
             try:
-                dev = self._device_from_raw(raw_dev)
-                self._devices.append(dev)
+                devices.append(self._device_from_sysfs(entry.path))
             except (TypeError, ValueError):
                 pass
+        # Replace the list at once, so concurrent readers never see a partial result
+        self._devices = devices
         return tuple(self._devices)
 
 
@@ -99,75 +406,332 @@ class LinuxLANDeviceScanner(BaseLANDeviceScanner):
     """A device scanner that scans the local network for ethernet devices.
 
     Args:
-        **kwargs:
+        **kwargs: The options of the `BaseDeviceScanner` and additionally:
           - nmap_search_path: One or multiple paths where to search for the nmap executable.
+          - nmap_timeout: Time in seconds after which a nmap scan is aborted. No timeout by default.
+          - command_timeout: Time in seconds after which external commands (like arp) are killed.
+                             Then, the scan returns the results of the previous scan. 10 seconds by
+                             default. None, to wait without a timeout.
+          - arp_source: Where to read the arp cache from:
+                        "proc" (default) reads the kernel's arp table from `/proc/net/arp`. If the
+                        file is not readable, the arp command is used instead.
+                        "ip" runs the command "ip neigh show" (iproute2).
+                        "netlink" dumps the kernel's neighbor table via rtnetlink. In contrast to
+                        the other sources, this also finds IPv6 neighbors.
+                        "arp" runs the command "arp -n" (net-tools).
+          - proc_arp_path: The path of the kernel's arp table. "/proc/net/arp" by default.
+          - neighbor_monitor: True, to keep track of the neighbor table by netlink events (see
+                              `start_monitor`). Then, scans do not need to read the arp cache.
     """
 
+    ARP_SOURCES = ("proc", "ip", "netlink", "arp")
+
+    # The commands for reading the arp cache and the packages containing them
+    _ARP_COMMAND = (["arp", "-n"], "net-tools")
+    _IP_NEIGH_COMMAND = (["ip", "neigh", "show"], "iproute2")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Regular Expression: "  <ip address>  <hardware type>  <mac address>  ..."
-        self._arp_regex = re.compile(r"^[ \t]*((?:\d{1,3}\.){3}\d{1,3})[ \t]+(\w*[ \t]+)?"
-                                     r"([0-9A-Fa-f]{2}[.:\-]){5}([0-9A-Fa-f]{2})")
+        self._arp_source = kwargs.get("arp_source", "proc")
+        if self._arp_source not in self.ARP_SOURCES:
+            raise ValueError("Unknown arp source \"{}\", expected one of: {}.".format(
+                self._arp_source, ", ".join(self.ARP_SOURCES)))
+        self._proc_arp_path = kwargs.get("proc_arp_path", "/proc/net/arp")
+        # Live neighbor table (ip address -> mac address and mac address -> device), while netlink
+        # events are monitored
+        self._live_lock = threading.Lock()
+        self._live_addresses = None
+        self._live_devices = None
+        # Ip addresses that were updated by events, while the monitor reads the neighbor table
+        self._live_updated = None
+        # True, if the live table changed since the devices were taken from it
+        self._live_changed = False
+        self._neighbor_monitor = None
+        if kwargs.get("neighbor_monitor", False):
+            self.start_monitor()
+
+    @property
+    def monitoring(self) -> bool:
+        """True, if the neighbor table is tracked by netlink events (see `start_monitor`)."""
+        return self._neighbor_monitor is not None
+
+    def start_monitor(self, event_source=None) -> None:
+        """Starts tracking the neighbor table by netlink events.
+
+        The neighbor table is dumped once via rtnetlink. Afterwards, the devices are updated
+        incrementally when the kernel reports that neighbors were added, changed or removed. While
+        the monitor is running, scans (also rescans) are answered from this live table without
+        reading the arp cache. The devices are only taken from the live table again, if it changed.
+
+        Args:
+            event_source: A socket-like object (with `recv`) providing netlink messages, e.g. to
+                          replay recorded events. If None, a rtnetlink socket subscribed to the
+                          neighbor events is opened.
+        """
+        if self._neighbor_monitor is not None:
+            return
+        with self._live_lock:
+            self._live_addresses = {}
+            self._live_devices = {}
+            self._live_updated = set()
+            self._live_changed = True
+        # Start receiving events before reading the arp cache, so no event gets lost
+        self._neighbor_monitor = _netlink.NeighborMonitor(self._handle_neighbor, event_source,
+                                                          resync=self._resync_neighbors)
+        self._neighbor_monitor.start()
+        self._resync_neighbors()
+
+    def stop_monitor(self) -> None:
+        """Stops tracking the neighbor table. Afterwards, scans read the arp cache again."""
+        if self._neighbor_monitor is None:
+            return
+        self._neighbor_monitor.stop()
+        self._neighbor_monitor = None
+        with self._live_lock:
+            self._live_addresses = None
+            self._live_devices = None
+
+    def _resync_neighbors(self) -> None:
+        """Reads the whole neighbor table via rtnetlink into the live table.
+
+        The neighbor table is dumped independently of the configured `arp_source`, so the live
+        table contains the same (IPv4 and IPv6) neighbors as the events. Addresses that were updated
+        by events while reading the neighbor table are kept, because the events are more recent.
+        """
+        devices = self._read_netlink_neighbors()
+        with self._live_lock:
+            if self._live_devices is None:
+                return
+            updated = self._live_updated or set()
+            addresses = {ip_address: mac_address for mac_address, dev in devices.items()
+                         for ip_address in dev.all_addresses if ip_address not in updated}
+            for ip_address in updated:
+                if ip_address in self._live_addresses:
+                    addresses[ip_address] = self._live_addresses[ip_address]
+            self._live_addresses = addresses
+            self._live_devices = {}
+            for ip_address, mac_address in addresses.items():
+                self._add_neighbor(self._live_devices, ip_address, mac_address)
+            self._live_updated = None
+            self._live_changed = True
+
+    def _handle_neighbor(self, entry: "_netlink.NeighborEntry") -> None:
+        """Updates the live table, when the kernel reports a changed neighbor.
+
+        Args:
+            entry: The added, changed or removed entry of the neighbor table.
+        """
+        mac_address = entry.mac if entry.valid and not entry.deleted else None
+        with self._live_lock:
+            if self._live_devices is None:
+                return
+            if self._live_updated is not None:
+                self._live_updated.add(entry.address)
+            old_mac_address = self._live_addresses.get(entry.address)
+            if old_mac_address == mac_address:
+                # Only the state changed (e.g. from "stale" to "reachable")
+                return
+            if old_mac_address is not None:
+                # The address was removed or moved to another device
+                del self._live_addresses[entry.address]
+                dev = self._live_devices[old_mac_address]
+                addresses = [address for address in dev.all_addresses if address != entry.address]
+                if len(addresses) > 0:
+                    dev.address = addresses[0]
+                    dev.address_aliases = addresses[1:]
+                else:
+                    del self._live_devices[old_mac_address]
+            if mac_address is not None:
+                self._live_addresses[entry.address] = mac_address
+                self._add_neighbor(self._live_devices, entry.address, mac_address)
+            self._live_changed = True
+
+    def _nmap_done(self, success: bool) -> None:
+        """Merges the results of a finished nmap scan into the devices of the live table.
+
+        Args:
+            success: True, if the nmap scan succeeded.
+        """
+        with self._live_lock:
+            self._live_changed = True
+        super()._nmap_done(success)
+
+    def _live_rescan(self, rescan: bool) -> bool:
+        """Decides whether a scan takes the devices from the live table again.
+
+        Args:
+            rescan: True, if the caller requested a rescan.
+
+        Returns:
+            bool: While the neighbor table is monitored, True only if the live table changed since
+                  the previous scan, because the previous results are up-to-date otherwise.
+                  Without monitor, `rescan` is returned.
+        """
+        if self._neighbor_monitor is None:
+            return rescan
+        with self._live_lock:
+            return self._live_changed
+
+    def _scan(self, rescan: bool) -> typing.Sequence[LANDevice]:
+        """Scans the arp cache for ip and mac addresses.
+
+        Args:
+            rescan: True, to scan again. False, if you only want to scan, if there are no
+                    results from a previous scan.
+        """
+        return super()._scan(self._live_rescan(rescan))
+
+    async def _ascan(self, rescan: bool) -> typing.Sequence[LANDevice]:
+        """Scans the arp cache for ip and mac addresses without blocking the event loop.
+
+        Args:
+            rescan: True, to scan again. False, if you only want to scan, if there are no
+                    results from a previous scan.
+        """
+        return await super()._ascan(self._live_rescan(rescan))
 
     def _get_arp_cache(self) -> typing.Dict[str, LANDevice]:
-        """Runs the arp command and extracts ip and mac addresses from the command's output.
+        """Reads the arp cache. While the neighbor table is monitored, it is taken from the live
+        table. Otherwise, it is read from the configured source (see `arp_source`).
+
+        Returns:
+            dict: A dictionary, mapping strings to `LANDevice`s. The dictionary contains all entries
+                  of the arp cache, that contain a valid ip and mac address.
+        """
+        with self._live_lock:
+            if self._live_devices is not None and self._neighbor_monitor is not None:
+                self._live_changed = False
+                # Copies, so the live table is not changed when merging the nmap results
+                return {mac_address: copy.copy(dev)
+                        for mac_address, dev in self._live_devices.items()}
+        return self._read_arp_source()
+
+    async def _aget_arp_cache(self) -> typing.Dict[str, LANDevice]:
+        """Reads the arp cache without blocking the event loop (see `_get_arp_cache`).
+
+        The commands "ip" and "arp" are run as asyncio subprocesses. Reading `/proc/net/arp`, the
+        rtnetlink dump and the live table do not block, so they are read directly.
+
+        Returns:
+            dict: A dictionary, mapping strings to `LANDevice`s.
+        """
+        if self._neighbor_monitor is not None or self._arp_source == "netlink":
+            return self._get_arp_cache()
+        elif self._arp_source == "proc":
+            try:
+                return self._read_proc_arp()
+            except OSError:
+                return self._parse_arp_output(await self._arun_command(*self._ARP_COMMAND) or "",
+                                              hardware_type=True)
+        elif self._arp_source == "ip":
+            return self._parse_ip_neigh_output(await self._arun_command(*self._IP_NEIGH_COMMAND)
+                                               or "")
+        return self._parse_arp_output(await self._arun_command(*self._ARP_COMMAND) or "",
+                                      hardware_type=True)
+
+    def _read_arp_source(self) -> typing.Dict[str, LANDevice]:
+        """Reads the arp cache from the configured source (see `arp_source`).
 
         Returns:
-            dict: A dictionary, mapping strings to `LANDevice`s. The dictionary contains all results
-                  of the arp command, that contain a valid ip and mac address.
+            dict: A dictionary, mapping strings to `LANDevice`s. The dictionary contains all entries
+                  of the arp cache, that contain a valid ip and mac address.
+        """
+        if self._arp_source == "proc":
+            try:
+                return self._read_proc_arp()
+            except OSError:
+                # No procfs available (e.g. in a restricted sandbox)
+                return self._run_arp()
+        elif self._arp_source == "ip":
+            return self._run_ip_neigh()
+        elif self._arp_source == "netlink":
+            return self._read_netlink_neighbors()
+        return self._run_arp()
+
+    def _read_netlink_neighbors(self, sock=None) -> typing.Dict[str, LANDevice]:
+        """Dumps the kernel's neighbor table (IPv4 and IPv6) via rtnetlink.
+
+        Incomplete, failed and NOARP entries (e.g. multicast addresses) are skipped.
+
+        Args:
+            sock: The netlink socket to use. If None, a new one is opened.
+
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s.
         """
         devices = {}
+        for entry in _netlink.dump_neighbors(sock):
+            if entry.valid:
+                self._add_neighbor(devices, entry.address, entry.mac)
+        return devices
 
-        try:
-            # Run "arp -n", to retrieve all mac addresses from the ARP-cache
-            process = subprocess.Popen(["arp", "-n"],
-                                       bufsize=100000,
-                                       stdin=subprocess.PIPE,
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE)
-        except FileNotFoundError as exc:
-            raise FileNotFoundError("Command 'arp' was not found. Please, make sure \"net-tools\" "
-                                    "is installed.") from exc
-
-        raw_arp_out, raw_arp_err = process.communicate()
-
-        if process.returncode != 0:
-            # The arp-command failed
-            return devices
-
-        arp_out = bytes.decode(raw_arp_out, errors="ignore")
-        arp_err = bytes.decode(raw_arp_err, errors="ignore")
-
-        if len(arp_err) > 0:
-            # The arp-command failed
-            return devices
-
-        for line in arp_out.splitlines():
-            if self._arp_regex.match(line):
-                # Valid line due to regular expression
+    def _read_proc_arp(self) -> typing.Dict[str, LANDevice]:
+        """Reads the kernel's arp table from `/proc/net/arp`.
+
+        The file contains a header line and one line per entry:
+        "<ip address>  <hw type>  <flags>  <mac address>  <mask>  <interface>"
+
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s.
+        """
+        devices = {}
+        with open(self._proc_arp_path, "r", errors="ignore") as file:
+            next(file, None)  # Skip the header
+            for line in file:
                 components = line.split()
-                ip_address = components[0]
-                # The mac address can be found in third or second component, depending on whether
-                # the <hardware type> is contained or not.
-                for i in [2, 1]:
-                    try:
-                        mac_address = LANDevice.format_mac(components[i])
-                        break
-                    except (IndexError, TypeError):
-                        pass
-                else:
-                    # If no mac address was found, continue with next line
+                if len(components) < 4:
                     continue
-                if mac_address in devices:
-                    # If mac address is already known, ip address is added to the address aliases
-                    if ip_address not in devices[mac_address].all_addresses:
-                        devices[mac_address].address_aliases = [
-                            *devices[mac_address].address_aliases,
-                            ip_address]
-                else:
-                    dev = LANDevice()
-                    dev.address = ip_address
-                    dev.mac_address = mac_address
-                    devices[mac_address] = dev
+                try:
+                    if int(components[2], base=16) & 0x2 == 0:
+                        # Incomplete entries (flag ATF_COM is not set) do not have a mac address
+                        continue
+                    mac_address = LANDevice.format_mac(components[3])
+                except (TypeError, ValueError):
+                    continue
+                self._add_neighbor(devices, components[0], mac_address)
+        return devices
+
+    def _run_ip_neigh(self) -> typing.Dict[str, LANDevice]:
+        """Runs "ip neigh show" and extracts ip and mac addresses from the command's output.
+
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s.
+        """
+        return self._parse_ip_neigh_output(self._run_command(*self._IP_NEIGH_COMMAND) or "")
+
+    @classmethod
+    def _parse_ip_neigh_output(cls, output: str) -> typing.Dict[str, LANDevice]:
+        """Extracts ip and mac addresses from the output of "ip neigh show".
+
+        Each line of the output looks like: "<ip address> dev <interface> lladdr <mac address>
+        [router] <state>". Entries without a link layer address (e.g. "FAILED") are skipped.
+
+        Args:
+            output: The output of the command.
 
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s.
+        """
+        devices = {}
+        for line in output.splitlines():
+            components = line.split()
+            try:
+                mac_address = LANDevice.format_mac(components[components.index("lladdr") + 1])
+            except (IndexError, ValueError, TypeError):
+                continue
+            cls._add_neighbor(devices, components[0], mac_address)
         return devices
+
+    def _run_arp(self) -> typing.Dict[str, LANDevice]:
+        """Runs the arp command and extracts ip and mac addresses from the command's output.
+
+        Returns:
+            dict: A dictionary, mapping mac addresses to `LANDevice`s. The dictionary contains all
+                  results of the arp command, that contain a valid ip and mac address.
+        """
+        # Run "arp -n", to retrieve all mac addresses from the ARP-cache
+        arp_out = self._run_command(*self._ARP_COMMAND)
+        if arp_out is None:
+            return {}
+        # The lines may contain the hardware type: "<ip address>  [<hw type>]  <mac address>  ..."
+        return self._parse_arp_output(arp_out, hardware_type=True)
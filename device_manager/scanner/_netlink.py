@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Reading the kernel's neighbor table (arp and ndp cache) via rtnetlink on linux systems.
+
+Only the standard library is used: A `RTM_GETNEIGH` dump request is sent over a `NETLINK_ROUTE`
+socket and the `RTM_NEWNEIGH` messages of the response are parsed. In contrast to the arp command,
+the dump contains IPv4 and IPv6 neighbors together with their interface index and NUD state.
+"""
+
+import errno
+import os
+import socket
+import struct
+import threading
+import typing
+
+__all__ = ["NeighborEntry", "build_neighbor_request", "parse_neighbor_messages",
+           "open_netlink_socket", "dump_neighbors", "NeighborMonitor"]
+
+####################################################################################################
+
+# Message types (linux/netlink.h, linux/rtnetlink.h)
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+RTM_GETNEIGH = 30
+
+# Message flags
+NLM_F_REQUEST = 0x001
+NLM_F_MULTI = 0x002
+NLM_F_DUMP = 0x300
+
+# Attributes of neighbor messages (linux/neighbour.h)
+NDA_DST = 1
+NDA_LLADDR = 2
+
+# Neighbor states (NUD = neighbor unreachability detection)
+NUD_INCOMPLETE = 0x01
+NUD_REACHABLE = 0x02
+NUD_STALE = 0x04
+NUD_DELAY = 0x08
+NUD_PROBE = 0x10
+NUD_FAILED = 0x20
+NUD_NOARP = 0x40
+NUD_PERMANENT = 0x80
+
+# The netlink multicast group of neighbor events (RTNLGRP_NEIGH) and its bitmask for binding
+RTNLGRP_NEIGH = 3
+RTMGRP_NEIGH = 1 << (RTNLGRP_NEIGH - 1)
+
+# struct nlmsghdr: length, type, flags, sequence number, port id
+_NLMSGHDR = struct.Struct("=LHHLL")
+# struct ndmsg: family, padding, padding, interface index, state, flags, type
+_NDMSG = struct.Struct("=BBHiHBB")
+# struct rtattr: length, type
+_RTATTR = struct.Struct("=HH")
+# struct nlmsgerr starts with the (negative) error number
+_NLMSGERR = struct.Struct("=i")
+
+
+def _align(length: int) -> int:
+    """Aligns a length of a netlink message or attribute to 4 bytes."""
+    return (length + 3) & ~3
+
+
+class NeighborEntry(typing.NamedTuple):
+    """An entry of the kernel's neighbor table."""
+    family: int
+    """The address family (`socket.AF_INET` or `socket.AF_INET6`)."""
+    address: str
+    """The neighbor's ip address."""
+    mac: typing.Optional[str]
+    """The neighbor's link layer address (uppercase with colons) or None, if it is unknown."""
+    ifindex: int
+    """The index of the network interface, the neighbor is connected to."""
+    state: int
+    """The NUD state of the entry (combination of the `NUD_*` flags)."""
+    deleted: bool = False
+    """True, if the entry was removed from the neighbor table (`RTM_DELNEIGH`)."""
+
+    @property
+    def valid(self) -> bool:
+        """True, if the entry belongs to a reachable neighbor with a known mac address."""
+        return self.mac is not None and len(self.mac) == 17 and \
+            not self.state & (NUD_INCOMPLETE | NUD_FAILED | NUD_NOARP)
+
+
+def build_neighbor_request(sequence: int = 1, family: int = socket.AF_UNSPEC) -> bytes:
+    """Builds a request to dump the whole neighbor table.
+
+    Args:
+        sequence: The sequence number of the request.
+        family: The address family of the requested entries. `socket.AF_UNSPEC` for all families.
+
+    Returns:
+        bytes: The netlink message.
+    """
+    payload = _NDMSG.pack(family, 0, 0, 0, 0, 0, 0)
+    header = _NLMSGHDR.pack(_NLMSGHDR.size + len(payload), RTM_GETNEIGH,
+                            NLM_F_REQUEST | NLM_F_DUMP, sequence, 0)
+    return header + payload
+
+
+def parse_neighbor_messages(data: bytes) -> typing.Tuple[typing.List[NeighborEntry], bool]:
+    """Parses netlink messages containing neighbor entries.
+
+    Messages of other types and entries of other address families than IPv4 and IPv6 are skipped.
+
+    Args:
+        data: One or more netlink messages as received from the socket.
+
+    Returns:
+        tuple of list of NeighborEntry: The neighbor entries (`RTM_NEWNEIGH` and `RTM_DELNEIGH`).
+                 bool: True, if the end of a dump (`NLMSG_DONE`) was reached.
+
+    Raises:
+        OSError: If the kernel responded with an error message.
+        ValueError: If the data is truncated.
+    """
+    entries = []
+    done = False
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size or offset + length > len(data):
+            raise ValueError("Truncated netlink message at offset {}".format(offset))
+        body_offset = offset + _NLMSGHDR.size
+        end = offset + length
+        offset += _align(length)
+
+        if msg_type == NLMSG_DONE:
+            done = True
+            break
+        elif msg_type == NLMSG_ERROR:
+            error, = _NLMSGERR.unpack_from(data, body_offset)
+            if error != 0:
+                raise OSError(-error, "Netlink request failed: {}".format(os.strerror(-error)))
+            continue
+        elif msg_type not in (RTM_NEWNEIGH, RTM_DELNEIGH):
+            continue
+
+        family, _, _, ifindex, state, _, _ = _NDMSG.unpack_from(data, body_offset)
+        if family not in (socket.AF_INET, socket.AF_INET6):
+            continue
+        address = None
+        mac = None
+        attr_offset = body_offset + _NDMSG.size
+        while attr_offset + _RTATTR.size <= end:
+            attr_length, attr_type = _RTATTR.unpack_from(data, attr_offset)
+            if attr_length < _RTATTR.size:
+                break
+            value = data[attr_offset + _RTATTR.size:attr_offset + attr_length]
+            if attr_type == NDA_DST:
+                address = socket.inet_ntop(family, value)
+            elif attr_type == NDA_LLADDR and len(value) > 0:
+                mac = ":".join("{:02X}".format(byte) for byte in value)
+            attr_offset += _align(attr_length)
+
+        if address is not None:
+            entries.append(NeighborEntry(family, address, mac, ifindex, state,
+                                         deleted=msg_type == RTM_DELNEIGH))
+    return entries, done
+
+
+def open_netlink_socket(groups: int = 0) -> socket.socket:
+    """Opens a rtnetlink socket.
+
+    Args:
+        groups: Bitmask of the multicast groups to subscribe to. 0, to not receive any events.
+
+    Returns:
+        socket.socket: The bound netlink socket.
+    """
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    try:
+        sock.bind((0, groups))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def dump_neighbors(sock: typing.Optional[socket.socket] = None,
+                   buffer_size: int = 65536) -> typing.List[NeighborEntry]:
+    """Dumps the kernel's neighbor table (IPv4 and IPv6).
+
+    Args:
+        sock: A socket-like object (with `send` and `recv`) to communicate with. If None, a new
+              rtnetlink socket is opened and closed afterwards.
+        buffer_size: The buffer size for receiving the response.
+
+    Returns:
+        list of NeighborEntry: All entries of the neighbor table.
+    """
+    own_socket = sock is None
+    if own_socket:
+        sock = open_netlink_socket()
+    try:
+        sock.send(build_neighbor_request())
+        entries = []
+        done = False
+        while not done:
+            data = sock.recv(buffer_size)
+            if len(data) == 0:
+                break
+            new_entries, done = parse_neighbor_messages(data)
+            entries.extend(new_entries)
+        return entries
+    finally:
+        if own_socket:
+            sock.close()
+
+
+class NeighborMonitor:
+    """Receives changes of the neighbor table (`RTM_NEWNEIGH` and `RTM_DELNEIGH` events) in a
+    background thread.
+
+    Args:
+        callback: Function that is called with a `NeighborEntry` for each event.
+        sock: A socket-like object (with `recv`) providing the netlink messages. This can be used to
+              replay recorded events. If None, a rtnetlink socket subscribed to the neighbor events
+              is opened. The monitor stops, when `recv` returns no data.
+        resync: Function that is called, when events were lost, because the socket's receive
+                buffer overflowed. Then the neighbor table should be read again.
+        buffer_size: The buffer size for receiving messages.
+    """
+
+    def __init__(self, callback: typing.Callable[[NeighborEntry], None],
+                 sock: typing.Optional[socket.socket] = None,
+                 resync: typing.Optional[typing.Callable[[], None]] = None,
+                 buffer_size: int = 65536):
+        self._callback = callback
+        self._resync = resync
+        self._sock = sock
+        self._own_socket = sock is None
+        self._buffer_size = buffer_size
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """True, if the background thread is receiving events."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Subscribes to the neighbor events and starts the background thread."""
+        if self._thread is not None:
+            return
+        if self._own_socket:
+            self._sock = open_netlink_socket(RTMGRP_NEIGH)
+            # Wake up regularly to check whether the monitor was stopped
+            self._sock.settimeout(0.5)
+        self._thread = threading.Thread(target=self._run, name="NeighborMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        """Stops the background thread.
+
+        Args:
+            timeout: Time in seconds to wait for the thread to stop. None, to wait until it stopped.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self._own_socket and self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        """Waits until the background thread stopped (e.g. when replayed events are exhausted).
+
+        Args:
+            timeout: Time in seconds to wait. None, to wait until the thread stopped.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Receives and dispatches the events until the monitor is stopped."""
+        while not self._stop_event.is_set():
+            try:
+                data = self._sock.recv(self._buffer_size)
+            except socket.timeout:
+                continue
+            except OSError as exc:
+                if exc.errno == errno.ENOBUFS:
+                    # The kernel dropped events, because they were not received fast enough
+                    if self._resync is not None:
+                        self._resync()
+                    continue
+                break
+            if len(data) == 0:
+                break
+            try:
+                entries, _ = parse_neighbor_messages(data)
+            except (OSError, ValueError):
+                continue
+            for entry in entries:
+                self._callback(entry)
@@ -9,8 +9,6 @@ if sys.platform != "win32":
             str(os.environ["DEVMAN_NO_IMPORT_ERROR"]) not in ["True", "1"]:
         raise ImportError("Windows-specific device scanners are only importable on windows systems")
 
-import re
-import subprocess
 import typing
 
 import win32com.client
@@ -29,9 +27,22 @@ class Win32USBDeviceScanner(BaseDeviceScanner):
     """
 
     def __init__(self, **kwargs):
-        super().__init__()
-        self._wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-        self._wbem = self._wmi.ConnectServer(".", "root\\cimv2")
+        super().__init__(**kwargs)
+        # The connection to WMI is established on first use, so creating the scanner is cheap
+        self._wmi = None
+        self._wbem_server = None
+
+    @property
+    def _wbem(self):
+        """The connection to the WMI service, which is established on first use."""
+        if self._wbem_server is None:
+            self._wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
+            self._wbem_server = self._wmi.ConnectServer(".", "root\\cimv2")
+        return self._wbem_server
+
+    @_wbem.setter
+    def _wbem(self, server) -> None:
+        self._wbem_server = server
 
     @staticmethod
     def _device_from_raw(raw_device) -> USBDevice:
@@ -98,15 +109,17 @@ class Win32USBDeviceScanner(BaseDeviceScanner):
             # Only scan if rescan is True or no devices were found, yet
             return self._devices
 
-        self._devices.clear()
+        devices = []
         # Get all plug-and-play devices from the windows device manager
         raw_devices = self._wbem.ExecQuery("SELECT * FROM Win32_PnPEntity")
         for raw_dev in raw_devices:
             try:
                 dev = self._device_from_raw(raw_dev)
-                self._devices.append(dev)
+                devices.append(dev)
             except (TypeError, AttributeError, ValueError):
                 pass
+        # Replace the list at once, so concurrent readers never see a partial result
+        self._devices = devices
         return tuple(self._devices)
 
 
@@ -114,16 +127,14 @@ class Win32LANDeviceScanner(BaseLANDeviceScanner):
     """A device scanner that scans the local network for ethernet devices.
 
     Args:
-        **kwargs:
+        **kwargs: The options of the `BaseDeviceScanner` and additionally:
           - nmap_search_path: One or multiple paths where to search for the nmap executable.
+          - nmap_timeout: Time in seconds after which a nmap scan is aborted. No timeout by default.
+          - command_timeout: Time in seconds after which external commands (like arp) are killed.
+                             Then, the scan returns the results of the previous scan. 10 seconds by
+                             default. None, to wait without a timeout.
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Regular Expression: "  <ip address>  <hardware type>  <mac address>  ..."
-        self._arp_regex = re.compile(r"^[ \t]*((?:\d{1,3}\.){3}\d{1,3})[ \t]+"
-                                     r"([0-9A-Fa-f]{2}[.:\-]){5}([0-9A-Fa-f]{2})")
-
     def _get_arp_cache(self) -> typing.Dict[str, LANDevice]:
         """Runs the arp command and extracts ip and mac addresses from the command's output.
 
@@ -131,57 +142,24 @@ class Win32LANDeviceScanner(BaseLANDeviceScanner):
             dict: A dictionary, mapping strings to `LANDevice`s. The dictionary contains all results
                   of the arp command, that contain a valid ip and mac address.
         """
-        devices = {}
+        # Run "arp -a", to retrieve all mac addresses from the ARP-cache
+        arp_out = self._run_command(["arp", "-a"])
+        if arp_out is None:
+            return {}
 
-        try:
-            # Run "arp -a", to retrieve all mac addresses from the ARP-cache
-            process = subprocess.Popen(["arp", "-a"],
-                                       bufsize=100000,
-                                       stdin=subprocess.PIPE,
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE)
-        except FileNotFoundError as exc:
-            raise FileNotFoundError("Command 'arp' was not found. Please, make sure it is "
-                                    "installed.") from exc
-
-        raw_arp_out, raw_arp_err = process.communicate()
-
-        if process.returncode != 0:
-            # The arp-command failed
-            return devices
-
-        arp_out = bytes.decode(raw_arp_out, errors="ignore")
-        arp_err = bytes.decode(raw_arp_err, errors="ignore")
-
-        if len(arp_err) > 0:
-            # The arp-command failed
-            return devices
-
-        for line in arp_out.splitlines():
-            if self._arp_regex.match(line):
-                # Valid line due to regular expression
-                components = line.split()
-                ip_address = components[0]
-                # The mac address can be found in third or second component, depending on whether
-                # the <hardware type> is contained or not.
-                try:
-                    mac_address = LANDevice.format_mac(components[1])
-                except (IndexError, TypeError):
-                    # If no mac address was found, continue with next line
-                    continue
-                if mac_address in devices:
-                    # If mac address is already known, IP address is added to the address aliases
-                    if ip_address not in devices[mac_address].all_addresses:
-                        devices[mac_address].address_aliases = [
-                            *devices[mac_address].address_aliases,
-                            ip_address]
-                else:
-                    # Unknown mac address: Create a new ethernet device
-                    dev = LANDevice()
-                    dev.address = ip_address
-                    dev.mac_address = mac_address
-                    devices[mac_address] = dev
-        return devices
+        # Lines of the output: "  <ip address>  <mac address>  <type>"
+        return self._parse_arp_output(arp_out)
+
+    async def _aget_arp_cache(self) -> typing.Dict[str, LANDevice]:
+        """Runs the arp command as asyncio subprocess (see `_get_arp_cache`).
+
+        Returns:
+            dict: A dictionary, mapping strings to `LANDevice`s.
+        """
+        arp_out = await self._arun_command(["arp", "-a"])
+        if arp_out is None:
+            return {}
+        return self._parse_arp_output(arp_out)
 
 
 def _analyse_win32_device_ids(ids: typing.Iterable[str]) \
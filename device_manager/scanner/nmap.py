@@ -12,23 +12,40 @@ import threading
 import typing
 import warnings
 
-try:
-    import nmap
-    _NMAP_IMPORTED = True
-except (ImportError, ModuleNotFoundError):
-    _NMAP_IMPORTED = False
-    warnings.warn("python-nmap is not installed. Without this package you may not find all "
-                  "ethernet devices in your local network. When installing python-nmap, do not "
-                  "forget to install the nmap executable as well, if it is not installed, yet. And "
-                  "make sure it is also included in the PATH environmental variable.")
-
 from ..device import LANDevice
 
 __all__ = ["NMAPWrapper"]
 
+# python-nmap is imported on first use (see `_import_nmap`)
+_nmap_module = None
+_nmap_import_tried = False
+_nmap_import_lock = threading.Lock()
+
 ####################################################################################################
 
 
+def _import_nmap():
+    """Imports python-nmap on first use, so importing this module stays cheap.
+
+    Returns:
+        module: The `nmap` module or None, if python-nmap is not installed.
+    """
+    global _nmap_module, _nmap_import_tried  # pylint: disable=global-statement
+    with _nmap_import_lock:
+        if not _nmap_import_tried:
+            _nmap_import_tried = True
+            try:
+                import nmap  # pylint: disable=import-outside-toplevel
+                _nmap_module = nmap
+            except ImportError:
+                warnings.warn("python-nmap is not installed. Without this package you may not find "
+                              "all ethernet devices in your local network. When installing "
+                              "python-nmap, do not forget to install the nmap executable as well, "
+                              "if it is not installed, yet. And make sure it is also included in "
+                              "the PATH environmental variable.")
+    return _nmap_module
+
+
 class NMAPWrapper:  # pragma: no cover
     """Wrapper class for `nmap.PortScanner`. It class manages network scans via nmap and converts
     the results in `Device`s.
@@ -39,32 +56,62 @@ class NMAPWrapper:  # pragma: no cover
                             argument will be True, if the scan succeeded and False, if not.
         **kwargs:
           - nmap_search_path: One or multiple paths where to search for the nmap executable.
+          - nmap_timeout: Time in seconds after which a scan is aborted. No timeout by default.
     """
 
     def __init__(self,
                  notify_parent_done: typing.Optional[typing.Callable[[bool], typing.Any]] = None,
                  **kwargs):
         super().__init__()
-        self._nmap = None
-
-        if _NMAP_IMPORTED:
-            nmap_kwargs = {}
-            if "nmap_search_path" in kwargs:
-                nmap_kwargs["nmap_search_path"] = kwargs["nmap_search_path"]
-
-            try:
-                self._nmap = nmap.PortScanner(**nmap_kwargs)
-            except nmap.PortScannerError:
-                # An error is raised, if the nmap-executable was not found
-                warnings.warn("Could not create a nmap.PortScanner instance. Maybe nmap is not "
-                              "installed on your machine or it is not specified in PATH. If nmap "
-                              "is already installed try specifying its path with the "
-                              "'nmap_search_path'-parameter.")
-
+        # The nmap.PortScanner runs the nmap executable when it is created, so it is created on
+        # first use (see `_nmap`)
+        self._port_scanner = None
+        self._port_scanner_created = False
+        self._port_scanner_lock = threading.Lock()
+        self._nmap_kwargs = {}
+        if "nmap_search_path" in kwargs:
+            self._nmap_kwargs["nmap_search_path"] = kwargs["nmap_search_path"]
+
+        self._nmap_timeout = kwargs.get("nmap_timeout", None)
         self._nmap_results = []
         self._nmap_thread = None
         self._notify_parent_done = notify_parent_done
 
+    @property
+    def _nmap(self) -> typing.Optional["nmap.PortScanner"]:
+        """The `nmap.PortScanner` or None, if it could not be instantiated. It is instantiated on
+        first use."""
+        with self._port_scanner_lock:
+            if not self._port_scanner_created:
+                self._port_scanner_created = True
+                self._port_scanner = self._create_port_scanner()
+        return self._port_scanner
+
+    @_nmap.setter
+    def _nmap(self, port_scanner: typing.Optional["nmap.PortScanner"]) -> None:
+        with self._port_scanner_lock:
+            self._port_scanner_created = True
+            self._port_scanner = port_scanner
+
+    def _create_port_scanner(self) -> typing.Optional["nmap.PortScanner"]:
+        """Instantiates the `nmap.PortScanner`.
+
+        Returns:
+            nmap.PortScanner: The port scanner or None, if nmap or python-nmap are not installed.
+        """
+        nmap = _import_nmap()
+        if nmap is None:
+            return None
+        try:
+            return nmap.PortScanner(**self._nmap_kwargs)
+        except nmap.PortScannerError:
+            # An error is raised, if the nmap-executable was not found
+            warnings.warn("Could not create a nmap.PortScanner instance. Maybe nmap is not "
+                          "installed on your machine or it is not specified in PATH. If nmap "
+                          "is already installed try specifying its path with the "
+                          "'nmap_search_path'-parameter.")
+            return None
+
     @property
     def valid(self) -> bool:
         """Returns True, if the nmap.PortScanner could be instantiated"""
@@ -221,10 +268,15 @@ class NMAPWrapper:  # pragma: no cover
                           "environment. To use the nmap features, make sure both are installed.")
             return False
 
+        nmap = _import_nmap()
         result = False
         if not isinstance(hosts, str):
             # nmap expects a single string as host-argument, multiple hosts are separated by spaces
             hosts = " ".join(hosts)
+        scan_kwargs = {}
+        if self._nmap_timeout is not None:
+            # The scan is killed by python-nmap after the timeout
+            scan_kwargs["timeout"] = self._nmap_timeout
         try:
             exception = None
             for arguments in ["-sA -F --min-parallelism 1024 --privileged",
@@ -233,13 +285,16 @@ class NMAPWrapper:  # pragma: no cover
                     # Try to perform a TCP-ACK scan, which seems to be the fastest one, but it
                     # requires admin privileges on linux. If the user has the requires privileges it
                     # should work.
-                    self._nmap.scan(hosts, arguments=arguments)
+                    self._nmap.scan(hosts, arguments=arguments, **scan_kwargs)
                     scan_info = self._nmap.scaninfo()
                     if "error" in scan_info:
                         # The scan terminated correctly, but an stderr contained some outputs
                         raise nmap.PortScannerError(os.linesep.join(scan_info["error"]))
                     break  # Success
                 except nmap.PortScannerError as exc:
+                    if isinstance(exc, getattr(nmap, "PortScannerTimeout", ())):
+                        # Other arguments would run into the timeout, too
+                        raise
                     # If an error occurs, this could be due to missing admin privileges. So the next
                     # element from the arguments is tried which needs less privileges.
                     exception = exc
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Running external commands (like arp or ip) with a timeout and the possibility to cancel them.
+
+Commands can either be run synchronously with `run_command` or inside of an asyncio event loop with
+`arun_command`. Both accept a `CancelHandle`, which can be used by another thread to kill all
+commands that are currently running with this handle.
+"""
+
+import subprocess
+import threading
+import typing
+
+__all__ = ["CommandCancelledError", "CancelHandle", "run_command", "arun_command"]
+
+####################################################################################################
+
+
+class CommandCancelledError(Exception):
+    """Raised, if a running command was cancelled by its `CancelHandle`."""
+
+
+class CancelHandle:
+    """Handle to cancel running commands.
+
+    Pass the handle to `run_command` or `arun_command`. Calling `cancel` kills all commands that
+    are currently running with this handle. These calls raise a `CommandCancelledError` then.
+    Commands that are started afterwards are not affected.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = {}
+
+    def cancel(self) -> int:
+        """Kills all commands that are currently running with this handle.
+
+        Returns:
+            int: The number of cancelled commands.
+        """
+        with self._lock:
+            processes = list(self._processes.items())
+            for process, _ in processes:
+                self._processes[process] = True
+        for process, _ in processes:
+            try:
+                process.kill()
+            except OSError:
+                # The process already terminated
+                pass
+        return len(processes)
+
+    @property
+    def running(self) -> int:
+        """The number of commands that are currently running with this handle."""
+        with self._lock:
+            return len(self._processes)
+
+    def _register(self, process) -> None:
+        """Registers a started process."""
+        with self._lock:
+            self._processes[process] = False
+
+    def _unregister(self, process) -> bool:
+        """Unregisters a finished process.
+
+        Returns:
+            bool: True, if the process was cancelled.
+        """
+        with self._lock:
+            return self._processes.pop(process, False)
+
+
+def run_command(args: typing.Sequence[str], timeout: typing.Optional[float] = None,
+                cancel: typing.Optional[CancelHandle] = None) -> typing.Tuple[int, bytes, bytes]:
+    """Runs a command and waits until it terminated.
+
+    Args:
+        args: The command and its arguments.
+        timeout: Time in seconds after which the command is killed. None, to wait without a timeout.
+        cancel: A handle that can be used to cancel the command from another thread.
+
+    Returns:
+        tuple of int: The return code of the command.
+                 bytes: The output of the command (stdout).
+                 bytes: The error output of the command (stderr).
+
+    Raises:
+        FileNotFoundError: If the command was not found.
+        subprocess.TimeoutExpired: If the command did not terminate before the timeout.
+        CommandCancelledError: If the command was cancelled.
+    """
+    process = subprocess.Popen(args,
+                               bufsize=100000,
+                               stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+    if cancel is not None:
+        cancel._register(process)  # pylint: disable=protected-access
+    cancelled = False
+    try:
+        try:
+            out, err = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    finally:
+        if cancel is not None:
+            cancelled = cancel._unregister(process)  # pylint: disable=protected-access
+    if cancelled:
+        raise CommandCancelledError("Command \"{}\" was cancelled".format(" ".join(args)))
+    return process.returncode, out, err
+
+
+async def arun_command(args: typing.Sequence[str], timeout: typing.Optional[float] = None,
+                       cancel: typing.Optional[CancelHandle] = None) \
+        -> typing.Tuple[int, bytes, bytes]:
+    """Runs a command as asyncio subprocess, so the event loop is not blocked.
+
+    Args:
+        args: The command and its arguments.
+        timeout: Time in seconds after which the command is killed. None, to wait without a timeout.
+        cancel: A handle that can be used to cancel the command (also from another thread).
+
+    Returns:
+        tuple of int: The return code of the command.
+                 bytes: The output of the command (stdout).
+                 bytes: The error output of the command (stderr).
+
+    Raises:
+        FileNotFoundError: If the command was not found.
+        subprocess.TimeoutExpired: If the command did not terminate before the timeout.
+        CommandCancelledError: If the command was cancelled.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    process = await asyncio.create_subprocess_exec(*args,
+                                                   stdin=subprocess.DEVNULL,
+                                                   stdout=subprocess.PIPE,
+                                                   stderr=subprocess.PIPE)
+    if cancel is not None:
+        cancel._register(process)  # pylint: disable=protected-access
+    cancelled = False
+    try:
+        try:
+            out, err = await asyncio.wait_for(process.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            try:
+                process.kill()
+            except OSError:
+                # The process already terminated
+                pass
+            await process.wait()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(list(args), timeout) from exc
+            raise
+    finally:
+        if cancel is not None:
+            cancelled = cancel._unregister(process)  # pylint: disable=protected-access
+    if cancelled:
+        raise CommandCancelledError("Command \"{}\" was cancelled".format(" ".join(args)))
+    return process.returncode, out, err
@@ -1,60 +1,496 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""A database that maps usb vendor and product ids to their names.
+
+The names are read from the file "usb.ids" that is maintained by the linux-usb project. Most linux
+distributions ship this file (e.g. at "/usr/share/hwdata/usb.ids"), so it is read from disk instead
+of downloading it. The parsed result is stored in a sorted, binary index file, which is validated by
+the modification time and size of the source file. The index file is memory mapped and searched
+with a binary search, so names are only decoded when they are requested. Only if
+`USBVendorDatabase.update` is called, the newest version is downloaded from the internet.
+Besides the vendor and product names, the database also contains the names of the usb device
+classes, subclasses and protocols.
+"""
+
+import mmap
+import os
 import re
-import urllib.request
-from typing import Dict, Optional, Tuple
+import struct
+import sys
+import threading
+import typing
 
 __all__ = ["USBVendorDatabase"]
 
+# Vendor line of the usb id database: "<vendor id>  <vendor name>"
+_VENDOR_LINE = re.compile(rb"[0-9a-f]{4}  ")
+
+####################################################################################################
+
+
+class _USBIdIndex:
+    """A compact, sorted index of the usb id database.
+
+    The index consists of a header, sorted tables of fixed-size records and a block of utf-8 encoded
+    names. Each record maps a key (e.g. vendor id or vendor/product id) to the offset and length of
+    its name. Lookups are done with a binary search directly on the buffer, so names are only
+    decoded on demand. If the buffer is a memory map of an index file, the data is shared via the
+    page cache by all processes that use the same file.
+
+    Args:
+        buffer: The index data. Either a `mmap.mmap`-object or bytes.
+
+    Raises:
+        ValueError: If the buffer does not contain a valid index.
+    """
+
+    MAGIC = b"DMUSBIDX"
+    # Version of the index format. Increase this, if the format changes.
+    VERSION = 2
+    # Table numbers
+    VENDORS = 0  # key: vendor id
+    PRODUCTS = 1  # key: vendor id << 16 | product id
+    CLASSES = 2  # key: class id
+    SUBCLASSES = 3  # key: class id << 8 | subclass id
+    PROTOCOLS = 4  # key: class id << 16 | subclass id << 8 | protocol id
+    TABLE_COUNT = 5
+
+    # magic, version, mtime and size of the source file, number of tables
+    _HEADER = struct.Struct("<8sIqqI")
+    # number of records in a table
+    _COUNT = struct.Struct("<I")
+    # key, name offset, name length
+    _RECORD = struct.Struct("<IIH")
+    _KEY = struct.Struct("<I")
+
+    def __init__(self, buffer: typing.Union[mmap.mmap, bytes]):
+        self._buffer = buffer
+        self._tables = []
+        try:
+            magic, version, self.mtime, self.size, table_count = \
+                self._HEADER.unpack_from(buffer, 0)
+            if magic != self.MAGIC or version != self.VERSION or \
+                    table_count != self.TABLE_COUNT:
+                raise ValueError("Invalid usb id index")
+
+            # Offsets and lengths of all tables
+            offset = self._HEADER.size
+            for _ in range(table_count):
+                count, = self._COUNT.unpack_from(buffer, offset)
+                offset += self._COUNT.size
+                self._tables.append((offset, count))
+                offset += count * self._RECORD.size
+        except struct.error as exc:
+            raise ValueError("Invalid usb id index") from exc
+        self._names_offset = offset
+        if offset > len(buffer):
+            raise ValueError("Invalid usb id index")
+
+    @classmethod
+    def build(cls, tables: typing.Sequence[typing.Dict[int, str]], mtime: int = 0,
+              size: int = 0) -> bytes:
+        """Creates the binary index from dictionaries.
+
+        Args:
+            tables: One dictionary for each table, mapping keys to names.
+            mtime: Modification time of the source file in nanoseconds.
+            size: Size of the source file in bytes.
+
+        Returns:
+            bytes: The binary index.
+        """
+        header = [cls._HEADER.pack(cls.MAGIC, cls.VERSION, mtime, size, len(tables))]
+        names = bytearray()
+        for table in tables:
+            header.append(cls._COUNT.pack(len(table)))
+            for key in sorted(table):
+                name = table[key].encode("utf-8")
+                header.append(cls._RECORD.pack(key, len(names), len(name)))
+                names += name
+        return b"".join(header) + names
+
+    def matches(self, mtime: int, size: int) -> bool:
+        """Checks if the index was built from a source file with the given modification time and
+        size."""
+        return self.mtime == mtime and self.size == size
+
+    def lookup(self, table: int, key: int) -> typing.Optional[str]:
+        """Searches the name for a key.
+
+        Args:
+            table: Number of the table to search in.
+            key: Key of the requested name.
+
+        Returns:
+            str: The name or None, if the key is unknown.
+        """
+        offset, count = self._tables[table]
+        low, high = 0, count
+        while low < high:
+            # Binary search on the sorted records
+            middle = (low + high) // 2
+            record_key, = self._KEY.unpack_from(self._buffer, offset + middle * self._RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                _, name_offset, name_length = self._RECORD.unpack_from(
+                    self._buffer, offset + middle * self._RECORD.size)
+                name_offset += self._names_offset
+                return bytes(self._buffer[name_offset:name_offset + name_length]).decode("utf-8")
+        return None
+
+    def close(self) -> None:
+        """Releases the memory map, if there is one."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
 
 class USBVendorDatabase:
     """A static class that maps vendor/product ids to their corresponding names."""
 
-    __vendors = None
+    # Location of the most recent version of the usb id database
+    USB_IDS_URL = "http://www.linux-usb.org/usb.ids"
+    # Well known locations of the usb id database on linux systems
+    USB_IDS_PATHS = ("/usr/share/hwdata/usb.ids",
+                     "/usr/share/misc/usb.ids",
+                     "/usr/share/usb.ids",
+                     "/var/lib/usbutils/usb.ids")
+
+    # Maximum time in seconds, a lookup waits for a database that is loaded in the background (see
+    # `prefetch`). If the database is not ready in time, no names are found. None waits until the
+    # database is loaded.
+    prefetch_timeout = 0.0
+
+    __index = None
+    # Names that were already looked up, by vendor and product id
+    __names = {}
+    # Thread that loads the database in the background
+    __loader = None
+    __lock = threading.Lock()
 
     @staticmethod
-    def _download_vendors() -> Dict[int, Dict[Optional[int], str]]:
-        """Downloads all vendor/product ids and their corresponding names.
+    def cache_directory() -> str:
+        """Returns the directory where cache files and downloaded usb id databases are stored.
+
+        The directory can be changed with the environmental variable "DEVMAN_CACHE_DIR".
 
         Returns:
-            dict: Mapping of all known vendor/product ids with their corresponding names.
+            str: Path to the cache directory. The directory does not need to exist.
         """
-        response = urllib.request.urlopen("http://www.linux-usb.org/usb.ids")
-        response_str = response.read().decode(encoding="latin1")
-        lines = response_str.splitlines()
-        read = False
+        if "DEVMAN_CACHE_DIR" in os.environ:
+            return os.environ["DEVMAN_CACHE_DIR"]
+        if sys.platform == "win32":
+            base_dir = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        else:
+            base_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"),
+                                                                     ".cache"))
+        return os.path.join(base_dir, "device_manager")
 
-        vendors = dict()
+    @classmethod
+    def find_usb_ids(cls) -> typing.Optional[str]:
+        """Searches the local file system for an usb id database.
+
+        The file set in the environmental variable "DEVMAN_USB_IDS" is preferred. Otherwise, a file
+        that was downloaded with `update` is used. If there is none, the well known locations in
+        `USB_IDS_PATHS` are searched.
+
+        Returns:
+            str: Path to the usb id database or None, if no database was found.
+        """
+        paths = [os.path.join(cls.cache_directory(), "usb.ids"), *cls.USB_IDS_PATHS]
+        if "DEVMAN_USB_IDS" in os.environ:
+            paths.insert(0, os.environ["DEVMAN_USB_IDS"])
+        for path in paths:
+            if os.path.isfile(path):
+                return path
+        return None
+
+    @staticmethod
+    def _parse_usb_ids(lines: typing.Iterable[bytes]) -> typing.List[typing.Dict[int, str]]:
+        """Parses the names of vendors, products and device classes from an usb id database.
+
+        The database is parsed line by line in a single pass, so it can be read directly from a
+        file or a http response without loading it into memory completely.
+
+        Args:
+            lines: Lines of the usb id database as bytes, e.g. a file opened in binary mode.
+
+        Returns:
+            list of dict: The tables of `_USBIdIndex`, each mapping the index keys to names.
+        """
+        tables = [{} for _ in range(_USBIdIndex.TABLE_COUNT)]
+        vendors, products, classes, subclasses, protocols = tables
+        vendor_id = class_id = subclass_id = None
+        # Section of the current top-level entry: "vendor", "class" or None for ignored sections
+        section = None
+
+        def decode(name: bytes) -> str:
+            # Current databases are utf-8 encoded, older ones use latin-1
+            try:
+                return name.strip().decode("utf-8")
+            except UnicodeDecodeError:
+                return name.strip().decode("latin1")
 
         for line in lines:
-            line = line.rstrip()
-            if line == "# Vendors, devices and interfaces. Please keep sorted.":
-                read = True
+            first = line[:1]
+            if first == b"#" or first.isspace() and not line.strip():
+                # Comment or empty line
                 continue
-            elif line == "# List of known device classes, subclasses and protocols":
-                read = False
-                break
-
-            if read:
-                if re.match("^[0-9a-f]{4}", line):
-                    # Vendor line
-                    last_vendor = int(line[:4], base=16)
-                    if last_vendor not in vendors:
-                        vendors[last_vendor] = dict()
-                    vendors[last_vendor][None] = re.sub("\"", "\\\"", re.sub("\?+", "?", repr(
-                        line[4:].strip())[1:-1].replace("\\", "\\\\")))
-                elif re.match("^\t[0-9a-f]{4}", line):
-                    # Product line
-                    line = line.strip()
-                    product = int(line[:4], base=16)
-                    vendors[last_vendor][product] = re.sub("\"", "\\\"", re.sub("\?+", "?", repr(
-                        line[4:].strip())[1:-1].replace("\\", "\\\\")))
-
-        return vendors
+            elif first == b"\t":
+                if line[1:2] == b"\t":
+                    # Interface (vendor section) or protocol (class section)
+                    if section == "class" and subclass_id is not None:
+                        try:
+                            protocol_id = int(line[2:4], 16)
+                            protocols[(class_id << 16) | (subclass_id << 8) | protocol_id] = \
+                                decode(line[4:])
+                        except ValueError:
+                            pass
+                elif section == "vendor":
+                    # Product line: "\t<product id>  <product name>"
+                    try:
+                        products[(vendor_id << 16) | int(line[1:5], 16)] = decode(line[5:])
+                    except ValueError:
+                        pass
+                elif section == "class":
+                    # Subclass line: "\t<subclass id>  <subclass name>"
+                    try:
+                        subclass_id = int(line[1:3], 16)
+                        subclasses[(class_id << 8) | subclass_id] = decode(line[3:])
+                    except ValueError:
+                        subclass_id = None
+            elif line[4:6] == b"  " and _VENDOR_LINE.match(line):
+                # Vendor line: "<vendor id>  <vendor name>"
+                section = "vendor"
+                vendor_id = int(line[:4], 16)
+                vendors[vendor_id] = decode(line[6:])
+            elif first == b"C" and line[1:2] == b" ":
+                # Class line: "C <class id>  <class name>"
+                try:
+                    class_id = int(line[2:4], 16)
+                    classes[class_id] = decode(line[4:])
+                    section = "class"
+                except ValueError:
+                    section = None
+                subclass_id = None
+            else:
+                # Other lists (e.g. HID descriptor types or languages) are not used
+                section = None
+
+        return tables
+
+    @classmethod
+    def _index_file(cls, path: str) -> str:
+        """Returns the path of the index file for a specific usb id database.
+
+        Args:
+            path: Path to the usb id database.
+
+        Returns:
+            str: Path to the index file.
+        """
+        name = re.sub(r"[^0-9A-Za-z_.\-]", "_", os.path.abspath(path).strip(os.sep))
+        return os.path.join(cls.cache_directory(), name + ".idx")
+
+    @classmethod
+    def _open_index(cls, path: str) -> typing.Optional[_USBIdIndex]:
+        """Opens the index file of an usb id database as memory map.
+
+        Args:
+            path: Path to the usb id database, whose index should be opened.
+
+        Returns:
+            _USBIdIndex: The index or None, if there is no valid index file for the database at
+                         `path`.
+        """
+        try:
+            stat = os.stat(path)
+            with open(cls._index_file(path), "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # The index file does not exist, is not readable or it is empty
+            return None
+        try:
+            index = _USBIdIndex(buffer)
+            if index.matches(stat.st_mtime_ns, stat.st_size):
+                return index
+        except ValueError:
+            pass
+        # The index file is invalid or it is out of date
+        buffer.close()
+        return None
+
+    @classmethod
+    def _build_index(cls, path: str, tables: typing.Optional[typing.List[typing.Dict[int, str]]]
+                     = None) -> _USBIdIndex:
+        """Parses an usb id database and writes its index file.
+
+        Args:
+            path: Path to the usb id database.
+            tables: The already parsed tables of the database at `path` or None, to parse it.
+
+        Returns:
+            _USBIdIndex: The new index. If the index file could not be written, the index is kept in
+                         memory.
+        """
+        stat = os.stat(path)
+        if tables is None:
+            with open(path, "rb") as file:
+                tables = cls._parse_usb_ids(file)
+        data = _USBIdIndex.build(tables, stat.st_mtime_ns, stat.st_size)
+
+        try:
+            index_file = cls._index_file(path)
+            os.makedirs(os.path.dirname(index_file), exist_ok=True)
+            # Write into a temporary file first, so other processes never read a partial index
+            tmp_file = "{}.{}.tmp".format(index_file, os.getpid())
+            with open(tmp_file, "wb") as file:
+                file.write(data)
+            os.replace(tmp_file, index_file)
+        except OSError:
+            # The index file is optional. If the cache directory is not writable, keep it in memory.
+            return _USBIdIndex(data)
+        index = cls._open_index(path)
+        return index if index is not None else _USBIdIndex(data)
+
+    @classmethod
+    def load(cls, path: typing.Optional[str] = None) -> bool:
+        """Loads the usb id database from a local file.
+
+        The database is parsed into an index file, which is memory mapped. So the file is only
+        parsed again, if it was modified.
+
+        Args:
+            path: Path to the usb id database. If None, the database is searched with
+                  `find_usb_ids`.
+
+        Returns:
+            bool: True, if the database was loaded. False, if no database was found.
+        """
+        if path is None:
+            path = cls.find_usb_ids()
+            if path is None:
+                return False
+
+        index = cls._open_index(path)
+        if index is None:
+            index = cls._build_index(path)
+        cls.reset()
+        cls.__index = index
+        return True
+
+    @classmethod
+    def update(cls, url: typing.Optional[str] = None) -> None:
+        """Downloads the newest version of the usb id database and loads it.
+
+        The downloaded file is stored in the cache directory and it is preferred over the usb id
+        databases of the system in the future.
+
+        Args:
+            url: Location to download the database from. Default is `USB_IDS_URL`.
+        """
+        # urllib is only imported here, because it is slow to import and rarely needed
+        import urllib.request  # pylint: disable=import-outside-toplevel
+
+        response = urllib.request.urlopen(url if url is not None else cls.USB_IDS_URL)
+        path = os.path.join(cls.cache_directory(), "usb.ids")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+
+        def tee(file: typing.IO[bytes]) -> typing.Iterator[bytes]:
+            # Write each line to the file, while it is parsed
+            for line in response:
+                file.write(line)
+                yield line
+
+        with open(tmp_path, "wb") as file:
+            tables = cls._parse_usb_ids(tee(file))
+        os.replace(tmp_path, path)
+        index = cls._build_index(path, tables)
+        cls.reset()
+        cls.__index = index
+
+    @classmethod
+    def prefetch(cls, path: typing.Optional[str] = None) -> None:
+        """Starts loading the usb id database in a background thread.
+
+        Lookups that are performed while the database is loading, wait at most `prefetch_timeout`
+        seconds. If the database is not loaded by then, they return no names. Nothing is done, if
+        the database is already loaded or loading.
+
+        Args:
+            path: Path to the usb id database. If None, the database is searched with
+                  `find_usb_ids`.
+        """
+        with cls.__lock:
+            if cls.__index is not None or cls.is_loading():
+                return
+            cls.__loader = threading.Thread(target=cls._load_in_background, args=(path,),
+                                            name="USBVendorDatabase.prefetch", daemon=True)
+            cls.__loader.start()
+
+    @classmethod
+    def _load_in_background(cls, path: typing.Optional[str]) -> None:
+        """Loads the usb id database. This is the target of the `prefetch` thread.
+
+        Args:
+            path: Path to the usb id database or None, to search it.
+        """
+        try:
+            loaded = cls.load(path)
+        except OSError:
+            loaded = False
+        if not loaded:
+            # No usb id database is available, so do not try it again
+            cls.__index = False
+
+    @classmethod
+    def is_loading(cls) -> bool:
+        """Returns True, if the usb id database is currently loaded in the background."""
+        loader = cls.__loader
+        return loader is not None and loader.is_alive()
+
+    @classmethod
+    def _ensure_loaded(cls) -> bool:
+        """Loads the usb id database, if it was not loaded yet.
+
+        If the database is loaded in the background, this function waits `prefetch_timeout`
+        seconds for it.
+
+        Returns:
+            bool: True, if the database is available. False, if there is no database or it is still
+                  loading in the background.
+        """
+        if cls.__index is None:
+            loader = cls.__loader
+            if loader is not None and loader.is_alive():
+                loader.join(cls.prefetch_timeout)
+                if loader.is_alive():
+                    return False
+            if cls.__index is None and not cls.load():
+                # No usb id database is available, so do not try it again
+                cls.__index = False
+        return bool(cls.__index)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Unloads the usb id database. It is loaded again on the next lookup."""
+        if cls.__index:
+            cls.__index.close()
+        cls.__index = None
+        cls.__names = {}
 
     @classmethod
     def get_vendor_product_name(cls, vendor_id: int, product_id: int) \
-            -> Tuple[Optional[str], Optional[str]]:
+            -> typing.Tuple[typing.Optional[str], typing.Optional[str]]:
         """Returns names for a specific combination of vendor and product id.
 
+        If the database was not loaded yet, it is loaded from a local file. No network access is
+        performed here. Use `update` to download the newest database. If the database is loaded in
+        the background (see `prefetch`), this function waits at most `prefetch_timeout` seconds.
+
         Args:
             vendor_id: Manufacturer id, defined by the USB committee.
             product_id: Model code, defined by the model's manufacturer.
@@ -62,21 +498,58 @@ class USBVendorDatabase:
         Returns:
             A tuple of two names. The first one for the vendor, the second one for the product.
         """
-        if not cls.__vendors:
-            cls.__vendors = cls._download_vendors()
-
-        vendor = None
-        product = None
-
+        if not isinstance(vendor_id, int):
+            # Without a vendor id there is nothing to look up, so the database is not loaded
+            return None, None
         try:
-            vendor = cls.__vendors[vendor_id][None]
-            product = cls.__vendors[vendor_id][product_id]
+            return cls.__names[vendor_id, product_id]
         except KeyError:
             pass
 
+        if not cls._ensure_loaded():
+            # Nothing is memoized here, so the names are found as soon as a database is loaded
+            return None, None
+
+        vendor = cls.__index.lookup(_USBIdIndex.VENDORS, vendor_id)
+        product = None
+        if vendor is not None and isinstance(product_id, int):
+            product = cls.__index.lookup(_USBIdIndex.PRODUCTS, (vendor_id << 16) | product_id)
+
+        cls.__names[vendor_id, product_id] = vendor, product
         return vendor, product
 
+    @classmethod
+    def get_class_names(cls, class_id: int, subclass_id: typing.Optional[int] = None,
+                        protocol_id: typing.Optional[int] = None) \
+            -> typing.Tuple[typing.Optional[str], typing.Optional[str], typing.Optional[str]]:
+        """Returns names for a specific combination of device class, subclass and protocol.
+
+        Args:
+            class_id: Device class code, defined by the USB committee.
+            subclass_id: Device subclass code or None, to only request the class name.
+            protocol_id: Device protocol code or None, to only request the class and subclass name.
+
+        Returns:
+            A tuple of three names for the class, the subclass and the protocol.
+        """
+        names = [None, None, None]
+        if not isinstance(class_id, int) or not cls._ensure_loaded():
+            return tuple(names)
+
+        names[0] = cls.__index.lookup(_USBIdIndex.CLASSES, class_id)
+        if names[0] is not None and isinstance(subclass_id, int):
+            names[1] = cls.__index.lookup(_USBIdIndex.SUBCLASSES, (class_id << 8) | subclass_id)
+            if names[1] is not None and isinstance(protocol_id, int):
+                names[2] = cls.__index.lookup(_USBIdIndex.PROTOCOLS, (class_id << 16) |
+                                              (subclass_id << 8) | protocol_id)
+        return tuple(names)
+
     @classmethod
     def __new__(cls, *args, **kwargs) -> None:
         # Do nothing, because this class is static
         return None
+
+
+if str(os.environ.get("DEVMAN_PREFETCH_USB_IDS", "")) in ["True", "1"]:
+    # Start loading the usb id database as soon as this module is imported
+    USBVendorDatabase.prefetch()
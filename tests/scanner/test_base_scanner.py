@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script for testing the module device_manager.scanner._base.
+
+This script tests the following entities:
+- class ScanDiff
+- class BaseDeviceScanner (single-flight scans, maximum age of scan results, indexes)
+- class BaseLANDeviceScanner (parser of the arp command's output)
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import threading
+import time
+import unittest
+import unittest.mock
+
+from device_manager.device import LANDevice, USBDevice
+from device_manager.scanner._base import BaseDeviceScanner, BaseLANDeviceScanner, ScanDiff
+
+
+class TestScanDiff(unittest.TestCase):
+    def test_compare(self):
+        devices = []
+        for address in ["/usb1", "/usb2", "/usb3"]:
+            device = USBDevice()
+            device.address = address
+            devices.append(device)
+        changed_device = USBDevice()
+        changed_device.address = "/usb2"
+
+        diff = ScanDiff.compare({"/usb1": devices[0], "/usb2": devices[1]},
+                                {"/usb1": devices[0], "/usb2": changed_device, "/usb3": devices[2]})
+        self.assertEqual(ScanDiff(devices=(devices[0], changed_device, devices[2]),
+                                  added=(devices[2],), removed=(), changed=(changed_device,)), diff)
+        diff = ScanDiff.compare({"/usb1": devices[0]}, {})
+        self.assertEqual(((), (), (devices[0],), ()), diff)
+
+
+class SlowDeviceScanner(BaseDeviceScanner):
+    """A device scanner whose scans block until they are released."""
+
+    def __init__(self):
+        super().__init__()
+        self.scan_count = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = None
+
+    def _scan(self, rescan):
+        if len(self._devices) > 0 and not rescan:
+            return self._devices
+        self.scan_count += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        device = USBDevice()
+        device.address = "/usb{}".format(self.scan_count)
+        self._devices = [device]
+        return tuple(self._devices)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_concurrently(self, scanner, count, function):
+        results = [None] * count
+
+        def run(index):
+            try:
+                results[index] = function()
+            except Exception as exc:
+                results[index] = exc
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        threads[0].start()
+        self.assertTrue(scanner.started.wait(5), msg="The scan was not started")
+        for thread in threads[1:]:
+            thread.start()
+        # Give the other threads the chance to join the running scan
+        time.sleep(0.1)
+        scanner.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_rescans(self):
+        scanner = SlowDeviceScanner()
+        results = self.run_concurrently(scanner, 20,
+                                        lambda: scanner.find_devices(rescan=True, address="/usb1"))
+        self.assertEqual(1, scanner.scan_count, msg="Concurrent rescans must share one scan")
+        for result in results:
+            self.assertEqual(1, len(result), msg="Each caller must get the result of the scan")
+            self.assertIs(results[0][0], result[0], msg="Each caller must get the same result")
+
+        self.assertIs(results[0][0], scanner.list_devices()[0], msg="The result was not cached")
+        scanner.list_devices(rescan=True)
+        self.assertEqual(2, scanner.scan_count, msg="A finished scan must not be shared")
+
+    def test_concurrent_errors(self):
+        scanner = SlowDeviceScanner()
+        scanner.error = OSError("scan failed")
+        results = self.run_concurrently(scanner, 5, lambda: scanner.list_devices(rescan=True))
+        self.assertEqual(1, scanner.scan_count, msg="Concurrent rescans must share one scan")
+        for result in results:
+            self.assertIs(scanner.error, result, msg="Each caller must get the error of the scan")
+
+        scanner.error = None
+        self.assertEqual(1, len(scanner.list_devices(rescan=True)),
+                         msg="A failed scan must not block later scans")
+
+    def test_nmap_done(self):
+        class NMAPDeviceScanner(BaseLANDeviceScanner):
+            def _get_arp_cache(self):
+                return {}
+
+        scanner = NMAPDeviceScanner()
+        with unittest.mock.patch.object(scanner, "_shared_scan") as shared_scan_mock:
+            scanner.nmap._notify_parent_done(True)
+        shared_scan_mock.assert_called_once_with(True)
+
+
+class CountingDeviceScanner(BaseDeviceScanner):
+    """A device scanner that counts its scans."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.scan_count = 0
+
+    def _scan(self, rescan):
+        if len(self._devices) > 0 and not rescan:
+            return self._devices
+        self.scan_count += 1
+        device = USBDevice()
+        device.address = "/usb{}".format(self.scan_count)
+        self._devices = [device]
+        return tuple(self._devices)
+
+
+class TestMaxAge(unittest.TestCase):
+    def test_max_age(self):
+        with unittest.mock.patch("device_manager.scanner._base.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            scanner = CountingDeviceScanner(max_age=0.5)
+            self.assertEqual(0.5, scanner.max_age, msg="Unexpected maximum age")
+            scanner.list_devices()
+            monotonic.return_value = 100.4
+            for _ in range(10):
+                scanner.find_devices(address="/usb1")
+            self.assertEqual(1, scanner.scan_count, msg="Recent results must be reused")
+
+            monotonic.return_value = 100.6
+            self.assertEqual("/usb2", scanner.list_devices()[0].address,
+                             msg="Results that are older than max_age must be refreshed")
+            self.assertEqual(2, scanner.scan_count, msg="Outdated results must be refreshed")
+
+            monotonic.return_value = 101.0
+            scanner.list_devices(max_age=1.0)
+            self.assertEqual(2, scanner.scan_count, msg="The argument max_age must be preferred")
+            scanner.find_devices(max_age=0.1, address="/usb3")
+            self.assertEqual(3, scanner.scan_count, msg="The argument max_age must be preferred")
+            scanner.list_devices(rescan=True)
+            self.assertEqual(4, scanner.scan_count, msg="A rescan must always scan")
+
+            scanner.max_age = None
+            monotonic.return_value = 1000.0
+            scanner.list_devices()
+            self.assertEqual(4, scanner.scan_count,
+                             msg="Without max_age, results must be used until a rescan")
+
+
+class StaticDeviceScanner(BaseDeviceScanner):
+    """A device scanner that returns a fixed list of devices."""
+
+    def __init__(self, devices):
+        super().__init__()
+        self._devices = list(devices)
+
+    def _scan(self, rescan):
+        return tuple(self._devices)
+
+
+class TestDeviceIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.devices = []
+        for i in range(6):
+            device = USBDevice()
+            device.address = "/usb{}".format(i)
+            device.address_aliases = ["/dev/bus/usb/001/{:03d}".format(i)]
+            device.vendor_id = 0x1234 + i % 2
+            device.product_id = 0x5678
+            device.serial = "SERIAL{}".format(i // 2)
+            self.devices.append(device)
+        for i in range(6):
+            device = LANDevice()
+            device.address = "192.168.1.{}".format(i)
+            device.address_aliases = ["fe80::{}".format(i)]
+            device.mac_address = "02:00:00:00:00:{:02X}".format(i // 2)
+            self.devices.append(device)
+        self.scanner = StaticDeviceScanner(self.devices)
+
+    def test_find(self):
+        filters = [{}, {"address": "/usb3"}, {"address": "/dev/bus/usb/001/004"},
+                   {"address": "fe80::2"}, {"address": "unknown"}, {"serial": "SERIAL1"},
+                   {"serial": None}, {"mac_address": "02-00-00-00-00-01"},
+                   {"mac_address": "02:00:00:00:00:01", "address": "192.168.1.3"},
+                   {"vendor_id": 0x1235, "product_id": 0x5678}, {"vendor_id": 0x1235},
+                   {"vendor_id": 0x1234, "product_id": 0x5678, "serial": "SERIAL2"},
+                   {"address": ["unhashable"]}, {"revision_id": None}]
+        for filter_set in filters:
+            expected = tuple(device for device in self.devices
+                             if BaseDeviceScanner._match_filters(device, **filter_set))
+            found = self.scanner.find_devices(**filter_set)
+            self.assertEqual(len(expected), len(found),
+                             msg="Unexpected number of devices for {}".format(filter_set))
+            for expected_device, device in zip(expected, found):
+                self.assertIs(expected_device, device,
+                              msg="Unexpected devices for {}".format(filter_set))
+        with self.assertRaises(TypeError, msg="An invalid mac address should raise an error"):
+            self.scanner.find_devices(mac_address="invalid")
+
+    def test_rebuild(self):
+        self.scanner.find_devices(serial="SERIAL0")
+        index = self.scanner._index
+        self.scanner.find_devices(address="/usb1")
+        self.assertIs(index, self.scanner._index, msg="The index must be reused for the same scan")
+
+        device = USBDevice()
+        device.address = "/usb9"
+        device.serial = "SERIAL9"
+        self.scanner._devices = [*self.devices[:3], device]
+        self.assertEqual((device,), self.scanner.find_devices(rescan=True, serial="SERIAL9"),
+                         msg="The index was not rebuilt after a new scan")
+        self.assertIsNot(index, self.scanner._index, msg="The index was not rebuilt")
+
+    def test_changed_in_place(self):
+        self.assertEqual((self.devices[1],), self.scanner.find_devices(address="/usb1"))
+        index = self.scanner._index
+
+        # The devices of the scan are changed by their users (like the device manager does)
+        self.devices[1].reset_addresses()
+        moved_device = USBDevice()
+        moved_device.address = "/usb9"
+        moved_device.serial = "SERIAL9"
+        self.devices[2].from_device(moved_device)
+        self.assertEqual((), self.scanner.find_devices(address="/usb1"),
+                         msg="A device without addresses must not be found by its old address")
+        self.assertEqual((self.devices[3],), self.scanner.find_devices(serial="SERIAL1"),
+                         msg="A device must not be found by its old serial number")
+        self.assertEqual((self.devices[2],), self.scanner.find_devices(address="/usb9"),
+                         msg="A device must be found by its new address")
+        self.assertEqual((self.devices[2],), self.scanner.find_devices(serial="SERIAL9"),
+                         msg="A device must be found by its new serial number")
+        self.assertIs(index, self.scanner._index, msg="The index must be reused for the same scan")
+
+
+class TestArpParser(unittest.TestCase):
+    @staticmethod
+    def make_lan_device(address, mac_address, aliases=None):
+        device = LANDevice()
+        device.address = address
+        device.address_aliases = aliases
+        device.mac_address = mac_address
+        return device
+
+    def test_linux_output(self):
+        output = "\n".join([
+            "Address                  HWtype  HWaddress           Flags Mask            Iface",
+            "192.168.10.14            ether   02:a7:71:36:9d:f2   C                     enp0s3",
+            "192.168.10.19                    12:62:8f:7c:de:2e   C                     enp0s3",
+            "192.168.10.84\tether   32.c3.f6.62.49.a6",
+            "192.168.10.175           ether   fD:95:57-02.2b-23   C                     enp0s3",
+            "192.168.10.177           ether   fd:95:57:02:2b:23   C                     enp0s3",
+            "192.168.10.175           ether   fd:95:57:02:2b:23   C                     enp0s8",
+            # Invalid lines ...
+            "192.168.10.203           ether                    ",
+            "192.168.10.209           ether   35:3c:a5:92:46:4Y   C                     enp0s3",
+            "192.168.10.210  abcdefg  ether   35:3c:a5:92:46:4c",
+            "192.168.10.211           ether   35:3c:a5:92:46:4c5",
+        ])
+        devices = BaseLANDeviceScanner._parse_arp_output(output, hardware_type=True)
+        self.assertEqual([self.make_lan_device("192.168.10.14", "02:a7:71:36:9d:f2"),
+                          self.make_lan_device("192.168.10.19", "12:62:8f:7c:de:2e"),
+                          self.make_lan_device("192.168.10.84", "32.c3.f6.62.49.a6"),
+                          self.make_lan_device("192.168.10.175", "fd:95:57:02:2b:23",
+                                               aliases=["192.168.10.177"])],
+                         list(devices.values()),
+                         msg="The output of \"arp -n\" was not parsed correctly")
+        self.assertEqual(list(devices), [dev.mac_address for dev in devices.values()],
+                         msg="The devices should be mapped by their formatted mac address")
+
+    def test_windows_output(self):
+        output = "\r\n".join([
+            "Interface: 192.168.1.98 --- 0x10",
+            "  Internet Address      Physical Address      Type",
+            "  192.168.1.1           01-f0-60-b4-da-10     dynamic",
+            "  192.168.1.3\td3-1e-52-7f-2d-81 dynamic",
+            "  192.168.1.7           03-83-65-cf-c4-cd",
+            "  192.168.1.255         ff-ff-ff-ff-ff-ff     static",
+            "",
+            "Interface: 192.168.20.27 --- 0x17",
+            "192.168.20.255        ff-ff-ff-ff-ff-ff     static",
+            # Invalid lines ...
+            "  192.168.24.10                               dynamic",
+            "  192.168.24            01-f0-61-b4-d9-10     dynamic",
+            "  192.168.24.251        d3-1G-53-7f-2f-82     dynamic",
+            "  192.168.24.252  abc   00-1a-53-7f-2f-82     dynamic",
+            ""
+        ])
+        devices = BaseLANDeviceScanner._parse_arp_output(output)
+        self.assertEqual([self.make_lan_device("192.168.1.1", "01-f0-60-b4-da-10"),
+                          self.make_lan_device("192.168.1.3", "d3-1e-52-7f-2d-81"),
+                          self.make_lan_device("192.168.1.7", "03-83-65-cf-c4-cd"),
+                          self.make_lan_device("192.168.1.255", "ff-ff-ff-ff-ff-ff",
+                                               aliases=["192.168.20.255"])],
+                         list(devices.values()),
+                         msg="The output of \"arp -a\" was not parsed correctly")
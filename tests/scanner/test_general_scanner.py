@@ -9,8 +9,12 @@ Authors:
     Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
 """
 
+import asyncio
+import threading
+import time
 import unittest
 import unittest.mock
+import warnings
 
 from device_manager.device import USBDevice, LANDevice, DeviceType
 from device_manager.scanner import DeviceScanner, USBDeviceScanner, LANDeviceScanner
@@ -40,3 +44,128 @@ class TestGeneralDeviceScanner(unittest.TestCase):
                       msg="DeviceScanner.scanners should contain None")
         self.assertIs(self.scanner, self.scanner[None],
                       msg="DeviceScanner.scanners[None] should return the self-object")
+
+    def test_async_scan(self):
+        scans = {device_type: 0 for device_type in self.device_types}
+        devices = {DeviceType.USB: (USBDevice(),), DeviceType.LAN: (LANDevice(),)}
+
+        def make_arescan(device_type):
+            async def arescan():
+                scans[device_type] += 1
+                # Give the other lookups the chance to join the running scan
+                await asyncio.sleep(0.01)
+                return devices[device_type]
+            return arescan
+
+        for device_type in self.device_types:
+            self.scanner[device_type]._arescan = make_arescan(device_type)
+
+        async def lookup():
+            return await asyncio.gather(*(self.scanner.alist_devices(rescan=True)
+                                          for _ in range(200)))
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(lookup())
+            for device_type in self.device_types:
+                self.assertEqual(1, scans[device_type],
+                                 msg="Concurrent lookups must share one scan per scanner")
+            for result in results:
+                self.assertSequenceEqual((*devices[DeviceType.USB], *devices[DeviceType.LAN]),
+                                         result, msg="Unexpected result of alist_devices")
+
+            found = loop.run_until_complete(self.scanner[DeviceType.LAN].afind_devices(
+                address="192.168.1.1"))
+            self.assertSequenceEqual(tuple(), found, msg="Unexpected result of afind_devices")
+            for device_type in self.device_types:
+                self.assertEqual(1, scans[device_type],
+                                 msg="Cached results must be used if rescan is False")
+
+            loop.run_until_complete(self.scanner.alist_devices(rescan=True))
+            for device_type in self.device_types:
+                self.assertEqual(2, scans[device_type],
+                                 msg="A finished scan must not be shared with later lookups")
+
+            loop.run_until_complete(self.scanner.alist_devices(max_age=60))
+            for device_type in self.device_types:
+                self.assertEqual(2, scans[device_type],
+                                 msg="Results of an asynchronous scan must be used until they are "
+                                     "older than the maximum age")
+            for device_type in self.device_types:
+                self.scan_mock[device_type].assert_not_called()
+        finally:
+            loop.close()
+
+    def test_concurrent_scan(self):
+        devices = {DeviceType.USB: (USBDevice(),), DeviceType.LAN: (LANDevice(),)}
+        barrier = threading.Barrier(len(self.device_types), timeout=5)
+
+        def make_scan(device_type):
+            def scan(rescan):
+                # Only passes, if all scanners are running at the same time
+                barrier.wait()
+                return devices[device_type]
+            return scan
+
+        for device_type in self.device_types:
+            self.scan_mock[device_type].side_effect = make_scan(device_type)
+        self.assertSequenceEqual((*devices[DeviceType.USB], *devices[DeviceType.LAN]),
+                                 self.scanner.list_devices(rescan=True),
+                                 msg="The results of the specific scanners were not merged")
+        for device_type in self.device_types:
+            self.scan_mock[device_type].assert_called_once_with(True)
+
+    def test_scan_timeout(self):
+        scanner = DeviceScanner(scan_timeout=0.1)
+        old_device = LANDevice()
+        scanner[DeviceType.LAN]._devices = [old_device]
+        scanner[DeviceType.USB]._scan = unittest.mock.MagicMock(return_value=(USBDevice(),))
+        scanner[DeviceType.LAN]._scan = unittest.mock.MagicMock(
+            side_effect=lambda rescan: time.sleep(1.0) or (LANDevice(),))
+
+        start = time.monotonic()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            devices = scanner.list_devices(rescan=True)
+        self.assertLess(time.monotonic() - start, 0.8,
+                        msg="The scan did not stop waiting for the slow scanner")
+        self.assertEqual(1, len(caught), msg="A timed out scanner should cause a warning")
+        self.assertEqual(2, len(devices), msg="Unexpected number of devices")
+        self.assertIs(old_device, devices[1],
+                      msg="The previous results of a timed out scanner should be used")
+
+    def test_hanging_scanner(self):
+        scanner = DeviceScanner(scan_timeout=0.1)
+        release = threading.Event()
+        usb_devices = [(USBDevice(),), (USBDevice(),)]
+        scanner[DeviceType.USB]._scan = unittest.mock.MagicMock(side_effect=usb_devices)
+        scanner[DeviceType.LAN]._scan = unittest.mock.MagicMock(
+            side_effect=lambda rescan: release.wait(5) and (LANDevice(),))
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                scanner.list_devices(rescan=True)
+                devices = scanner.list_devices(rescan=True)
+            self.assertEqual(2, len(caught), msg="Each timed out scan should cause a warning")
+            self.assertSequenceEqual(usb_devices[1], devices,
+                                     msg="The other scanners must not wait for the hanging one")
+            scanner[DeviceType.LAN]._scan.assert_called_once_with(True)
+        finally:
+            release.set()
+            scanner.close()
+
+    def test_cached_scan(self):
+        for device_type in self.device_types:
+            self.scanner[device_type]._devices = [USBDevice()]
+            self.scan_mock[device_type].return_value = tuple(self.scanner[device_type]._devices)
+        with unittest.mock.patch.object(self.scanner._executor, "submit") as submit_mock:
+            self.assertEqual(2, len(self.scanner.list_devices()),
+                             msg="Unexpected number of devices")
+            submit_mock.assert_not_called()
+
+    def test_close(self):
+        scanner = DeviceScanner()
+        scanner.list_devices(rescan=True)
+        scanner.close()
+        with self.assertRaises(RuntimeError, msg="A closed scanner must not scan anymore"):
+            scanner.list_devices(rescan=True)
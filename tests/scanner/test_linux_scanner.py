@@ -4,20 +4,27 @@
 
 This script tests the following entities:
 - class LinuxUSBDeviceScanner
+- class LinuxSysfsUSBDeviceScanner
 - class LinuxLANDeviceScanner
 
 Authors:
     Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
 """
 
+import asyncio
 import os
+import socket
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
 import unittest
 import unittest.mock
 
-from device_manager.device import USBDevice, LANDevice
-from device_manager.scanner import USBDeviceScanner, LANDeviceScanner
+from device_manager.device import DeviceType, USBDevice, LANDevice
+from device_manager.manager import DeviceManager
+from device_manager.scanner import USBDeviceScanner, LANDeviceScanner, _netlink
 
 
 @unittest.skipUnless(sys.platform == "linux", "Requires Linux")
@@ -48,10 +55,13 @@ class TestLinuxUSBDeviceScanner(unittest.TestCase):
             self.product_id = product_id
             self.revision_id = revision_id
             self.serial = serial
+            self.devnum = None
 
         @property
         def properties(self):
             properties = {}
+            if self.devnum is not None:
+                properties["DEVNUM"] = "{:03d}".format(self.devnum)
             if self.name is not None:
                 properties["DEVNAME"] = self.name
             if self.subsystem is not None:
@@ -120,7 +130,7 @@ class TestLinuxUSBDeviceScanner(unittest.TestCase):
         self.context_mock.reset()
 
         devices = self.scanner.list_devices(rescan=True)
-        self.context_mock.assert_called_once_with()
+        self.context_mock.assert_called_once_with(subsystem="usb")
 
         for dev in self.valid_devices:
             self.assertIn(dev.device, devices)
@@ -159,11 +169,270 @@ class TestLinuxUSBDeviceScanner(unittest.TestCase):
         finally:
             # Reset return value
             self.context_mock.return_value = old_return_value
-        self.context_mock.assert_called_once_with()
+        self.context_mock.assert_called_once_with(subsystem="usb")
         self.assertSequenceEqual((self.valid_devices[0].device,), rescan_devices,
                                  msg="A forced rescan with Win32USBDeviceScanner should return "
                                      "other values than before")
 
+    def test_monitor(self):
+        import pyudev
+
+        class FakeMonitorObserver:
+            """Replaces pyudev.MonitorObserver, so the test can emit udev events."""
+            instances = []
+
+            def __init__(self, monitor, callback=None, **kwargs):
+                self.monitor = monitor
+                self.callback = callback
+                self.started = False
+                self.stopped = False
+                self.instances.append(self)
+
+            def start(self):
+                self.started = True
+
+            def send_stop(self):
+                self.stopped = True
+
+            def emit(self, action, raw_device):
+                raw_device.action = action
+                self.callback(raw_device)
+
+        fake_monitor = unittest.mock.MagicMock(spec=pyudev.Monitor)
+        with unittest.mock.patch.object(pyudev, "MonitorObserver", FakeMonitorObserver):
+            self.scanner.start_monitor(fake_monitor)
+        observer = FakeMonitorObserver.instances[-1]
+        self.assertTrue(self.scanner.monitoring)
+        self.assertTrue(observer.started, msg="The observer thread was not started")
+        self.assertIs(fake_monitor, observer.monitor)
+        self.context_mock.assert_called_once_with(subsystem="usb")
+
+        devices = self.scanner.list_devices(rescan=True)
+        self.context_mock.assert_called_once_with(subsystem="usb")
+        self.assertCountEqual([dev.device for dev in self.valid_devices], devices,
+                              msg="The live table should contain all enumerated devices")
+
+        # A new device is connected
+        new_device = self.MockPyudevDevice("/sys/devices/pci0000:00/0000:00:06.0/usb9", "usb",
+                                           "/dev/bus/usb/009/001", 0x4321, 0x8765, 0x0100,
+                                           "NEWDEVICE", pyudev.Device)
+        observer.emit("add", new_device)
+        found_devices = self.scanner.find_devices(rescan=True, serial="NEWDEVICE")
+        self.assertSequenceEqual((new_device.device,), found_devices,
+                                 msg="An added device should be found without rescanning")
+
+        # A device changes its properties
+        new_device.revision_id = 0x0200
+        observer.emit("change", new_device)
+        found_devices = self.scanner.find_devices(rescan=True, serial="NEWDEVICE")
+        self.assertEqual(0x0200, found_devices[0].revision_id,
+                         msg="A changed device should be updated in the live table")
+
+        # Devices are disconnected
+        observer.emit("remove", new_device)
+        observer.emit("remove", self.valid_devices[0])
+        devices = self.scanner.list_devices(rescan=True)
+        self.assertCountEqual([dev.device for dev in self.valid_devices[1:]], devices,
+                              msg="Removed devices should not be in the live table anymore")
+
+        # Events of devices that are no usb devices are ignored
+        observer.emit("add", self.invalid_devices[0])
+        self.assertEqual(len(self.valid_devices) - 1, len(self.scanner.list_devices(rescan=True)))
+        self.context_mock.assert_called_once_with(subsystem="usb")
+
+        self.scanner.stop_monitor()
+        self.assertTrue(observer.stopped, msg="The observer thread was not stopped")
+        self.assertFalse(self.scanner.monitoring)
+        self.scanner.list_devices(rescan=True)
+        self.assertEqual(2, self.context_mock.call_count,
+                         msg="Without monitor, a rescan should enumerate the devices again")
+
+    def test_incremental_scan(self):
+        import pyudev
+
+        for devnum, dev in enumerate(self.valid_devices, start=1):
+            dev.devnum = devnum
+        devices = self.scanner.list_devices(rescan=True)
+        self.assertCountEqual(devices, self.scanner.last_diff.added,
+                              msg="All devices of the first scan should be reported as added")
+
+        self.scanner._scan_time = None
+        device_from_raw = USBDeviceScanner._device_from_raw
+        with unittest.mock.patch.object(USBDeviceScanner, "_device_from_raw",
+                                        wraps=device_from_raw) as device_from_raw_mock:
+            diff = self.scanner.scan_changes()
+        for call in device_from_raw_mock.call_args_list:
+            self.assertNotIn(call[0][0], self.valid_devices,
+                             msg="Unchanged devices should not be converted again")
+        self.assertEqual(((), (), ()), (diff.added, diff.removed, diff.changed))
+        self.assertFalse(self.scanner._is_stale(60),
+                         msg="scan_changes should update the time of the last scan")
+        for old_dev, new_dev in zip(devices, diff.devices):
+            self.assertIs(old_dev, new_dev, msg="Unchanged devices should be reused")
+
+        # One device is reconnected with another revision, one is removed and one is added
+        changed_device = self.valid_devices[0]
+        changed_device.revision_id = 0x0200
+        changed_device.devnum = 42
+        removed_device = self.valid_devices[1]
+        new_device = self.MockPyudevDevice("/sys/devices/pci0000:00/0000:00:06.0/usb9", "usb",
+                                           "/dev/bus/usb/009/001", 0x4321, 0x8765, 0x0100,
+                                           "NEWDEVICE", pyudev.Device)
+        self.context_mock.return_value = [changed_device, *self.valid_devices[2:], new_device]
+        diff = self.scanner.scan_changes()
+        self.assertSequenceEqual((new_device.device,), diff.added)
+        self.assertSequenceEqual((removed_device.device,), diff.removed)
+        self.assertSequenceEqual((changed_device.device,), diff.changed)
+        self.assertEqual(0x0200, diff.changed[0].revision_id)
+        self.assertIs(diff, self.scanner.last_diff)
+        self.assertSequenceEqual(diff.devices, self.scanner.list_devices())
+        for dev in devices[2:]:
+            self.assertIn(dev, diff.devices)
+            self.assertTrue(any(dev is new_dev for new_dev in diff.devices),
+                            msg="Unchanged devices should be reused")
+
+    def test_reset_and_rescan(self):
+        for devnum, dev in enumerate(self.valid_devices, start=1):
+            dev.devnum = devnum
+        device = self.scanner.find_devices(rescan=True, address=self.valid_devices[0].path)[0]
+        device.reset_addresses()
+        self.scanner.scan_changes()
+        self.assertEqual(self.valid_devices[0].path,
+                         self.scanner.find_devices(serial=self.valid_devices[0].serial)[0].address,
+                         msg="A modified device must not be reused by a rescan")
+
+        manager = DeviceManager(lazy_init=True)
+        manager.scanner[DeviceType.USB]._context.list_devices = self.context_mock
+        manager["x", "usb"] = self.valid_devices[0].path
+        manager.reset_addresses()
+        self.assertEqual(self.valid_devices[0].path, manager["x", "usb"].address,
+                         msg="The address of a reset device was not found again")
+
+    def test_usb_device_only(self):
+        scanner = USBDeviceScanner(usb_device_only=True)
+        scanner._context.list_devices = self.context_mock
+        scanner.list_devices(rescan=True)
+        self.context_mock.assert_called_once_with(subsystem="usb", DEVTYPE="usb_device")
+
+    def test_monitor_option(self):
+        with unittest.mock.patch.object(USBDeviceScanner, "start_monitor") as start_monitor_mock:
+            USBDeviceScanner()
+            start_monitor_mock.assert_not_called()
+            USBDeviceScanner(usb_monitor=True)
+            start_monitor_mock.assert_called_once_with()
+
+    def test_lazy_context(self):
+        import pyudev
+
+        with unittest.mock.patch.object(pyudev, "Context") as context_mock:
+            scanner = USBDeviceScanner()
+            context_mock.assert_not_called()
+            self.assertIs(context_mock.return_value, scanner._context,
+                          msg="The udev context was not created on first use")
+            self.assertIs(context_mock.return_value, scanner._context,
+                          msg="The udev context must only be created once")
+            context_mock.assert_called_once_with()
+
+
+@unittest.skipUnless(sys.platform == "linux", "Requires Linux")
+class TestLinuxSysfsUSBDeviceScanner(unittest.TestCase):
+    @staticmethod
+    def make_usb_device(address, alias, vendor_id, product_id, revision_id, serial):
+        device = USBDevice()
+        device.address = address
+        device.address_aliases = [alias]
+        device.vendor_id = vendor_id
+        device.product_id = product_id
+        device.revision_id = revision_id
+        device.serial = serial
+        return device
+
+    def make_sysfs_entry(self, name, device_path, **attributes):
+        """Creates a device directory with attribute files and links it into bus/usb/devices."""
+        path = os.path.join(self.sysfs_path, device_path.lstrip("/"))
+        os.makedirs(path)
+        for attribute, value in attributes.items():
+            with open(os.path.join(path, attribute), "w") as file:
+                file.write(value + "\n")
+        os.symlink(os.path.relpath(path, self.bus_path), os.path.join(self.bus_path, name))
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.sysfs_path = temp_dir.name
+        self.bus_path = os.path.join(self.sysfs_path, "bus", "usb", "devices")
+        os.makedirs(self.bus_path)
+
+        root = "/devices/pci0000:00/0000:00:14.0"
+        self.make_sysfs_entry("usb1", root + "/usb1", idVendor="1d6b", idProduct="0002",
+                              bcdDevice="0504", serial="0000:00:14.0", busnum="1", devnum="1")
+        self.make_sysfs_entry("1-2", root + "/usb1/1-2", idVendor="0403", idProduct="6001",
+                              bcdDevice="0600", serial="A50285BI", busnum="1", devnum="12")
+        self.make_sysfs_entry("1-3", root + "/usb1/1-3", idVendor="046d", idProduct="c077",
+                              busnum="1", devnum="4")
+        # Interfaces and entries without vendor id are no usb devices
+        self.make_sysfs_entry("1-2:1.0", root + "/usb1/1-2/1-2:1.0", bInterfaceClass="ff")
+        self.make_sysfs_entry("1-4", root + "/usb1/1-4", busnum="1", devnum="5")
+
+        self.expected_result = [
+            self.make_usb_device(root + "/usb1", "/dev/bus/usb/001/001", 0x1d6b, 0x0002, 0x0504,
+                                 "0000:00:14.0"),
+            self.make_usb_device(root + "/usb1/1-2", "/dev/bus/usb/001/012", 0x0403, 0x6001,
+                                 0x0600, "A50285BI"),
+            self.make_usb_device(root + "/usb1/1-3", "/dev/bus/usb/001/004", 0x046d, 0xc077,
+                                 None, None),
+        ]
+
+        from device_manager.scanner._linux import LinuxSysfsUSBDeviceScanner
+        self.scanner = LinuxSysfsUSBDeviceScanner(sysfs_path=self.sysfs_path)
+
+    def test_scan(self):
+        devices = self.scanner.list_devices()
+        self.assertCountEqual(self.expected_result, devices,
+                              msg="The devices read from sysfs are not as expected")
+
+        found_devices = self.scanner.find_devices(serial="A50285BI")
+        self.assertSequenceEqual((self.expected_result[1],), found_devices,
+                                 msg="The device which was searched by its serial was not found")
+
+        # Devices are only read again, when rescanning
+        self.make_sysfs_entry("1-5", "/devices/pci0000:00/0000:00:14.0/usb1/1-5", idVendor="0001",
+                              idProduct="7778", busnum="1", devnum="6")
+        self.assertEqual(3, len(self.scanner.list_devices()))
+        self.assertEqual(4, len(self.scanner.list_devices(rescan=True)))
+
+    def test_same_as_udev(self):
+        import pyudev
+
+        # Device as it is provided by udev
+        raw_device = unittest.mock.Mock(spec=pyudev.Device)
+        raw_device.device_path = "/devices/pci0000:00/0000:00:14.0/usb1/1-2"
+        raw_device.properties = {"SUBSYSTEM": "usb", "DEVNAME": "/dev/bus/usb/001/012",
+                                 "ID_VENDOR_ID": "0403", "ID_MODEL_ID": "6001",
+                                 "ID_REVISION": "0600", "ID_SERIAL_SHORT": "A50285BI"}
+
+        self.assertEqual(USBDeviceScanner._device_from_raw(raw_device),
+                         self.scanner.find_devices(serial="A50285BI")[0],
+                         msg="Reading sysfs directly should give the same result as udev")
+
+    def test_missing_sysfs(self):
+        from device_manager.scanner._linux import LinuxSysfsUSBDeviceScanner
+
+        scanner = LinuxSysfsUSBDeviceScanner(sysfs_path=os.path.join(self.sysfs_path, "missing"))
+        self.assertSequenceEqual(tuple(), scanner.list_devices())
+
+    def test_backend_option(self):
+        from device_manager.scanner import DeviceScanner
+        from device_manager.scanner._linux import LinuxSysfsUSBDeviceScanner
+
+        self.assertIsInstance(DeviceScanner()["usb"], USBDeviceScanner)
+        self.assertIsInstance(DeviceScanner(usb_backend="udev")["usb"], USBDeviceScanner)
+        scanner = DeviceScanner(usb_backend="sysfs", sysfs_path=self.sysfs_path)
+        self.assertIsInstance(scanner["usb"], LinuxSysfsUSBDeviceScanner)
+        self.assertCountEqual(self.expected_result, scanner["usb"].list_devices())
+        with self.assertRaises(ValueError, msg="An unknown usb backend should not be accepted"):
+            DeviceScanner(usb_backend="invalid")
+
 
 @unittest.skipUnless(sys.platform == "linux", "Requires Linux")
 class TestLinuxLANDeviceScanner(unittest.TestCase):
@@ -184,7 +453,7 @@ class TestLinuxLANDeviceScanner(unittest.TestCase):
         return device
 
     def setUp(self) -> None:
-        self.scanner = LANDeviceScanner()
+        self.scanner = LANDeviceScanner(arp_source="arp")
 
         self.arp_output = os.linesep.encode().join([
             b"Address                  HWtype  HWaddress           Flags Mask            Iface",
@@ -229,7 +498,9 @@ class TestLinuxLANDeviceScanner(unittest.TestCase):
         type(self.popen_mock).returncode = self.popen_returncode_mock
         self.popen_init_mock = unittest.mock.MagicMock(return_value=self.popen_mock)
 
-        setattr(subprocess, "Popen", self.popen_init_mock)
+        popen_patch = unittest.mock.patch.object(subprocess, "Popen", self.popen_init_mock)
+        popen_patch.start()
+        self.addCleanup(popen_patch.stop)
         self.popen_init_args = (["arp", "-n"],)
         self.popen_init_kwargs = {"bufsize": 100000,
                                   "stdin": subprocess.PIPE,
@@ -246,7 +517,7 @@ class TestLinuxLANDeviceScanner(unittest.TestCase):
         self.popen_init_mock.assert_called_once_with(*self.popen_init_args,
                                                      **self.popen_init_kwargs)
         self.popen_returncode_mock.assert_called_once_with()
-        self.popen_communicate_mock.assert_called_once_with()
+        self.popen_communicate_mock.assert_called_once_with(timeout=10.0)
         self.assertEqual(tuple(self.expected_result), devices,
                          msg="LANDeviceScanner.list_devices did not return the expected values")
 
@@ -307,3 +578,195 @@ class TestLinuxLANDeviceScanner(unittest.TestCase):
                                    "should raise an exception"):
             devices = self.scanner.list_devices(rescan=True)
         self.popen_init_mock.side_effect = old_side_effect
+
+    def test_timeout(self):
+        devices = self.scanner.list_devices()
+
+        # The arp command hangs: It is killed and the previous results are used
+        self.popen_mock.kill = unittest.mock.MagicMock()
+        self.popen_communicate_mock.side_effect = [subprocess.TimeoutExpired(["arp", "-n"], 10.0),
+                                                   (b"", b"")]
+        with self.assertWarns(UserWarning):
+            rescan_devices = self.scanner.list_devices(rescan=True)
+        self.popen_mock.kill.assert_called_once_with()
+        self.assertEqual(devices, rescan_devices,
+                         msg="After a timeout, the previous results should be returned")
+
+        scanner = LANDeviceScanner(arp_source="arp", command_timeout=0.5)
+        self.popen_communicate_mock.reset_mock(side_effect=True)
+        scanner.list_devices()
+        self.popen_communicate_mock.assert_called_once_with(timeout=0.5)
+
+    def test_proc_arp(self):
+        proc_arp = b"\n".join([
+            b"IP address       HW type     Flags       HW address            Mask     Device",
+            b"192.168.10.14    0x1         0x2         02:a7:71:36:9d:f2     *        enp0s3",
+            b"192.168.10.18    0x1         0x6         f3:85:9f:98:e8:21     *        enp0s3",
+            b"192.168.10.19    0x1         0x2         12:62:8f:7c:de:2e     *        enp0s8",
+            b"192.168.10.175   0x1         0x2         fd:95:57:02:2b:23     *        enp0s3",
+            b"192.168.10.177   0x1         0x2         fd:95:57:02:2b:23     *        enp0s3",
+            # Incomplete entry and invalid lines
+            b"192.168.10.20    0x1         0x0         00:00:00:00:00:00     *        enp0s3",
+            b"192.168.10.21    0x1         0x2         35:3c:a5:92:46:4Y     *        enp0s3",
+            b"192.168.10.22    0x1",
+            b""
+        ])
+        with tempfile.NamedTemporaryFile(suffix=".arp", delete=False) as file:
+            file.write(proc_arp)
+        self.addCleanup(os.remove, file.name)
+
+        scanner = LANDeviceScanner(proc_arp_path=file.name)
+        devices = scanner.list_devices()
+        self.popen_init_mock.assert_not_called()
+        self.assertEqual((self.make_lan_device("192.168.10.14", "02:a7:71:36:9d:f2"),
+                          self.make_lan_device("192.168.10.18", "f3:85:9f:98:e8:21"),
+                          self.make_lan_device("192.168.10.19", "12:62:8f:7c:de:2e"),
+                          self.make_lan_device("192.168.10.175", "fd:95:57:02:2b:23",
+                                               aliases=["192.168.10.177"])), devices,
+                         msg="The arp table was not read correctly from procfs")
+
+        # Without procfs, the arp command is used
+        scanner = LANDeviceScanner(proc_arp_path=file.name + ".missing")
+        devices = scanner.list_devices()
+        self.popen_init_mock.assert_called_once_with(*self.popen_init_args,
+                                                     **self.popen_init_kwargs)
+        self.assertEqual(tuple(self.expected_result), devices)
+
+    def test_ip_neigh(self):
+        self.popen_communicate_mock.return_value = (b"\n".join([
+            b"192.168.10.14 dev enp0s3 lladdr 02:a7:71:36:9d:f2 REACHABLE",
+            b"192.168.10.1 dev enp0s3 lladdr f3:85:9f:98:e8:21 router STALE",
+            b"192.168.10.30 dev enp0s3  FAILED",
+            b"fe80::10a7:71ff:fe36:9df2 dev enp0s3 lladdr 02:a7:71:36:9d:f2 STALE",
+            b""
+        ]), b"")
+
+        scanner = LANDeviceScanner(arp_source="ip")
+        devices = scanner.list_devices()
+        self.popen_init_mock.assert_called_once_with(["ip", "neigh", "show"],
+                                                     **self.popen_init_kwargs)
+        self.assertEqual((self.make_lan_device("192.168.10.14", "02:a7:71:36:9d:f2",
+                                               aliases=["fe80::10a7:71ff:fe36:9df2"]),
+                          self.make_lan_device("192.168.10.1", "f3:85:9f:98:e8:21")), devices,
+                         msg="The output of \"ip neigh\" was not parsed correctly")
+
+        with self.assertRaises(ValueError, msg="An unknown arp source should not be accepted"):
+            LANDeviceScanner(arp_source="invalid")
+
+    def test_async_ip_neigh(self):
+        output = b"\n".join([
+            b"192.168.10.14 dev enp0s3 lladdr 02:a7:71:36:9d:f2 REACHABLE",
+            b"192.168.10.30 dev enp0s3  FAILED",
+            b""
+        ])
+        commands = []
+
+        async def arun_command(args, timeout=None, cancel=None):
+            commands.append((args, timeout))
+            await asyncio.sleep(0.01)
+            return 0, output, b""
+
+        async def lookup():
+            return await asyncio.gather(*(scanner.alist_devices(rescan=True) for _ in range(50)))
+
+        scanner = LANDeviceScanner(arp_source="ip", command_timeout=2.5)
+        loop = asyncio.new_event_loop()
+        try:
+            with unittest.mock.patch("device_manager.scanner._base.arun_command", arun_command):
+                results = loop.run_until_complete(lookup())
+        finally:
+            loop.close()
+        self.assertEqual([(["ip", "neigh", "show"], 2.5)], commands,
+                         msg="Concurrent lookups must share one asyncio subprocess")
+        for devices in results:
+            self.assertEqual((self.make_lan_device("192.168.10.14", "02:a7:71:36:9d:f2"),), devices,
+                             msg="The output of \"ip neigh\" was not parsed correctly")
+        self.popen_init_mock.assert_not_called()
+
+    @staticmethod
+    def make_neighbor_message(address, mac_address=None, state=0x02, deleted=False):
+        """Builds a netlink message (RTM_NEWNEIGH or RTM_DELNEIGH) for an IPv4 neighbor."""
+        attributes = struct.pack("=HH", 8, 1) + socket.inet_aton(address)
+        if mac_address is not None:
+            attributes += struct.pack("=HH", 10, 2) + bytes.fromhex(mac_address.replace(":", ""))
+            attributes += b"\0\0"
+        body = struct.pack("=BBHiHBB", socket.AF_INET, 0, 0, 2, state, 0, 1) + attributes
+        return struct.pack("=LHHLL", 16 + len(body), 29 if deleted else 28, 0, 0, 0) + body
+
+    def test_monitor(self):
+        events = []
+
+        class FakeSocket:
+            """Replays the events, after the test allowed it."""
+            def __init__(self):
+                self.ready = threading.Event()
+
+            def recv(self, buffer_size):
+                self.ready.wait(5)
+                return events.pop(0) if events else b""
+
+        # The neighbor table is dumped via rtnetlink, which also contains IPv6 neighbors
+        dump = [_netlink.NeighborEntry(socket.AF_INET, address, dev.mac_address, 2,
+                                       _netlink.NUD_REACHABLE)
+                for dev in self.expected_result for address in dev.all_addresses]
+        dump.append(_netlink.NeighborEntry(socket.AF_INET6, "fe80::10a7:71ff:fe36:9df2",
+                                           "02:A7:71:36:9D:F2", 2, _netlink.NUD_STALE))
+        event_source = FakeSocket()
+        with unittest.mock.patch.object(_netlink, "dump_neighbors",
+                                        return_value=dump) as dump_neighbors_mock:
+            self.scanner.start_monitor(event_source)
+        self.assertTrue(self.scanner.monitoring)
+        dump_neighbors_mock.assert_called_once_with(None)
+        self.popen_init_mock.assert_not_called()
+        devices = self.scanner.list_devices()
+        self.assertEqual(("192.168.10.14", "fe80::10a7:71ff:fe36:9df2"), devices[0].all_addresses,
+                         msg="The live table should contain the IPv6 neighbors of the dump")
+        self.assertEqual(tuple(self.expected_result[1:]), devices[1:])
+
+        # As long as the live table does not change, the devices (and their index) are reused
+        with unittest.mock.patch.object(LANDeviceScanner, "_get_arp_cache") as get_arp_cache_mock:
+            self.scanner.find_devices(rescan=True, mac_address="02:a7:71:36:9d:f2")
+            self.scanner.find_devices(mac_address="f3:85:9f:98:e8:21")
+        get_arp_cache_mock.assert_not_called()
+        index = self.scanner._index
+        self.scanner.find_devices(address="192.168.10.18")
+        self.assertIs(index, self.scanner._index, msg="The index should not be rebuilt")
+
+        events.extend([
+            # New neighbor and a new address of a known neighbor
+            self.make_neighbor_message("192.168.10.50", "aa:bb:cc:dd:ee:ff"),
+            self.make_neighbor_message("192.168.10.51", "02:a7:71:36:9d:f2"),
+            # Only the state of a neighbor changed
+            self.make_neighbor_message("192.168.10.18", "f3:85:9f:98:e8:21", state=0x04),
+            # Removed neighbors: one is deleted, the other failed
+            self.make_neighbor_message("192.168.10.19", "12:62:8f:7c:de:2e", deleted=True),
+            self.make_neighbor_message("192.168.10.36", state=0x20),
+            # The address of the primary address moved to another device
+            self.make_neighbor_message("192.168.10.175", "aa:bb:cc:dd:ee:ff"),
+        ])
+        event_source.ready.set()
+        self.scanner._neighbor_monitor.join(5)
+
+        devices = {dev.mac_address: dev for dev in self.scanner.find_devices()}
+        self.popen_init_mock.assert_not_called()
+        self.assertNotIn("12:62:8F:7C:DE:2E", devices)
+        self.assertNotIn("DE:EA:F1:17:8C:5C", devices)
+        self.assertEqual(("192.168.10.14", "fe80::10a7:71ff:fe36:9df2", "192.168.10.51"),
+                         devices["02:A7:71:36:9D:F2"].all_addresses)
+        self.assertEqual(("192.168.10.18",), devices["F3:85:9F:98:E8:21"].all_addresses)
+        self.assertEqual(("192.168.10.177",), devices["FD:95:57:02:2B:23"].all_addresses)
+        self.assertEqual(("192.168.10.50", "192.168.10.175"),
+                         devices["AA:BB:CC:DD:EE:FF"].all_addresses)
+
+        self.scanner.stop_monitor()
+        self.assertFalse(self.scanner.monitoring)
+        self.scanner.list_devices(rescan=True)
+        self.assertEqual(1, self.popen_init_mock.call_count,
+                         msg="Without monitor, a rescan should read the arp cache again")
+
+    def test_monitor_option(self):
+        with unittest.mock.patch.object(LANDeviceScanner, "start_monitor") as start_monitor_mock:
+            LANDeviceScanner()
+            start_monitor_mock.assert_not_called()
+            LANDeviceScanner(neighbor_monitor=True)
+            start_monitor_mock.assert_called_once_with()
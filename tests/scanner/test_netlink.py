@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script for testing the module device_manager.scanner._netlink.
+
+This script tests the following entities:
+- class NeighborEntry
+- function build_neighbor_request
+- function parse_neighbor_messages
+- function dump_neighbors
+- class NeighborMonitor
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import errno
+import socket
+import sys
+import unittest
+
+from device_manager.device import LANDevice
+from device_manager.scanner import _netlink
+
+# Response to a RTM_GETNEIGH dump request recorded on a linux system: a NOARP entry of the loopback
+# interface, a STALE IPv4 neighbor, two IPv6 multicast entries and NLMSG_DONE
+RECORDED_DUMP = bytes.fromhex(
+    "4c0000001c00020001000000d71e000002000000010000004000000308000100000000000a000200000000000000"
+    "00000800040000000000140003000a0000008da701008da70100000000004c0000001c00020001000000d71e0000"
+    "02000000040000000400000108000100c00002010a00020002fc0000000500000800040001000000140003008d12"
+    "0100871d01005407010000000000580000001c00020001000000d71e00000a000000040000004000000514000100"
+    "ff0200000000000000000001ff0000010a0002003333ff0000010000080004000000000014000300a5c0010035a9"
+    "010035a9010000000000580000001c00020001000000d71e00000a000000040000004000000514000100ff020000"
+    "0000000000000000000000160a0002003333000000160000080004000000000014000300b0c0010040a9010040a9"
+    "010000000000140000000300020001000000d71e000000000000")
+# A REACHABLE IPv6 neighbor and an INCOMPLETE IPv4 neighbor without link layer address
+IPV6_MESSAGES = bytes.fromhex(
+    "3c0000001c00020001000000d71e00000a000000040000000200000114000100fe8000000000000000fc00fffe00"
+    "00050a00020002fc000000050000240000001c00020001000000d71e000002000000040000000100000108000100"
+    "c0000207")
+# A removed IPv4 neighbor (RTM_DELNEIGH)
+DELETE_MESSAGE = bytes.fromhex(
+    "300000001d00020001000000d71e000002000000040000002000000108000100c00002010a00020002fc00000005"
+    "0000")
+# NLMSG_ERROR with errno EPERM
+ERROR_MESSAGE = bytes.fromhex(
+    "24000000020000000100000000000000ffffffff00000000000000000000000000000000")
+
+
+class TestNetlink(unittest.TestCase):
+    class FakeSocket:
+        """Replays recorded netlink responses."""
+
+        def __init__(self, *chunks):
+            self.chunks = list(chunks)
+            self.sent = []
+
+        def send(self, data):
+            self.sent.append(data)
+            return len(data)
+
+        def recv(self, buffer_size):
+            return self.chunks.pop(0) if self.chunks else b""
+
+    def test_request(self):
+        request = _netlink.build_neighbor_request(sequence=7)
+        self.assertEqual(28, len(request))
+        self.assertEqual(bytes.fromhex("1c0000001e0001030700000000000000"  # nlmsghdr
+                                       "000000000000000000000000"), request,  # ndmsg
+                         msg="The RTM_GETNEIGH dump request is not as expected")
+
+    def test_parse(self):
+        entries, done = _netlink.parse_neighbor_messages(RECORDED_DUMP)
+        self.assertTrue(done, msg="NLMSG_DONE was not detected")
+        self.assertEqual(4, len(entries))
+        self.assertEqual(_netlink.NeighborEntry(socket.AF_INET, "192.0.2.1", "02:FC:00:00:00:05",
+                                                4, _netlink.NUD_STALE), entries[1])
+        self.assertEqual(("ff02::1:ff00:1", socket.AF_INET6, "33:33:FF:00:00:01"),
+                         (entries[2].address, entries[2].family, entries[2].mac))
+        self.assertEqual([False, True, False, False], [entry.valid for entry in entries],
+                         msg="NOARP entries should not be valid neighbors")
+
+        entries, done = _netlink.parse_neighbor_messages(IPV6_MESSAGES)
+        self.assertFalse(done)
+        self.assertEqual(_netlink.NeighborEntry(socket.AF_INET6, "fe80::fc:ff:fe00:5",
+                                                "02:FC:00:00:00:05", 4, _netlink.NUD_REACHABLE),
+                         entries[0])
+        self.assertTrue(entries[0].valid)
+        self.assertEqual(("192.0.2.7", None), (entries[1].address, entries[1].mac))
+        self.assertFalse(entries[1].valid, msg="Incomplete entries should not be valid neighbors")
+
+        entries, _ = _netlink.parse_neighbor_messages(DELETE_MESSAGE)
+        self.assertTrue(entries[0].deleted)
+
+    def test_parse_errors(self):
+        with self.assertRaises(OSError) as context:
+            _netlink.parse_neighbor_messages(ERROR_MESSAGE)
+        self.assertEqual(1, context.exception.errno)
+        with self.assertRaises(ValueError, msg="Truncated messages should not be accepted"):
+            _netlink.parse_neighbor_messages(RECORDED_DUMP[:100])
+
+    def test_dump(self):
+        sock = self.FakeSocket(IPV6_MESSAGES, RECORDED_DUMP)
+        entries = _netlink.dump_neighbors(sock)
+        self.assertEqual([_netlink.build_neighbor_request()], sock.sent)
+        self.assertEqual(6, len(entries), msg="The dump should be read until NLMSG_DONE")
+
+    def test_monitor(self):
+        class OverflowingSocket(self.FakeSocket):
+            def recv(self, buffer_size):
+                data = super().recv(buffer_size)
+                if isinstance(data, Exception):
+                    raise data
+                return data
+
+        events = []
+        resyncs = []
+        sock = OverflowingSocket(IPV6_MESSAGES, OSError(errno.ENOBUFS, "No buffer space"),
+                                 DELETE_MESSAGE)
+        monitor = _netlink.NeighborMonitor(events.append, sock, resync=lambda: resyncs.append(1))
+        monitor.start()
+        monitor.join(5)
+        self.assertFalse(monitor.running, msg="The monitor should stop, when there are no events")
+        self.assertEqual(["fe80::fc:ff:fe00:5", "192.0.2.7", "192.0.2.1"],
+                         [entry.address for entry in events])
+        self.assertEqual([False, False, True], [entry.deleted for entry in events])
+        self.assertEqual(1, len(resyncs), msg="Lost events should trigger a resync")
+        monitor.stop()
+
+    @unittest.skipUnless(sys.platform == "linux", "Requires Linux")
+    def test_lan_scanner(self):
+        from device_manager.scanner._linux import LinuxLANDeviceScanner
+
+        scanner = LinuxLANDeviceScanner(arp_source="netlink")
+        devices = scanner._read_netlink_neighbors(self.FakeSocket(IPV6_MESSAGES, RECORDED_DUMP))
+        self.assertEqual(1, len(devices))
+        device = devices["02:FC:00:00:00:05"]
+        expected_device = LANDevice()
+        expected_device.address = "fe80::fc:ff:fe00:5"
+        expected_device.address_aliases = ["192.0.2.1"]
+        expected_device.mac_address = "02:FC:00:00:00:05"
+        self.assertEqual(expected_device, device,
+                         msg="IPv4 and IPv6 neighbors should be merged by their mac address")
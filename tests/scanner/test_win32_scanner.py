@@ -242,7 +242,9 @@ class TestWin32LANDeviceScanner(unittest.TestCase):
         type(self.popen_mock).returncode = self.popen_returncode_mock
         self.popen_init_mock = unittest.mock.MagicMock(return_value=self.popen_mock)
 
-        setattr(subprocess, "Popen", self.popen_init_mock)
+        popen_patch = unittest.mock.patch.object(subprocess, "Popen", self.popen_init_mock)
+        popen_patch.start()
+        self.addCleanup(popen_patch.stop)
         self.popen_init_args = (["arp", "-a"],)
         self.popen_init_kwargs = {"bufsize": 100000,
                                   "stdin": subprocess.PIPE,
@@ -259,7 +261,7 @@ class TestWin32LANDeviceScanner(unittest.TestCase):
         self.popen_init_mock.assert_called_once_with(*self.popen_init_args,
                                                      **self.popen_init_kwargs)
         self.popen_returncode_mock.assert_called_once_with()
-        self.popen_communicate_mock.assert_called_once_with()
+        self.popen_communicate_mock.assert_called_once_with(timeout=10.0)
         self.assertEqual(tuple(self.expected_result), devices,
                          msg="LANDeviceScanner.list_devices did not return the expected values")
 
@@ -11,10 +11,17 @@ This script tests the following entities:
 Authors:
     Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
 """
+import os
+import tempfile
 import typing
 import unittest
+import unittest.mock
 
 from device_manager.device import *
+from device_manager.utils.usb_vendor_database import USBVendorDatabase
+
+# Excerpt of the usb id database, so the tests do not depend on the files of the system
+USB_IDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "usb.ids")
 
 
 class TestDeviceType(unittest.TestCase):
@@ -251,6 +258,13 @@ class TestUSBDevice(unittest.TestCase):
                                  "should appear in _old_addresses")
 
     def test_vendor_product_names(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        with unittest.mock.patch.dict(os.environ, {"DEVMAN_CACHE_DIR": cache_dir.name}):
+            self.assertTrue(USBVendorDatabase.load(USB_IDS_FILE),
+                            msg="Could not load the usb id database")
+        self.addCleanup(USBVendorDatabase.reset)
+
         device = USBDevice()
 
         device.vendor_id = 0xf4ed  # Shenzhen Siglent Co., Ltd.
@@ -278,10 +292,24 @@ class TestUSBDevice(unittest.TestCase):
                          "SpeedTouch 120g 802.11g Wireless Adapter [Intersil ISL3886]",
                          msg="Invalid product name for id {}".format(device.product_id))
 
-        from device_manager.utils.usb_vendor_database import USBVendorDatabase
         self.assertIsNone(USBVendorDatabase(),
                           msg="Creating an instance of USBVendorDatabase should not be allowed.")
 
+    def test_lazy_vendor_product_names(self):
+        with unittest.mock.patch.object(USBVendorDatabase, "get_vendor_product_name",
+                                        return_value=("Kodak Co.", "DC-240")) as lookup_mock:
+            device = USBDevice()
+            device.vendor_id = 0x040a
+            device.product_id = 0x0120
+            copied_device = USBDevice()
+            copied_device.from_dict(device.to_dict())
+            copied_device.from_device(device)
+            lookup_mock.assert_not_called()
+
+            self.assertEqual("Kodak Co.", device.vendor_name)
+            self.assertEqual("DC-240", device.product_name)
+            lookup_mock.assert_called_with(0x040a, 0x0120)
+
 
 class TestLANDevice(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script for testing the module device_manager.
+
+This script tests the following entities:
+- import of the package device_manager
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Directory containing the package device_manager
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipIf(sys.version_info < (3, 7),
+                 "The dependencies are only imported lazily as of Python 3.7 (PEP 562)")
+class TestImport(unittest.TestCase):
+    @staticmethod
+    def _run_python(code: str) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIRECTORY,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True, timeout=60, check=True)
+
+    def test_lazy_dependencies(self):
+        result = self._run_python("import sys, device_manager; print(*sorted(sys.modules))")
+        modules = result.stdout.split()
+        for module in ["pyudev", "nmap", "urllib.request", "win32com", "asyncio",
+                       "concurrent.futures", "device_manager.scanner._linux",
+                       "device_manager.scanner._win32"]:
+            self.assertNotIn(module, modules,
+                             msg="\"{}\" must not be imported with the package".format(module))
+
+        result = self._run_python("import sys, device_manager; device_manager.USBDeviceScanner; "
+                                  "print(*sorted(sys.modules))")
+        self.assertIn("device_manager.scanner._{}".format(sys.platform), result.stdout.split(),
+                      msg="The specific device scanners were not imported on first use")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,21 +3,25 @@
 """Script for testing the module device_manager.device.
 
 This script tests the following entities:
-- class DeviceManager (including DeviceDict, DeviceTypeDict)
+- class DeviceManager (including DeviceDict, DeviceTypeDict, ResolveReport)
 - function load_device_manager
 
 Authors:
     Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
 """
 
+import asyncio
 import contextlib
+import io
 import os
+import threading
+import time
 import unittest
 import unittest.mock
 
 from device_manager.device import DeviceType, USBDevice, LANDevice
 from device_manager.scanner import DeviceScanner
-from device_manager.manager import DeviceManager, load_device_manager
+from device_manager.manager import DeviceDict, DeviceManager, ResolveReport, load_device_manager
 
 
 class TestDeviceManager(unittest.TestCase):
@@ -40,6 +44,15 @@ class TestDeviceManager(unittest.TestCase):
         device.mac_address = mac_address
         return device
 
+    @staticmethod
+    def make_arescan(scanner, devices):
+        async def arescan():
+            scanner.ascan_count += 1
+            # Give the other lookups the chance to join the running scan
+            await asyncio.sleep(0.01)
+            return tuple(devices)
+        return arescan
+
     @contextlib.contextmanager
     def mock_device_scanner(self):
         init_device_scanner = DeviceScanner.__init__
@@ -55,6 +68,11 @@ class TestDeviceManager(unittest.TestCase):
                 side_effect=lambda *a, **kw: tuple(self.lan_devices))
             this._scanners[DeviceType.LAN]._scan = this._scanners[DeviceType.LAN].mock_scan
             this._scanners[DeviceType.LAN].nmap._nmap = None
+            for device_type, devices in ((DeviceType.USB, self.usb_devices),
+                                         (DeviceType.LAN, self.lan_devices)):
+                scanner = this._scanners[device_type]
+                scanner.ascan_count = 0
+                scanner._arescan = self.make_arescan(scanner, devices)
 
         with unittest.mock.patch.object(DeviceScanner, "__init__", mock_init_device_scanner):
             yield
@@ -220,6 +238,17 @@ class TestDeviceManager(unittest.TestCase):
         self.manager.clear()
         self.assertEqual(0, len(self.manager), msg="DeviceManager must be empty after clearing it")
 
+    def test_prefetch_usb_ids(self):
+        from device_manager.utils.usb_vendor_database import USBVendorDatabase
+
+        with unittest.mock.patch.object(USBVendorDatabase, "prefetch") as prefetch_mock:
+            with self.mock_device_scanner():
+                DeviceManager()
+            prefetch_mock.assert_not_called()
+            with self.mock_device_scanner():
+                DeviceManager(prefetch_usb_ids=True)
+            prefetch_mock.assert_called_once_with()
+
     def test_serialization(self):
         import tempfile
 
@@ -252,6 +281,354 @@ class TestDeviceManager(unittest.TestCase):
                     self.assertSequenceEqual(file_manager.items(), new_file_manager.items(),
                                              msg="DeviceManager was not saved and loaded correctly")
 
+                with load_device_manager(file_name, lazy=True, lazy_init=True,
+                                         max_age=60.0) as lazy_file_manager:
+                    self.assertIsNone(lazy_file_manager._scanner,
+                                      msg="The arguments must be passed to the DeviceManager")
+                    self.assertEqual(len(file_manager), len(lazy_file_manager),
+                                     msg="DeviceManager was not saved and loaded correctly")
+                    self.assertEqual(60.0, lazy_file_manager.scanner.max_age,
+                                     msg="The scanner options must be passed to the DeviceManager")
+
+    def test_max_age(self):
+        with self.mock_device_scanner():
+            manager = DeviceManager(max_age=60.0)
+        usb_scanner = manager.scanner[DeviceType.USB]
+        manager.scanner.list_devices(rescan=True)
+        usb_scanner.mock_scan.reset_mock()
+
+        manager["my-dev-0"] = self.make_usb_device(None, self.usb_devices[0].vendor_id,
+                                                   self.usb_devices[0].product_id, None,
+                                                   self.usb_devices[0].serial)
+        for _ in range(10):
+            manager["my-dev-0"].reset_addresses()
+            self.assertEqual(self.usb_devices[0].address, manager["my-dev-0"].address,
+                             msg="The device was not found in the recent scan results")
+        self.assertNotIn(unittest.mock.call(True), usb_scanner.mock_scan.call_args_list,
+                         msg="Recent scan results must be reused")
+
+        usb_scanner.max_age = 0.0
+        manager["my-dev-0"].reset_addresses()
+        manager.get("my-dev-0")
+        self.assertIn(unittest.mock.call(True), usb_scanner.mock_scan.call_args_list,
+                      msg="Outdated scan results must be refreshed")
+
+    def test_revalidate(self):
+        self.manager["my-dev-0"] = self.usb_devices[0]
+        self.manager["my-dev-1"] = self.make_usb_device(None, self.usb_devices[1].vendor_id,
+                                                        self.usb_devices[1].product_id, None,
+                                                        self.usb_devices[1].serial)
+        usb_scanner = self.manager.scanner[DeviceType.USB]
+        release = threading.Event()
+        usb_scanner.mock_scan.side_effect = \
+            lambda *a, **kw: release.wait(5) and tuple(self.usb_devices)
+
+        # The device was moved to another port
+        self.usb_devices[0] = self.make_usb_device("USB\\10", self.usb_devices[0].vendor_id,
+                                                   self.usb_devices[0].product_id,
+                                                   self.usb_devices[0].revision_id,
+                                                   self.usb_devices[0].serial)
+        usb_scanner.mock_scan.reset_mock()
+        device = self.manager.get("my-dev-0")
+        self.manager.get("my-dev-0", revalidate=True)
+        self.assertTrue(self.manager.wait_for_revalidation(0),
+                        msg="Without scan and max_age, known addresses must not be revalidated")
+        usb_scanner.mock_scan.assert_not_called()
+
+        self.manager.get("my-dev-0", scan=True, revalidate=True)
+        self.assertEqual("USB\\0", device.address,
+                         msg="The last known device must be returned immediately")
+        self.assertFalse(self.manager.wait_for_revalidation(0.05),
+                         msg="The revalidation should run in the background")
+        for _ in range(10):
+            self.manager.get("my-dev-0", scan=True, revalidate=True)
+        release.set()
+        self.assertTrue(self.manager.wait_for_revalidation(5),
+                        msg="The revalidation did not finish")
+        self.assertEqual("USB\\10", device.address,
+                         msg="The returned device must be updated by the revalidation")
+        self.assertEqual(1, usb_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="A running revalidation must be shared with later requests")
+
+        # With max_age, the device is only revalidated, if its latest search is outdated
+        usb_scanner.mock_scan.reset_mock()
+        usb_scanner.max_age = 60.0
+        for _ in range(10):
+            self.manager.get("my-dev-0", revalidate=True)
+        self.assertTrue(self.manager.wait_for_revalidation(5),
+                        msg="The revalidation did not finish")
+        self.assertEqual(0, usb_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="A recently searched device must not be revalidated")
+        # The latest search and the latest scan were two minutes ago
+        self.manager._search_times[id(device)] = (device, time.monotonic() - 120.0)
+        usb_scanner._scan_time = time.monotonic() - 120.0
+        self.manager.get("my-dev-0", revalidate=True)
+        self.assertTrue(self.manager.wait_for_revalidation(5),
+                        msg="The revalidation did not finish")
+        self.assertEqual(1, usb_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="An outdated device must be revalidated with one scan")
+        usb_scanner.max_age = None
+
+        usb_scanner.mock_scan.reset_mock()
+        self.manager["my-dev-1"].reset_addresses()
+        device = self.manager.get("my-dev-1", revalidate=True)
+        usb_scanner.mock_scan.assert_called_with(True)
+        self.assertEqual(self.usb_devices[1].address, device.address,
+                         msg="A device without addresses must be searched immediately")
+
+    def test_search_times(self):
+        def make_device(index):
+            return self.make_usb_device(None, self.usb_devices[index].vendor_id,
+                                        self.usb_devices[index].product_id, None,
+                                        self.usb_devices[index].serial)
+
+        self.manager["my-dev-0"] = make_device(0)
+        self.manager["my-dev-1"] = make_device(1)
+        self.manager["my-dev-2"] = make_device(2)
+        self.assertEqual(3, len(self.manager._search_times),
+                         msg="The latest search of each stored device should be recorded")
+
+        del self.manager["my-dev-0"]
+        self.manager["my-dev-1"] = make_device(1)
+        self.assertCountEqual([id(self.manager["my-dev-1"]), id(self.manager["my-dev-2"])],
+                              self.manager._search_times.keys(),
+                              msg="Removed and replaced devices must be forgotten")
+
+        file = io.StringIO()
+        self.manager.save(file)
+        file.seek(0)
+        self.manager.load(file)
+        self.assertCountEqual([id(self.manager["my-dev-1"]), id(self.manager["my-dev-2"])],
+                              self.manager._search_times.keys(),
+                              msg="Devices removed by loading must be forgotten")
+        self.manager.clear()
+        self.assertEqual(0, len(self.manager._search_times),
+                         msg="Cleared devices must be forgotten")
+
+    def test_batch_load(self):
+        for i in range(100):
+            self.manager["usb-{}".format(i)] = self.usb_devices[i % len(self.usb_devices)]
+            self.manager["lan-{}".format(i)] = self.lan_devices[i % len(self.lan_devices)]
+        self.manager["missing"] = self.make_lan_device(None, "02:00:00:00:00:01")
+        file = io.StringIO()
+        self.manager.save(file)
+
+        with self.mock_device_scanner():
+            new_manager = DeviceManager()
+        usb_scanner = new_manager.scanner[DeviceType.USB]
+        lan_scanner = new_manager.scanner[DeviceType.LAN]
+        usb_scanner.mock_scan.reset_mock()
+        lan_scanner.mock_scan.reset_mock()
+        file.seek(0)
+        new_manager.load(file)
+        for scanner in (usb_scanner, lan_scanner):
+            self.assertEqual(1, scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                             msg="Loading must perform one scan per device type")
+        for i in range(100):
+            self.assertEqual(self.usb_devices[i % len(self.usb_devices)].address,
+                             new_manager["usb-{}".format(i)].address,
+                             msg="The address of a loaded device was not resolved")
+        self.assertSequenceEqual(tuple(), new_manager["missing"].all_addresses,
+                                 msg="A missing device must not have addresses")
+
+        usb_scanner.mock_scan.reset_mock()
+        file.seek(0)
+        new_manager.load(file, resolve=False)
+        usb_scanner.mock_scan.assert_not_called()
+        device = new_manager.get("usb-0", revalidate=False)
+        self.assertEqual(self.usb_devices[0].address, device.address,
+                         msg="A deferred device must be resolved when it is requested")
+
+    def test_lazy(self):
+        for i in range(20):
+            self.manager["usb-{}".format(i)] = self.usb_devices[i % len(self.usb_devices)]
+            self.manager["lan-{}".format(i)] = self.lan_devices[i % len(self.lan_devices)]
+        file = io.StringIO()
+        self.manager.save(file)
+        file.seek(0)
+
+        with self.mock_device_scanner():
+            manager = DeviceManager(lazy=True, resolve_window=60.0)
+        usb_scanner = manager.scanner[DeviceType.USB]
+        lan_scanner = manager.scanner[DeviceType.LAN]
+        usb_scanner.mock_scan.reset_mock()
+        lan_scanner.mock_scan.reset_mock()
+        manager.load(file)
+        manager["new-device"] = self.make_usb_device(None, self.usb_devices[1].vendor_id,
+                                                     self.usb_devices[1].product_id, None,
+                                                     self.usb_devices[1].serial)
+        usb_scanner.mock_scan.assert_not_called()
+        lan_scanner.mock_scan.assert_not_called()
+        self.assertSequenceEqual(tuple(), DeviceDict.get(manager, "new-device").all_addresses,
+                                 msg="A device must not be searched when storing it in lazy mode")
+
+        for i in range(20):
+            self.assertEqual(self.usb_devices[i % len(self.usb_devices)].address,
+                             manager["usb-{}".format(i), "usb"].address,
+                             msg="The device was not resolved on its first request")
+        self.assertEqual(self.usb_devices[1].address, manager["new-device"].address,
+                         msg="The device was not resolved on its first request")
+        self.assertEqual(1, usb_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="The first requests within the resolve window must share one scan")
+        lan_scanner.mock_scan.assert_not_called()
+
+        manager["lan-0"]
+        self.assertEqual(1, lan_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="The device type of the requested device must be scanned")
+
+    def test_get_many(self):
+        names = []
+        for i in range(30):
+            names.append("dev-{}".format(i))
+            self.manager[names[-1]] = self.usb_devices[i % len(self.usb_devices)]
+            self.manager[names[-1]] = self.lan_devices[i % len(self.lan_devices)]
+        self.manager["missing"] = self.make_lan_device("192.168.10.99", "02:00:00:00:00:01")
+        usb_scanner = self.manager.scanner[DeviceType.USB]
+        lan_scanner = self.manager.scanner[DeviceType.LAN]
+        usb_scanner.mock_scan.reset_mock()
+        lan_scanner.mock_scan.reset_mock()
+
+        report = self.manager.get_many([*names, ("missing", "lan"), ("dev-0", "usb")], scan=True)
+        self.assertIsInstance(report, ResolveReport, msg="Unexpected result of get_many")
+        for scanner in (usb_scanner, lan_scanner):
+            self.assertEqual(1, scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                             msg="get_many must perform one scan per device type")
+        self.assertEqual(32, len(report.devices), msg="Unexpected number of devices")
+        self.assertEqual(self.lan_devices[1], report.devices["dev-1"][DeviceType.LAN],
+                         msg="Unexpected device in the result of get_many")
+        self.assertEqual(self.usb_devices[0].address, report.devices["dev-0", "usb"].address,
+                         msg="Unexpected device in the result of get_many")
+        self.assertEqual((("missing", DeviceType.LAN),), report.not_found,
+                         msg="The missing device was not reported")
+        self.assertSequenceEqual(tuple(), report.devices["missing", "lan"].all_addresses,
+                                 msg="The addresses of a missing device must be reset")
+
+        usb_scanner.mock_scan.reset_mock()
+        lan_scanner.mock_scan.reset_mock()
+        report = self.manager.get_many(names)
+        usb_scanner.mock_scan.assert_not_called()
+        lan_scanner.mock_scan.assert_not_called()
+        self.assertEqual((), report.not_found, msg="Known devices must not be searched again")
+
+        report = self.manager.resolve_all()
+        self.assertEqual(len(self.manager), len(report.devices),
+                         msg="Not all devices were resolved")
+        self.assertEqual(1, usb_scanner.mock_scan.call_args_list.count(unittest.mock.call(True)),
+                         msg="resolve_all must perform one scan per device type")
+        with self.assertRaises(KeyError, msg="An unknown key should raise an exception"):
+            self.manager.get_many(["unknown"])
+
+        # Devices with known addresses do not require the scanners
+        lazy_manager = DeviceManager(lazy_init=True)
+        lazy_manager["dev"] = self.usb_devices[0]
+        lazy_manager["dev"] = self.lan_devices[0]
+        report = lazy_manager.get_many(["dev"])
+        self.assertEqual((), report.not_found, msg="Known devices must not be searched again")
+        self.assertIsNone(lazy_manager._scanner,
+                          msg="The scanners must not be created without devices to search for")
+
+    def test_lazy_init(self):
+        with unittest.mock.patch("device_manager.manager.DeviceScanner") as scanner_mock:
+            manager = DeviceManager(lazy_init=True, max_age=1.0)
+            scanner_mock.assert_not_called()
+            with io.StringIO('{"dev": {"usb": {"address": "USB\\\\0", "serial": "1234"}}}') as file:
+                manager.load(file, resolve=False)
+            scanner_mock.assert_not_called()
+            self.assertIs(scanner_mock.return_value, manager.scanner,
+                          msg="The scanner was not created on first use")
+            self.assertIs(scanner_mock.return_value, manager.scanner,
+                          msg="The scanner must only be created once")
+            scanner_mock.assert_called_once_with(max_age=1.0)
+            scanner_mock.return_value.list_devices.assert_not_called()
+
+            DeviceManager()
+            scanner_mock.return_value.list_devices.assert_called_once_with()
+
+    def test_async(self):
+        loop = asyncio.new_event_loop()
+        try:
+            usb_scanner = self.manager.scanner[DeviceType.USB]
+            lan_scanner = self.manager.scanner[DeviceType.LAN]
+            usb_scanner.mock_scan.reset_mock()
+            lan_scanner.mock_scan.reset_mock()
+
+            loop.run_until_complete(self.manager.aset(("my-dev-0", "usb"),
+                                                      self.usb_devices[0].address))
+            self.assertEqual(self.usb_devices[0], self.manager["my-dev-0", "usb"],
+                             msg="Device was not set by its address")
+            self.assertEqual(0, usb_scanner.ascan_count + lan_scanner.ascan_count,
+                             msg="A known address must be taken from the cache")
+            with self.assertRaises(ValueError, msg="If address was not found, DeviceManager must "
+                                                   "raise an error"):
+                loop.run_until_complete(self.manager.aset("my-dev-1", "invalid-address"))
+            self.assertEqual((1, 1), (usb_scanner.ascan_count, lan_scanner.ascan_count),
+                             msg="An unknown address must be searched by rescanning")
+
+            # Hundreds of concurrent lookups of devices without addresses share one scan
+            devices = []
+            for i in range(100):
+                usb_device = self.usb_devices[i % len(self.usb_devices)]
+                lan_device = self.lan_devices[i % len(self.lan_devices)]
+                devices.append(("usb-{}".format(i), usb_device, self.make_usb_device(
+                    None, usb_device.vendor_id, usb_device.product_id, usb_device.revision_id,
+                    usb_device.serial)))
+                devices.append(("lan-{}".format(i), lan_device,
+                                self.make_lan_device(None, lan_device.mac_address)))
+
+            async def set_all():
+                await asyncio.gather(*(self.manager.aset(name, device)
+                                       for name, _, device in devices))
+
+            loop.run_until_complete(set_all())
+            self.assertEqual((2, 2), (usb_scanner.ascan_count, lan_scanner.ascan_count),
+                             msg="Concurrent lookups must share one scan per scanner")
+            for name, expected, _ in devices:
+                self.assertEqual(expected, self.manager[name],
+                                 msg="DeviceManager should update addresses of new devices")
+
+            self.manager["my-dev-0"] = self.lan_devices[0]
+            self.lan_devices.pop(0)
+            device = loop.run_until_complete(self.manager.aget("my-dev-0", scan=True))
+            self.assertEqual((3, 3), (usb_scanner.ascan_count, lan_scanner.ascan_count),
+                             msg="All device types must be searched for")
+            self.assertSequenceEqual(tuple(), device[DeviceType.LAN].all_addresses,
+                                     msg="All addresses need to be reset after finding out it was "
+                                         "disconnected")
+            self.assertEqual(self.usb_devices[0], device[DeviceType.USB],
+                             msg="Unexpected result of DeviceManager.aget")
+
+            file = io.StringIO()
+            self.manager.save(file)
+            file.seek(0)
+            with self.mock_device_scanner():
+                new_manager = DeviceManager()
+            loop.run_until_complete(new_manager.aload(file))
+            self.assertSequenceEqual(sorted(self.manager.keys()), sorted(new_manager.keys()),
+                                     msg="DeviceManager was not loaded correctly")
+            self.assertEqual(1, new_manager.scanner[DeviceType.USB].ascan_count,
+                             msg="Loaded devices must share one scan per scanner")
+            usb_scanner.mock_scan.assert_not_called()
+            lan_scanner.mock_scan.assert_not_called()
+
+            # In lazy mode, aget resolves the devices in the same way as get
+            file.seek(0)
+            with self.mock_device_scanner():
+                lazy_manager = DeviceManager(lazy=True, resolve_window=60.0)
+            lazy_manager.load(file)
+            lazy_usb_scanner = lazy_manager.scanner[DeviceType.USB]
+            lazy_usb_scanner.mock_scan.reset_mock()
+            for i in range(10):
+                device = loop.run_until_complete(lazy_manager.aget(("usb-{}".format(i), "usb")))
+                self.assertEqual(self.usb_devices[i % len(self.usb_devices)].address,
+                                 device.address, msg="The device was not resolved on its first "
+                                                     "request")
+            self.assertEqual(1, lazy_usb_scanner.ascan_count,
+                             msg="The first requests within the resolve window must share one scan")
+            self.assertNotIn(unittest.mock.call(True), lazy_usb_scanner.mock_scan.call_args_list,
+                             msg="The lazy resolution must not scan synchronously")
+        finally:
+            loop.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script for testing the module device_manager.utils.command.
+
+This script tests the following entities:
+- class CancelHandle
+- function run_command
+- function arun_command
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from device_manager.utils.command import CancelHandle, CommandCancelledError, run_command, \
+    arun_command
+
+
+@unittest.skipUnless(sys.platform == "linux", "Requires the commands \"echo\" and \"sleep\"")
+class TestCommand(unittest.TestCase):
+    def test_run(self):
+        returncode, out, err = run_command(["echo", "hello"], timeout=10)
+        self.assertEqual((0, b"hello\n", b""), (returncode, out, err))
+
+        with self.assertRaises(FileNotFoundError):
+            run_command(["this-command-does-not-exist"])
+
+    def test_timeout(self):
+        start = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired,
+                               msg="A command should be killed after the timeout"):
+            run_command(["sleep", "10"], timeout=0.2)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_cancel(self):
+        handle = CancelHandle()
+        timer = threading.Timer(0.2, handle.cancel)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        start = time.monotonic()
+        with self.assertRaises(CommandCancelledError, msg="A cancelled command should raise"):
+            run_command(["sleep", "10"], cancel=handle)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(0, handle.running)
+
+        # Commands started after the cancellation are not affected
+        self.assertEqual(0, run_command(["echo"], cancel=handle)[0])
+
+    def test_async(self):
+        async def run():
+            handle = CancelHandle()
+            results = await asyncio.gather(arun_command(["echo", "a"], timeout=10),
+                                           arun_command(["echo", "b"], timeout=10))
+            self.assertEqual([(0, b"a\n", b""), (0, b"b\n", b"")], results)
+
+            with self.assertRaises(subprocess.TimeoutExpired):
+                await arun_command(["sleep", "10"], timeout=0.2)
+
+            asyncio.get_event_loop().call_later(0.2, handle.cancel)
+            with self.assertRaises(CommandCancelledError):
+                await arun_command(["sleep", "10"], cancel=handle)
+
+        start = time.monotonic()
+        loop = asyncio.new_event_loop()
+        # Before python 3.8, the child watcher of subprocesses only works with the current loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(run())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        self.assertLess(time.monotonic() - start, 5)
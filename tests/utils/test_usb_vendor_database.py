@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script for testing the module device_manager.utils.usb_vendor_database.
+
+This script tests the following entities:
+- class USBVendorDatabase
+- class _USBIdIndex
+
+Authors:
+    Lukas Lankes, Forschungszentrum Jülich GmbH - ZEA-2, l.lankes@fz-juelich.de
+"""
+
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import unittest.mock
+import urllib.request
+
+from device_manager.utils.usb_vendor_database import USBVendorDatabase, _USBIdIndex
+
+# Excerpt of the usb id database, so the tests do not depend on the files of the system
+USB_IDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data",
+                            "usb.ids")
+
+
+class TestUSBVendorDatabase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.usb_ids = os.path.join(self.tmp_dir.name, "usb.ids")
+        shutil.copyfile(USB_IDS_FILE, self.usb_ids)
+
+        self.environ_patch = unittest.mock.patch.dict(os.environ, {
+            "DEVMAN_CACHE_DIR": self.cache_dir,
+            "DEVMAN_USB_IDS": self.usb_ids})
+        self.environ_patch.start()
+        # Never access the network during the tests
+        self.urlopen_mock = unittest.mock.MagicMock(side_effect=AssertionError("Network access"))
+        self.urlopen_patch = unittest.mock.patch.object(urllib.request, "urlopen",
+                                                        self.urlopen_mock)
+        self.urlopen_patch.start()
+        USBVendorDatabase.reset()
+
+    def tearDown(self) -> None:
+        USBVendorDatabase.reset()
+        self.urlopen_patch.stop()
+        self.environ_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_load_from_disk(self):
+        self.assertEqual(self.usb_ids, USBVendorDatabase.find_usb_ids(),
+                         msg="The usb id database from DEVMAN_USB_IDS should be preferred")
+        self.assertEqual(("Kodak Co.", "DC-240"),
+                         USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                         msg="Invalid names for a known vendor and product id")
+        self.assertEqual(("Kodak Co.", None),
+                         USBVendorDatabase.get_vendor_product_name(0x040a, 0xFFFF),
+                         msg="Invalid names for a known vendor id and an unknown product id")
+        self.assertEqual((None, None),
+                         USBVendorDatabase.get_vendor_product_name(0xFFFF, 0x0120),
+                         msg="Invalid names for an unknown vendor id")
+        self.urlopen_mock.assert_not_called()
+
+    def test_memo(self):
+        self.assertEqual(("Kodak Co.", "DC-240"),
+                         USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120))
+        with unittest.mock.patch.object(_USBIdIndex, "lookup") as lookup_mock:
+            self.assertEqual(("Kodak Co.", "DC-240"),
+                             USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120))
+            lookup_mock.assert_not_called()
+
+    def test_missing_ids(self):
+        with unittest.mock.patch.object(USBVendorDatabase, "_ensure_loaded") as ensure_loaded_mock:
+            self.assertEqual((None, None), USBVendorDatabase.get_vendor_product_name(None, None),
+                             msg="Invalid names for a missing vendor id")
+            self.assertEqual((None, None, None), USBVendorDatabase.get_class_names(None),
+                             msg="Invalid names for a missing class id")
+            ensure_loaded_mock.assert_not_called()
+
+    def test_cache(self):
+        self.assertTrue(USBVendorDatabase.load(), msg="Could not load the usb id database")
+        cache_file = USBVendorDatabase._index_file(self.usb_ids)
+        self.assertTrue(os.path.isfile(cache_file), msg="No index file was written")
+        self.assertIsInstance(USBVendorDatabase._USBVendorDatabase__index._buffer, mmap.mmap,
+                              msg="The index file should be memory mapped")
+
+        # The cache is used, as long as the source file was not modified
+        with unittest.mock.patch.object(USBVendorDatabase, "_parse_usb_ids") as parse_mock:
+            USBVendorDatabase.reset()
+            self.assertEqual(("Linux Foundation", "2.0 root hub"),
+                             USBVendorDatabase.get_vendor_product_name(0x1d6b, 0x0002))
+            parse_mock.assert_not_called()
+
+        # Modifying the source file invalidates the cache
+        with open(self.usb_ids, "a") as file:
+            file.write("\n")
+        with unittest.mock.patch.object(USBVendorDatabase, "_parse_usb_ids",
+                                        return_value=[{}] * _USBIdIndex.TABLE_COUNT) as parse_mock:
+            USBVendorDatabase.reset()
+            self.assertEqual((None, None),
+                             USBVendorDatabase.get_vendor_product_name(0x1d6b, 0x0002))
+            parse_mock.assert_called_once()
+
+        # A corrupted or empty index file is ignored
+        for content in [b"invalid", b""]:
+            with open(cache_file, "wb") as file:
+                file.write(content)
+            USBVendorDatabase.reset()
+            self.assertEqual(("Linux Foundation", "2.0 root hub"),
+                             USBVendorDatabase.get_vendor_product_name(0x1d6b, 0x0002))
+
+    def test_read_only_cache(self):
+        with unittest.mock.patch("os.replace", side_effect=PermissionError("read-only")):
+            self.assertTrue(USBVendorDatabase.load(), msg="Could not load the usb id database")
+        self.assertFalse(os.path.isfile(USBVendorDatabase._index_file(self.usb_ids)),
+                         msg="No index file should be written to a read-only cache")
+        self.assertEqual(("Shenzhen Siglent Co., Ltd.", "SDG1010 Waveform Generator"),
+                         USBVendorDatabase.get_vendor_product_name(0xf4ed, 0xee37),
+                         msg="The index should be kept in memory, if it cannot be written")
+
+    def test_parse(self):
+        with open(USB_IDS_FILE, "rb") as file:
+            vendors, products, classes, subclasses, protocols = \
+                USBVendorDatabase._parse_usb_ids(file)
+
+        self.assertEqual({0x0001, 0x040a, 0x06b9, 0x1d6b, 0xf4ed}, set(vendors),
+                         msg="Unexpected vendors were parsed")
+        self.assertEqual("Fry's Electronics", vendors[0x0001])
+        self.assertEqual(11, len(products), msg="Unexpected number of products were parsed")
+        self.assertEqual("SpeedTouch ISDN or ADSL Modem", products[(0x06b9 << 16) | 0x4061])
+        self.assertEqual({0x00: "(Defined at Interface level)", 0x01: "Audio",
+                          0x03: "Human Interface Device", 0x09: "Hub"}, classes,
+                         msg="Unexpected device classes were parsed")
+        self.assertEqual("Boot Interface Subclass", subclasses[(0x03 << 8) | 0x01])
+        self.assertEqual({(0x03 << 16) | (0x01 << 8) | 0x01: "Keyboard",
+                          (0x03 << 16) | (0x01 << 8) | 0x02: "Mouse",
+                          (0x09 << 16) | (0x00 << 8) | 0x00: "Full speed (or root) hub",
+                          (0x09 << 16) | (0x00 << 8) | 0x01: "Single TT",
+                          (0x09 << 16) | (0x00 << 8) | 0x02: "TT per port"}, protocols,
+                         msg="Unexpected device protocols were parsed (maybe interfaces or HID "
+                             "descriptors were parsed as protocols)")
+
+        lines = ["0bda  Realtek \"Semiconductor\" Corp.\n".encode("utf-8"),
+                 "\t8153  RTL8153 Gigabit Ethernet Adapter\r\n".encode("utf-8"),
+                 "0c45  Microdia\n".encode("utf-8"),
+                 "\t6001  Genius VideoCAM NB \u2013 utf-8\n".encode("utf-8"),
+                 "\t6005  Sweex Mini Webcam \u00e9 latin-1\n".encode("latin1"),
+                 b"\tzzzz  Invalid product\n"]
+        vendors, products = USBVendorDatabase._parse_usb_ids(lines)[:2]
+        self.assertEqual({0x0bda: "Realtek \"Semiconductor\" Corp.", 0x0c45: "Microdia"}, vendors,
+                         msg="Names should be parsed verbatim")
+        self.assertEqual({(0x0bda << 16) | 0x8153: "RTL8153 Gigabit Ethernet Adapter",
+                          (0x0c45 << 16) | 0x6001: "Genius VideoCAM NB \u2013 utf-8",
+                          (0x0c45 << 16) | 0x6005: "Sweex Mini Webcam \u00e9 latin-1"}, products)
+
+    def test_class_names(self):
+        self.assertEqual(("Human Interface Device", "Boot Interface Subclass", "Mouse"),
+                         USBVendorDatabase.get_class_names(0x03, 0x01, 0x02))
+        self.assertEqual(("Hub", None, None), USBVendorDatabase.get_class_names(0x09))
+        self.assertEqual(("Audio", "Streaming", None),
+                         USBVendorDatabase.get_class_names(0x01, 0x02, 0x00))
+        self.assertEqual((None, None, None), USBVendorDatabase.get_class_names(0xFE, 0x01, 0x01))
+
+    def test_prefetch(self):
+        release = threading.Event()
+        load = USBVendorDatabase.load.__func__
+
+        def blocking_load(cls, path=None):
+            release.wait(10)
+            return load(cls, path)
+
+        with unittest.mock.patch.object(USBVendorDatabase, "load", classmethod(blocking_load)), \
+                unittest.mock.patch.object(USBVendorDatabase, "prefetch_timeout", 0.0):
+            USBVendorDatabase.prefetch()
+            self.assertTrue(USBVendorDatabase.is_loading(),
+                            msg="The database should be loaded in the background")
+            self.assertEqual((None, None),
+                             USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                             msg="Lookups should not block, while the database is loading")
+            release.set()
+            USBVendorDatabase._USBVendorDatabase__loader.join(10)
+            self.assertFalse(USBVendorDatabase.is_loading())
+            self.assertEqual(("Kodak Co.", "DC-240"),
+                             USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                             msg="The names should be found, after the database was loaded")
+
+    def test_prefetch_timeout(self):
+        release = threading.Event()
+        load = USBVendorDatabase.load.__func__
+
+        def blocking_load(cls, path=None):
+            release.wait(10)
+            return load(cls, path)
+
+        with unittest.mock.patch.object(USBVendorDatabase, "load", classmethod(blocking_load)), \
+                unittest.mock.patch.object(USBVendorDatabase, "prefetch_timeout", 10.0):
+            USBVendorDatabase.prefetch()
+            timer = threading.Timer(0.05, release.set)
+            timer.start()
+            self.assertEqual(("Kodak Co.", "DC-240"),
+                             USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                             msg="Lookups should wait for the database up to prefetch_timeout")
+            timer.join()
+
+    def test_missing_database(self):
+        with unittest.mock.patch.object(USBVendorDatabase, "find_usb_ids", return_value=None):
+            self.assertFalse(USBVendorDatabase.load(),
+                             msg="Loading should fail, if there is no usb id database")
+            self.assertEqual((None, None),
+                             USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                             msg="Without usb id database, no names should be found")
+        self.urlopen_mock.assert_not_called()
+
+    def test_update(self):
+        with open(USB_IDS_FILE, "rb") as file:
+            response = io.BytesIO(file.read().replace(b"Kodak Co.", b"Eastman Kodak Co."))
+        self.urlopen_mock.side_effect = None
+        self.urlopen_mock.return_value = response
+
+        USBVendorDatabase.update()
+        self.urlopen_mock.assert_called_once_with(USBVendorDatabase.USB_IDS_URL)
+        self.assertEqual(("Eastman Kodak Co.", "DC-240"),
+                         USBVendorDatabase.get_vendor_product_name(0x040a, 0x0120),
+                         msg="The downloaded usb id database was not loaded")
+
+        # The downloaded database is preferred over the system's database in the future
+        with unittest.mock.patch.dict(os.environ):
+            del os.environ["DEVMAN_USB_IDS"]
+            self.assertEqual(os.path.join(self.cache_dir, "usb.ids"),
+                             USBVendorDatabase.find_usb_ids())
+
+
+class TestUSBIdIndex(unittest.TestCase):
+    def test_lookup(self):
+        tables = [{0x0001: "First", 0x1234: "Vendor", 0xFFFF: "Last"},
+                  {(0x1234 << 16) | pid: "Product {}".format(pid) for pid in range(0, 1000, 3)},
+                  {0x03: "Human Interface Device"}, {}, {}]
+        index = _USBIdIndex(_USBIdIndex.build(tables, mtime=123, size=456))
+
+        self.assertTrue(index.matches(123, 456))
+        self.assertFalse(index.matches(123, 457))
+        for table_number, table in enumerate(tables):
+            for key, name in table.items():
+                self.assertEqual(name, index.lookup(table_number, key),
+                                 msg="Binary search did not find key {}".format(key))
+        for key in [0x0000, 0x0002, 0x1233, 0x1235]:
+            self.assertIsNone(index.lookup(_USBIdIndex.VENDORS, key),
+                              msg="Binary search found unknown key {}".format(key))
+        self.assertIsNone(index.lookup(_USBIdIndex.PRODUCTS, (0x1234 << 16) | 1))
+
+        empty = _USBIdIndex(_USBIdIndex.build([{}] * _USBIdIndex.TABLE_COUNT))
+        self.assertIsNone(empty.lookup(_USBIdIndex.VENDORS, 0x1234))
+
+    def test_invalid(self):
+        data = _USBIdIndex.build([{1: "abc"}, {}, {}, {}, {}])
+        _USBIdIndex(data)
+        for invalid in [b"", b"DMUSBIDX", b"INVALIDX" + data[8:], data[:40],
+                        _USBIdIndex.build([{1: "abc"}, {}])]:
+            with self.assertRaises(ValueError, msg="An invalid index should not be accepted"):
+                _USBIdIndex(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()